@@ -0,0 +1,68 @@
+"""CompiledDFA 与 DFA.simulate 的逐串匹配耗时, 以及每字符耗时随状态数的变化
+
+strings: 对最小化的 (a|b)*abb 逐个匹配长度为 33 的串, 比较 simulate、fullmatch 与 match
+scaling: (a|b)*a(a|b){k}c 的DFA有约 2^(k+1) 个状态, 在 20 万个字符的输入上比较
+         match (每步判断接受) 与 fullmatch (只在末尾判断) 的每字符耗时;
+         运行表在首次匹配时构造, 计时前先预热
+用法 (在 lab2 目录下): python -m benchmarks.bench_compiled [--count N] [--ks K ...]
+"""
+
+import argparse
+import random
+import time
+
+from lab2 import DFA, Regex
+
+
+def best_of(func, *args, repeat: int = 5) -> tuple[float, object]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - begin)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--ks", type=int, nargs="+", default=[4, 8, 10, 12])
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    dfa = DFA(Regex("(a|b)*abb").to_nfa()).minimize()
+    compiled = dfa.compile()
+    strings = [
+        "".join(rng.choice("ab") for _ in range(30)) + rng.choice(["abb", "aba"])
+        for _ in range(args.count)
+    ]
+    compiled.fullmatch("")
+    compiled.match("")
+    t_simulate, expected = best_of(lambda: [dfa.simulate(s) for s in strings])
+    t_full, result = best_of(lambda: [compiled.fullmatch(s) for s in strings])
+    assert result == expected
+    t_match, _ = best_of(lambda: [compiled.match(s) for s in strings])
+    print(f"strings: {args.count} x 33 chars, (a|b)*abb, {compiled}")
+    print(
+        f"  simulate {t_simulate * 1e3:8.2f}ms  fullmatch {t_full * 1e3:8.2f}ms "
+        f"({t_simulate / t_full:.2f}x)  match {t_match * 1e3:8.2f}ms"
+    )
+
+    text = "".join(rng.choice("ab") for _ in range(200_000))
+    print("scaling: ns/char on 200k chars")
+    for k in args.ks:
+        compiled = DFA(Regex(f"(a|b)*a(a|b){{{k}}}c").to_nfa()).compile()
+        compiled.fullmatch("")
+        compiled.match("")
+        t_match, _ = best_of(compiled.match, text, repeat=3)
+        t_full, _ = best_of(compiled.fullmatch, text, repeat=3)
+        print(
+            f"  k={k:<3} {compiled.num_states:>6} states  "
+            f"match {t_match / len(text) * 1e9:6.1f}  "
+            f"fullmatch {t_full / len(text) * 1e9:6.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""对比两条DFA构造路径的耗时与峰值内存
+
+pipeline: Regex.to_nfa() -> DFA(nfa)
+direct:   Regex.to_dfa_direct()
+两者都不含最小化, 结果经最小化后状态数相同
+用法 (在 lab2 目录下): python -m benchmarks.bench_direct [--patterns ...]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from lab2 import DFA, Regex
+
+DEFAULT_PATTERNS = [
+    "(a|b)*abb",
+    "b(a|b)*aa",
+    "(ab)*|c+",
+    "((a|b)(c|d))*(a|b|c|d)?",
+] + ["(a|b)*a" + "(a|b)" * n for n in (4, 8, 12)]
+
+
+def pipeline(pattern: str) -> DFA:
+    return DFA(Regex(pattern).to_nfa())
+
+
+def direct(pattern: str) -> DFA:
+    return Regex(pattern).to_dfa_direct()
+
+
+def measure(func, pattern: str) -> tuple[float, int, DFA]:
+    """返回 (耗时秒数, 峰值内存字节数, 结果)"""
+    tracemalloc.start()
+    begin = time.perf_counter()
+    dfa = func(pattern)
+    elapsed = time.perf_counter() - begin
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, dfa
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--patterns", nargs="+", default=DEFAULT_PATTERNS)
+    args = parser.parse_args()
+
+    print(
+        f"{'pattern':<32} {'pipeline':>10} {'peak':>9} {'states':>6} "
+        f"{'direct':>10} {'peak':>9} {'states':>6}"
+    )
+    for pattern in args.patterns:
+        t_pipe, peak_pipe, dfa_pipe = measure(pipeline, pattern)
+        t_direct, peak_direct, dfa_direct = measure(direct, pattern)
+        assert len(dfa_pipe.minimize().states) == len(dfa_direct.minimize().states)
+        label = pattern if len(pattern) <= 32 else pattern[:29] + "..."
+        print(
+            f"{label:<32} {t_pipe * 1e3:>8.2f}ms {peak_pipe / 1024:>7.1f}KB "
+            f"{len(dfa_pipe.states):>6} {t_direct * 1e3:>8.2f}ms "
+            f"{peak_direct / 1024:>7.1f}KB {len(dfa_direct.states):>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
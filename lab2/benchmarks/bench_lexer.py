@@ -0,0 +1,89 @@
+"""词法分析器的吞吐量: 对类似源代码的文本分词, 与基于 re 命名组并联的常见写法对比
+
+tokenize: 整个字符串一次分词
+stream:   按 --chunk 个字符分块送入 Lexer.stream
+re:       re.finditer 扫描 (?P<kind>...)|... 的并联, 按规则顺序取第一个 (非最长) 匹配
+long:     一个长为 --long 个字符的标识符按 16 个字符分块送入 Lexer.stream, 耗时应与长度成正比
+用法 (在 lab2 目录下): python -m benchmarks.bench_lexer [--size N] [--chunk N] [--long N]
+"""
+
+import argparse
+import re
+import time
+
+from lab2 import Lexer
+
+RULES = [
+    ("if", "if"),
+    ("while", "while"),
+    ("return", "return"),
+    ("id", r"[A-Za-z_]\w*"),
+    ("num", r"\d+(\.\d+)?"),
+    ("op", r"==|<=|>=|!=|[-+*/=<>]"),
+    ("punct", r"[(){};,]"),
+    ("ws", r"\s+"),
+]
+# re 取第一个成功的分支, 关键字需限定单词边界才与最长匹配一致
+RE_RULES = [
+    ("if", r"if\b"),
+    ("while", r"while\b"),
+    ("return", r"return\b"),
+] + RULES[3:]
+SOURCE = """while (count <= limit) {
+    total = total + price * 1.25;
+    if (total >= budget) { return total; }
+    count = count + 1;
+}
+"""
+
+
+def timed(func, *args):
+    begin = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - begin, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=2000, help="源代码片段的重复次数")
+    parser.add_argument("--chunk", type=int, default=4096, help="stream 的块大小")
+    parser.add_argument("--long", type=int, default=200000, help="长记号的字符数")
+    args = parser.parse_args()
+
+    text = SOURCE * args.size
+    t_build, lexer = timed(Lexer, RULES, {"ws"})
+    print(f"build    {t_build * 1e3:8.2f}ms  {lexer}")
+
+    t_tok, tokens = timed(lambda: list(lexer.tokenize(text)))
+    chunks = [text[i : i + args.chunk] for i in range(0, len(text), args.chunk)]
+    t_stream, streamed = timed(lambda: list(lexer.stream(chunks)))
+    assert streamed == tokens
+
+    scanner = re.compile("|".join(f"(?P<{kind}>{p})" for kind, p in RE_RULES))
+    t_re, expected = timed(
+        lambda: [
+            (m.lastgroup, m.group(), m.start())
+            for m in scanner.finditer(text)
+            if m.lastgroup != "ws"
+        ]
+    )
+    assert [tuple(token) for token in tokens] == expected
+
+    for name, seconds in (("tokenize", t_tok), ("stream", t_stream), ("re", t_re)):
+        print(
+            f"{name:8} {len(tokens):>8} tokens  {seconds * 1e3:8.2f}ms  "
+            f"{len(text) / seconds / 1e6:6.2f} Mchar/s"
+        )
+
+    for length in (args.long // 4, args.long):
+        pieces = ["x" * 16] * (length // 16)
+        t_long, streamed = timed(list, lexer.stream(pieces))
+        assert len(streamed) == 1 and len(streamed[0].lexeme) == len(pieces) * 16
+        print(
+            f"long     {len(pieces) * 16:>8} chars   {t_long * 1e3:8.2f}ms  "
+            f"{len(pieces)} chunks"
+        )
+
+
+if __name__ == "__main__":
+    main()
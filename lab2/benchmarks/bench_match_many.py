@@ -0,0 +1,63 @@
+"""对比逐个 simulate 与批量 match_many 的吞吐
+
+用法 (在 lab2 目录下): python -m benchmarks.bench_match_many [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import random
+import time
+
+from lab2 import DFA, Regex
+from lab2.compiled import np
+
+PATTERN = "b(a|b)*aa"
+ALPHABET = "abc"
+
+
+def make_strings(count: int, seed: int = 0) -> list[str]:
+    """生成候选串: 大多数以 b 开头并能走完整个串, 少数混入字母表外字符"""
+    rng = random.Random(seed)
+    weights = [50, 50, 1]
+    return [
+        "b" + "".join(rng.choices(ALPHABET, weights, k=rng.randint(4, 40)))
+        for _ in range(count)
+    ]
+
+
+def timed(func, *args):
+    begin = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - begin, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    args = parser.parse_args()
+
+    dfa = DFA(Regex(PATTERN).to_nfa()).minimize()
+    compiled = dfa.compile()
+    print(f"pattern: {PATTERN}, {compiled}")
+    print(f"{'inputs':>10} {'simulate':>10} {'fullmatch':>10} {'numpy':>10} speedup")
+    for size in args.sizes:
+        strings = make_strings(size)
+        t_simulate, expected = timed(list, map(dfa.simulate, strings))
+        t_scalar, scalar = timed(compiled.match_many, strings, "python")
+        assert scalar == expected
+        if np is not None:
+            t_numpy, vectorized = timed(compiled.match_many, strings, "numpy")
+            assert vectorized.tolist() == expected
+            numpy_cell = f"{t_numpy:>9.3f}s"
+            speedup = f"{t_simulate / t_numpy:.1f}x"
+        else:
+            numpy_cell = f"{'n/a':>10}"
+            speedup = f"{t_simulate / t_scalar:.1f}x"
+        print(
+            f"{size:>10} {t_simulate:>9.3f}s {t_scalar:>9.3f}s {numpy_cell} {speedup}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""状态表示的内存占用: 10 万状态的自动机, 每状态字节数
+
+legacy 为原先的 State (实例 __dict__、全局计数器生成的字符串名、转移为 符号 -> 列表),
+current 为带 __slots__ 与整数编号的 State/DFAState, arrays 为结构数组存储。
+用法 (在 lab2 目录下): python -m benchmarks.bench_memory [--states 100000]
+"""
+
+import argparse
+import gc
+import random
+import tracemalloc
+
+from lab2 import DFA, NFA, DFAState, State
+
+
+class LegacyState:
+    """原先的 State, 仅用于对比"""
+
+    id_counter = 0
+
+    def __init__(self, name=None):
+        self.name = name or f"S{LegacyState.id_counter}"
+        LegacyState.id_counter += 1
+        self.transitions: dict = {}
+
+    def add_transition(self, input_char, state):
+        self.transitions.setdefault(input_char, []).append(state)
+
+
+def build_states(state_cls, num_states: int, alphabet: str, epsilon: bool, seed=0):
+    """随机连边: 每个状态对每个符号一条出边, 可选再加一条 epsilon 边"""
+    rng = random.Random(seed)
+    states = [state_cls() for _ in range(num_states)]
+    for state in states:
+        for char in alphabet:
+            state.add_transition(char, states[rng.randrange(num_states)])
+        if epsilon:
+            state.add_transition(None, states[rng.randrange(num_states)])
+    return states
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--states", type=int, default=100_000)
+    args = parser.parse_args()
+    n = args.states
+
+    def legacy_nfa():
+        return build_states(LegacyState, n, "ab", True)
+
+    def current_nfa():
+        return NFA(build_states(State, n, "ab", True))
+
+    def current_dfa():
+        dfa = DFA()
+        for state in build_states(DFAState, n, "abc", False):
+            dfa.add_state(state)
+        dfa.set_start_state(dfa.states[0])
+        return dfa
+
+    rows = []
+    size, _ = measure(legacy_nfa)
+    rows.append(("NFA legacy State", size))
+    size, nfa = measure(current_nfa)
+    rows.append(("NFA State (__slots__)", size))
+    size, _ = measure(nfa.to_arrays)
+    rows.append(("NFA NFAArrays", size))
+    size, _ = measure(lambda: build_states(LegacyState, n, "abc", False))
+    rows.append(("DFA legacy State", size))
+    size, dfa = measure(current_dfa)
+    rows.append(("DFA DFAState (__slots__)", size))
+    size, _ = measure(dfa.compile)
+    rows.append(("DFA CompiledDFA", size))
+
+    print(f"{n} states")
+    print(f"{'representation':<26} {'total':>10} {'bytes/state':>12}")
+    for label, size in rows:
+        print(f"{label:<26} {size / 2**20:>8.1f}MB {size / n:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""DFA 最小化的规模基准: 随机完全DFA, 状态数 10^3 ~ 10^5
+
+对比当前的 Hopcroft 实现与原先基于 frozenset 分划的实现 (后者仅在较小规模上运行)。
+用法 (在 lab2 目录下): python -m benchmarks.bench_minimize [--sizes ...] [--legacy-max 2000]
+"""
+
+import argparse
+import random
+import time
+
+from lab2 import DFA, DFAState
+
+ALPHABET = "abc"
+
+
+def random_dfa(num_states: int, seed: int = 0) -> DFA:
+    rng = random.Random(seed)
+    dfa = DFA()
+    states = [DFAState() for _ in range(num_states)]
+    for state in states:
+        dfa.add_state(state, rng.random() < 0.5)
+        for char in ALPHABET:
+            state.add_transition(char, rng.choice(states))
+    dfa.set_start_state(states[0])
+    return dfa
+
+
+def legacy_minimize(dfa: DFA) -> int:
+    """原先 DFA.minimize 的分划细化部分, 返回等价类个数"""
+    symbols = {symbol for state in dfa.states for symbol in state.transitions}
+    accept = frozenset(dfa.accept_states)
+    non_accept = frozenset(dfa.states) - accept
+    P = {accept, non_accept}
+    W = P.copy()
+    while W:
+        A = W.pop()
+        for symbol in symbols:
+            X = {state for state in dfa.states if state.transitions.get(symbol) in A}
+            if not X:
+                continue
+            for Y in P.copy():
+                intersection = Y & X
+                difference = Y - X
+                if intersection and difference:
+                    P.remove(Y)
+                    P.add(frozenset(intersection))
+                    P.add(frozenset(difference))
+                    if Y in W:
+                        W.remove(Y)
+                        W.add(frozenset(intersection))
+                        W.add(frozenset(difference))
+                    elif len(intersection) <= len(difference):
+                        W.add(frozenset(intersection))
+                    else:
+                        W.add(frozenset(difference))
+    return len(P)
+
+
+def timed(func, *args):
+    begin = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - begin, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 3_000, 10_000, 30_000, 100_000]
+    )
+    parser.add_argument("--legacy-max", type=int, default=2_000)
+    args = parser.parse_args()
+
+    print(
+        f"{'states':>8} {'minimal':>8} {'hopcroft':>10} {'us/state':>9} {'legacy':>10}"
+    )
+    for size in args.sizes:
+        dfa = random_dfa(size)
+        t_current, minimized = timed(dfa.minimize)
+        per_state = t_current / size * 1e6
+        if size <= args.legacy_max:
+            t_legacy, _ = timed(legacy_minimize, dfa)
+            legacy_cell = f"{t_legacy:>9.3f}s"
+        else:
+            legacy_cell = f"{'skipped':>10}"
+        print(
+            f"{size:>8} {len(minimized.states):>8} {t_current:>9.3f}s "
+            f"{per_state:>9.1f} {legacy_cell}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Pike VM 的匹配耗时: 与 re 对比, 以及DFA预筛选的作用
+
+tokens:   在类似源代码的文本上 finditer 标识符与数字, 与 re.finditer 对比
+reject:   在不含匹配的长文本上 search, 预筛选的 DFA 扫描后直接返回
+blowup:   (a|aa)*c 在 n 个 a 上的 search, re 回溯为指数时间, Pike VM 为线性
+用法 (在 lab2 目录下): python -m benchmarks.bench_pike [--size N] [--blowup N]
+"""
+
+import argparse
+import re
+import time
+
+from lab2 import PikeVM
+
+TOKEN_PATTERN = r"[A-Za-z_]\w*|\d+(\.\d+)?"
+SOURCE = "total = price * 1.25 + count_items(cart, 42) - discount\n"
+
+
+def timed(func, *args) -> tuple[float, object]:
+    begin = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - begin, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=200, help="tokens 文本的行数")
+    parser.add_argument("--blowup", type=int, default=22, help="blowup 的 a 的个数")
+    args = parser.parse_args()
+
+    text = SOURCE * args.size
+    vm = PikeVM(TOKEN_PATTERN)
+    t_vm, spans = timed(lambda: [m.span() for m in vm.finditer(text)])
+    compiled_re = re.compile(TOKEN_PATTERN)
+    t_re, expected = timed(lambda: [m.span() for m in compiled_re.finditer(text)])
+    assert spans == expected
+    print(
+        f"tokens  {len(text):>8} chars  pike {t_vm * 1e3:8.2f}ms  re {t_re * 1e3:8.2f}ms"
+    )
+
+    haystack = "the quick brown fox jumps over the lazy dog " * args.size
+    vm = PikeVM("[0-9]+x")
+    t_vm, found = timed(vm.search, haystack)
+    assert found is None
+    t_re, _ = timed(re.compile("[0-9]+x").search, haystack)
+    print(
+        f"reject  {len(haystack):>8} chars  pike {t_vm * 1e3:8.2f}ms  re {t_re * 1e3:8.2f}ms"
+    )
+
+    subject = "a" * args.blowup
+    vm = PikeVM("(a|aa)*c")
+    t_vm, _ = timed(vm.search, subject)
+    t_re, _ = timed(re.compile("(a|aa)*c").search, subject)
+    print(
+        f"blowup  {len(subject):>8} chars  pike {t_vm * 1e3:8.2f}ms  re {t_re * 1e3:8.2f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""字面量预筛选的作用: 在匹配稀疏的长文本上 finditer, 对比开启与关闭预筛选的 Pike VM 及 re
+
+语料为随机小写单词组成的文本, 每隔约 --gap 个字符插入一处匹配。
+prefix:   必需前缀为单个字面量, 用 str.find 跳到候选起点
+alts:     多个必需前缀, 字面量较多时用 Aho-Corasick 扫描
+suffix:   只有必需后缀 (内部因子), 因子不再出现时直接结束; 因子之前无界, 其余部分仍逐字符运行
+bounded:  长度有界的模式, 跳到因子出现处之前 max_len 以内
+用法 (在 lab2 目录下): python -m benchmarks.bench_prefilter [--size N] [--gap N]
+"""
+
+import argparse
+import random
+import re
+import time
+
+from lab2 import PikeVM
+
+CASES = [
+    ("prefix", r"error: \w+", "error: disk{}"),
+    ("alts", "(alpha|bravo|delta|kilo|oscar|tango)[0-9]+", "tango{}"),
+    ("suffix", "[a-z]+ment", "agreement"),
+    ("bounded", r"\d{3}-\d{4}", "{}-5678"),
+]
+WORDS = ["the", "quick", "brown", "fox", "jumps", "over", "lazy", "dog", "and"]
+
+
+def match_spans(finditer, text: str) -> list[tuple[int, int]]:
+    return [m.span() for m in finditer(text)]
+
+
+def timed(func, *args):
+    begin = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - begin, result
+
+
+def corpus(template: str, size: int, gap: int, seed: int = 19) -> str:
+    """长约 size 个字符的随机文本, 每隔约 gap 个字符插入一处 template 的匹配"""
+    rng = random.Random(seed)
+    parts: list[str] = []
+    length = 0
+    next_match = gap
+    while length < size:
+        if length >= next_match:
+            part = template.format(rng.randint(100, 999))
+            next_match += gap
+        else:
+            part = rng.choice(WORDS)
+        parts.append(part)
+        length += len(part) + 1
+    return " ".join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=200_000, help="文本的字符数")
+    parser.add_argument("--gap", type=int, default=20_000, help="相邻匹配的平均间隔")
+    args = parser.parse_args()
+
+    for name, pattern, template in CASES:
+        text = corpus(template, args.size, args.gap)
+        fast = PikeVM(pattern)
+        slow = PikeVM(pattern, prefilter=False)
+        t_fast, spans = timed(match_spans, fast.finditer, text)
+        t_slow, plain = timed(match_spans, slow.finditer, text)
+        t_re, expected = timed(match_spans, re.compile(pattern).finditer, text)
+        assert spans == plain == expected
+        print(
+            f"{name:8} {len(spans):>4} matches  prefilter {t_fast * 1e3:8.2f}ms  "
+            f"none {t_slow * 1e3:8.2f}ms  re {t_re * 1e3:8.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
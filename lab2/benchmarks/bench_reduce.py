@@ -0,0 +1,63 @@
+"""NFA化简: 消除 epsilon 与互模拟合并前后的规模, 以及模拟、子集构造的耗时
+
+对每个模式给出 Thompson NFA、remove_epsilons() 与 reduce() 的状态数/边数,
+并比较在原NFA与化简后NFA上 NFA.simulate (逐字符求闭包) 和 DFA(nfa) 的耗时。
+用法 (在 lab2 目录下): python -m benchmarks.bench_reduce [--patterns ...] [--length N]
+"""
+
+import argparse
+import time
+
+from lab2 import DFA, Regex
+
+DEFAULT_PATTERNS = [
+    "(a|b)*abb",
+    "(ab|cd)*x",
+    "(if|in|int|for|from|while|with|def|del)+",
+    r"[a-z]+@[a-z]+\.(com|org|net)",
+    "(a|b)*a" + "(a|b)" * 10,
+    "(a|b|c)*" + "(abc|abd)" * 10,
+]
+
+
+def best_of(func, *args, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - begin)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--patterns", nargs="+", default=DEFAULT_PATTERNS)
+    parser.add_argument("--length", type=int, default=2000, help="模拟输入长度")
+    args = parser.parse_args()
+
+    print(
+        f"{'pattern':<28} {'thompson':>9} {'eps-free':>9} {'reduced':>9} "
+        f"{'reduce':>8} {'simulate':>17} {'subset':>17}"
+    )
+    for pattern in args.patterns:
+        nfa = Regex(pattern).to_nfa()
+        epsilon_free = nfa.remove_epsilons()
+        reduced = nfa.reduce()
+        t_reduce = best_of(nfa.reduce)
+        text = ("ab" * args.length)[: args.length]
+        t_sim = best_of(nfa.simulate, text)
+        t_sim_reduced = best_of(reduced.simulate, text)
+        t_dfa = best_of(DFA, nfa)
+        t_dfa_reduced = best_of(DFA, reduced)
+        label = pattern if len(pattern) <= 28 else pattern[:25] + "..."
+        sizes = [f"{len(a.states)}/{a.num_edges}" for a in (nfa, epsilon_free, reduced)]
+        print(
+            f"{label:<28} {sizes[0]:>9} {sizes[1]:>9} {sizes[2]:>9} "
+            f"{t_reduce * 1e3:>6.2f}ms "
+            f"{t_sim * 1e3:>7.1f}->{t_sim_reduced * 1e3:>6.1f}ms "
+            f"{t_dfa * 1e3:>7.2f}->{t_dfa_reduced * 1e3:>6.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""对比逐个模式匹配与 RegexSet 单次扫描的耗时
+
+separate: 每个模式一个最小化DFA, 每个字符串对所有模式各 simulate 一次
+regexset: 所有模式并联成一个带标签的DFA, 每个字符串扫描一次
+用法 (在 lab2 目录下): python -m benchmarks.bench_regexset [--patterns N] [--strings M]
+"""
+
+import argparse
+import random
+import time
+
+from lab2 import DFA, Regex, RegexSet
+
+
+def make_patterns(count: int, rng: random.Random) -> list[str]:
+    """生成形如 (a|b)*<w> 与 <w>(a|b)* 的模式, w 为随机 a/b 串"""
+    patterns = []
+    for _ in range(count):
+        word = "".join(rng.choice("ab") for _ in range(rng.randint(2, 5)))
+        if rng.random() < 0.5:
+            patterns.append(f"(a|b)*{word}")
+        else:
+            patterns.append(f"{word}(a|b)*")
+    return patterns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--patterns", type=int, default=200)
+    parser.add_argument("--strings", type=int, default=2000)
+    parser.add_argument("--length", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    patterns = make_patterns(args.patterns, rng)
+    strings = [
+        "".join(rng.choice("ab") for _ in range(args.length))
+        for _ in range(args.strings)
+    ]
+
+    begin = time.perf_counter()
+    dfas = [DFA(Regex(pattern).to_nfa()).minimize() for pattern in patterns]
+    build_separate = time.perf_counter() - begin
+    begin = time.perf_counter()
+    regex_set = RegexSet(patterns)
+    build_set = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    expected = [
+        {tag for tag, dfa in enumerate(dfas) if dfa.simulate(string)}
+        for string in strings
+    ]
+    match_separate = time.perf_counter() - begin
+    begin = time.perf_counter()
+    result = [regex_set.matches(string) for string in strings]
+    match_set = time.perf_counter() - begin
+    assert result == expected
+
+    print(f"{args.patterns} patterns, {args.strings} strings of length {args.length}")
+    print(f"{'':<10} {'build':>10} {'match':>10} {'states':>8}")
+    total = sum(len(dfa.states) for dfa in dfas)
+    print(
+        f"{'separate':<10} {build_separate * 1e3:>8.1f}ms "
+        f"{match_separate * 1e3:>8.1f}ms {total:>8}"
+    )
+    print(
+        f"{'regexset':<10} {build_set * 1e3:>8.1f}ms "
+        f"{match_set * 1e3:>8.1f}ms {len(regex_set.dfa.states):>8}"
+    )
+
+
+if __name__ == "__main__":
+    main()
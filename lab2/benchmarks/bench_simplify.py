@@ -0,0 +1,68 @@
+"""对比语法树化简前后的自动机规模与构造耗时
+
+plain:      Regex(pattern, simplify=False), 直接由分析得到的语法树构造
+simplified: Regex(pattern), 展平、合并闭包、分支去重与提取公共前缀后再构造
+分别给出 Thompson NFA 的状态数、子集构造所得 DFA 的状态数与 NFA -> DFA 的总耗时
+用法 (在 lab2 目录下): python -m benchmarks.bench_simplify [--patterns ...]
+"""
+
+import argparse
+import time
+
+from lab2 import DFA, Regex
+
+KEYWORDS = [
+    "if",
+    "in",
+    "int",
+    "import",
+    "is",
+    "for",
+    "from",
+    "finally",
+    "def",
+    "del",
+    "while",
+    "with",
+]
+
+DEFAULT_PATTERNS = [
+    "((a|b)?)+abb",
+    "((a*)*b*)*c",
+    "(ab|ac|ad|ae)*",
+    "|".join(KEYWORDS),
+    "(" + "|".join(KEYWORDS) + ")( (" + "|".join(KEYWORDS) + "))*",
+    "(a|b|c|d|e|f|g|h)*x",
+]
+
+
+def measure(regex: Regex) -> tuple[float, int, int]:
+    """返回 (耗时秒数, NFA状态数, DFA状态数)"""
+    begin = time.perf_counter()
+    nfa = regex.to_nfa()
+    dfa = DFA(nfa)
+    elapsed = time.perf_counter() - begin
+    return elapsed, len(nfa.states), len(dfa.states)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--patterns", nargs="+", default=DEFAULT_PATTERNS)
+    args = parser.parse_args()
+
+    print(
+        f"{'pattern':<32} {'plain':>10} {'nfa':>6} {'dfa':>6} "
+        f"{'simplified':>10} {'nfa':>6} {'dfa':>6}"
+    )
+    for pattern in args.patterns:
+        t_plain, nfa_plain, dfa_plain = measure(Regex(pattern, simplify=False))
+        t_simple, nfa_simple, dfa_simple = measure(Regex(pattern))
+        label = pattern if len(pattern) <= 32 else pattern[:29] + "..."
+        print(
+            f"{label:<32} {t_plain * 1e3:>8.2f}ms {nfa_plain:>6} {dfa_plain:>6} "
+            f"{t_simple * 1e3:>8.2f}ms {nfa_simple:>6} {dfa_simple:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
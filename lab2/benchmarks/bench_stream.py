@@ -0,0 +1,55 @@
+"""流式扫描文件的吞吐量
+
+lines:  逐行读取文件, 对每行调用 CompiledDFA.search (整行入内存, 每行一个对象)
+stream: StreamMatcher.scan_file 按块映射文件, 单趟表报告每个匹配的结束偏移
+用法 (在 lab2 目录下): python -m benchmarks.bench_stream [--size-mb N] [--pattern P]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from lab2 import DFA, Regex, StreamMatcher
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=float, default=8)
+    parser.add_argument("--pattern", default="(a|b)*abb")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    size = int(args.size_mb * (1 << 20))
+    lines = ["".join(rng.choice("abc") for _ in range(79)) + "\n" for _ in range(1000)]
+    compiled = DFA(Regex(args.pattern).to_nfa()).minimize().compile()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "input.txt")
+        with open(path, "w", encoding="utf-8") as file:
+            written = 0
+            while written < size:
+                file.writelines(lines)
+                written += 80 * len(lines)
+
+        begin = time.perf_counter()
+        with open(path, encoding="utf-8") as file:
+            matched_lines = sum(compiled.search(text) for text in file)
+        elapsed_lines = time.perf_counter() - begin
+
+        begin = time.perf_counter()
+        matcher = StreamMatcher(compiled)
+        matches = sum(1 for _ in matcher.scan_file(path))
+        elapsed_stream = time.perf_counter() - begin
+
+    megabytes = written / (1 << 20)
+    print(f"pattern {args.pattern!r}, {megabytes:.1f} MB")
+    print(f"lines   {elapsed_lines:>7.2f}s {megabytes / elapsed_lines:>7.2f} MB/s")
+    print(f"stream  {elapsed_stream:>7.2f}s {megabytes / elapsed_stream:>7.2f} MB/s")
+    print(f"{matched_lines} matching lines, {matches} match ends")
+
+
+if __name__ == "__main__":
+    main()
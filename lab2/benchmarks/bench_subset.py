@@ -0,0 +1,77 @@
+"""子集构造基准: 经典的 (a|b)*a(a|b){n} 族, 其最小DFA有 2^(n+1) 个状态
+
+对比当前位掩码 + 双端队列实现与原先基于 frozenset + list.pop(0) 的实现。
+用法 (在 lab2 目录下): python -m benchmarks.bench_subset [--max-n 16] [--legacy-max-n 16]
+"""
+
+import argparse
+import time
+
+from lab2 import DFA, NFA, DFAState, Regex
+
+
+def legacy_subset_construction(nfa: NFA) -> DFA:
+    """原先的 DFA.initialize_from_nfa, 仅用于对比"""
+    dfa = DFA()
+    assert nfa.start_state
+    initial_closure = nfa.epsilon_closure({nfa.start_state})
+    start_state = DFAState()
+    dfa.add_state(start_state, nfa.accept_state in initial_closure)
+    dfa.set_start_state(start_state)
+
+    unmarked = [(start_state, initial_closure)]
+    marked = {}
+    marked[frozenset(initial_closure)] = start_state
+
+    while unmarked:
+        current_dfa_state, current_nfa_states = unmarked.pop(0)
+        for input_char in set(
+            char
+            for state in current_nfa_states
+            for char in state.transitions
+            if char is not None
+        ):
+            new_nfa_states = nfa.epsilon_closure(
+                nfa.move(current_nfa_states, input_char)
+            )
+            state_set = frozenset(new_nfa_states)
+            if state_set not in marked:
+                new_dfa_state = DFAState()
+                dfa.add_state(
+                    new_dfa_state,
+                    any(s == nfa.accept_state for s in new_nfa_states),
+                )
+                marked[state_set] = new_dfa_state
+                unmarked.append((new_dfa_state, new_nfa_states))
+            current_dfa_state.add_transition(input_char, marked[state_set])
+    return dfa
+
+
+def timed(func, *args):
+    begin = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - begin, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-n", type=int, default=16)
+    parser.add_argument("--legacy-max-n", type=int, default=16)
+    args = parser.parse_args()
+
+    print(f"{'n':>3} {'states':>8} {'legacy':>10} {'current':>10} speedup")
+    for n in range(1, args.max_n + 1):
+        nfa = Regex("(a|b)*a" + "(a|b)" * n).to_nfa()
+        t_current, dfa = timed(DFA, nfa)
+        if n <= args.legacy_max_n:
+            t_legacy, legacy = timed(legacy_subset_construction, nfa)
+            assert len(legacy.states) == len(dfa.states)
+            legacy_cell = f"{t_legacy:>9.3f}s"
+            speedup = f"{t_legacy / t_current:.1f}x"
+        else:
+            legacy_cell, speedup = f"{'skipped':>10}", ""
+        print(f"{n:>3} {len(dfa.states):>8} {legacy_cell} {t_current:>9.3f}s {speedup}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,41 @@
+from lab2.bitnfa import BitsetNFA
+from lab2.cache import compile, load_or_compile
+from lab2.charclass import CharClass
+from lab2.compiled import CompiledDFA
 from lab2.dfa import DFA
+from lab2.lazy import LazyDFA
+from lab2.lexer import Lexer, LexError, Token
+from lab2.literals import AhoCorasick, LiteralInfo, Prefilter
 from lab2.nfa import NFA
+from lab2.parser import RegexSyntaxError, parse
+from lab2.pike import Match, PikeVM
 from lab2.regex import Regex
-from lab2.state import State
+from lab2.regexset import RegexSet
+from lab2.state import DFAState, State
+from lab2.stream import StreamMatcher
 
-__all__ = ["DFA", "NFA", "Regex", "State"]
+__all__ = [
+    "DFA",
+    "NFA",
+    "AhoCorasick",
+    "BitsetNFA",
+    "CharClass",
+    "CompiledDFA",
+    "DFAState",
+    "LazyDFA",
+    "LexError",
+    "Lexer",
+    "LiteralInfo",
+    "Match",
+    "PikeVM",
+    "Prefilter",
+    "Regex",
+    "RegexSet",
+    "RegexSyntaxError",
+    "State",
+    "StreamMatcher",
+    "Token",
+    "compile",
+    "load_or_compile",
+    "parse",
+]
@@ -0,0 +1,217 @@
+from typing import TYPE_CHECKING
+
+from lab2.charclass import Alphabet, CharClass
+
+if TYPE_CHECKING:
+    from lab2.nfa import NFA
+
+
+class BitsetNFA:
+    """基于位集的NFA模拟引擎
+
+    NFA状态按其在 nfa.states 中的下标编号, 活动状态集合保存为一个 Python 整数位掩码。
+    每个状态的 epsilon 闭包预先计算一次; 对每个符号, 预先计算每个源状态经该符号
+    转移后再取闭包得到的后继掩码, 于是一步推进只需对活动且有该符号出边的状态做按位或。
+    NFA含有字符类 (区间) 转移时, 先用 Alphabet 把全部符号划分为互不相交的原子,
+    后继表以原子为键, 推进时把输入字符归类到其原子。
+    """
+
+    __slots__ = (
+        "_sources",
+        "_successors",
+        "accept",
+        "alphabet",
+        "closures",
+        "num_states",
+        "start",
+        "state_symbols",
+        "tags",
+    )
+
+    def __init__(self, nfa: "NFA"):
+        assert nfa.start_state is not None, "init first"
+        ids = {state: i for i, state in enumerate(nfa.states)}
+        self.num_states: int = len(ids)
+        self.closures: list[int] = self._compute_closures(nfa, ids)
+        self.start: int = self.closures[ids[nfa.start_state]]
+        self.accept: int = 0
+        for state in nfa.accepting_states():
+            self.accept |= 1 << ids[state]
+        # 带标签的接受状态: (状态位, 模式编号)
+        self.tags: tuple[tuple[int, int], ...] = tuple(
+            (1 << ids[state], tag)
+            for state, tags in nfa.accept_tags.items()
+            for tag in sorted(tags)
+        )
+
+        labels = {
+            char
+            for state in nfa.states
+            for char in state.transitions
+            if char is not None
+        }
+        self.alphabet: Alphabet | None = None
+        if any(isinstance(label, CharClass) for label in labels):
+            self.alphabet = Alphabet(labels)
+
+        # 符号 -> 每个源状态的后继闭包掩码; 符号 -> 有该符号出边的源状态掩码
+        self._successors: dict[str | CharClass, list[int]] = {}
+        self._sources: dict[str | CharClass, int] = {}
+        # 每个状态的非 epsilon 出边符号
+        self.state_symbols: list[tuple[str | CharClass, ...]] = []
+        for state, i in ids.items():
+            symbols: dict[str | CharClass, None] = {}
+            for label, targets in state.transitions.items():
+                if label is None:
+                    continue
+                atoms = (
+                    [label] if self.alphabet is None else self.alphabet.atoms_of(label)
+                )
+                for char in atoms:
+                    symbols[char] = None
+                    row = self._successors.setdefault(char, [0] * self.num_states)
+                    for target in targets:
+                        row[i] |= self.closures[ids[target]]
+                    self._sources[char] = self._sources.get(char, 0) | 1 << i
+            self.state_symbols.append(tuple(symbols))
+
+    @staticmethod
+    def _compute_closures(nfa: "NFA", ids) -> list[int]:
+        """用 Tarjan 强连通分量算法一次性求出所有状态的 epsilon 闭包掩码
+
+        同一强连通分量内的状态闭包相同, 分量按逆拓扑序出栈, 出栈时其后继分量已求得。
+        """
+        edges = [
+            [ids[target] for target in state.transitions.get(None, ())]
+            for state in nfa.states
+        ]
+        n = len(edges)
+        closures = [0] * n
+        index = [-1] * n
+        lowlink = [0] * n
+        on_stack = [False] * n
+        stack: list[int] = []
+        counter = 0
+        for root in range(n):
+            if index[root] >= 0:
+                continue
+            work = [(root, 0)]
+            while work:
+                v, edge_i = work.pop()
+                if edge_i == 0:
+                    index[v] = lowlink[v] = counter
+                    counter += 1
+                    stack.append(v)
+                    on_stack[v] = True
+                if edge_i < len(edges[v]):
+                    work.append((v, edge_i + 1))
+                    w = edges[v][edge_i]
+                    if index[w] < 0:
+                        work.append((w, 0))
+                    elif on_stack[w]:
+                        lowlink[v] = min(lowlink[v], index[w])
+                    continue
+                # v 的所有出边处理完毕, 子节点的 lowlink 已在其完成时回传
+                if lowlink[v] == index[v]:
+                    component: list[int] = []
+                    mask = 0
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        component.append(w)
+                        mask |= 1 << w
+                        if w == v:
+                            break
+                    for w in component:
+                        for x in edges[w]:
+                            mask |= closures[x]
+                    for w in component:
+                        closures[w] = mask
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[v])
+        return closures
+
+    def step(self, mask: int, char: str | CharClass) -> int:
+        """从活动状态掩码出发读入一个字符 (或原子符号), 返回新的活动状态掩码 (已含闭包)"""
+        row = self._successors.get(char)
+        if row is None:
+            if self.alphabet is None or isinstance(char, CharClass):
+                return 0
+            atom = self.alphabet.classify(char)
+            if atom is None:
+                return 0
+            char = atom
+            row = self._successors[char]
+        sources = mask & self._sources[char]
+        result = 0
+        while sources:
+            low = sources & -sources
+            result |= row[low.bit_length() - 1]
+            sources ^= low
+        return result
+
+    def symbols_of(self, mask: int) -> list[str | CharClass]:
+        """活动状态集合中各状态出边符号的并集
+
+        活动状态少于符号数时按状态查出边符号索引, 否则逐个符号与其源状态掩码求交。
+        """
+        if mask.bit_count() >= len(self._sources):
+            return [char for char, sources in self._sources.items() if mask & sources]
+        state_symbols = self.state_symbols
+        symbols: dict[str | CharClass, None] = {}
+        while mask:
+            low = mask & -mask
+            symbols.update(dict.fromkeys(state_symbols[low.bit_length() - 1]))
+            mask ^= low
+        return list(symbols)
+
+    def tags_of(self, mask: int) -> frozenset[int]:
+        """活动状态集合中带标签接受状态的模式编号"""
+        return frozenset(tag for bit, tag in self.tags if mask & bit)
+
+    def symbols(self) -> set[str | CharClass]:
+        """NFA中出现的全部非 epsilon 原子符号"""
+        return set(self._successors)
+
+    def fullmatch(self, string: str) -> bool:
+        """整个字符串是否被接受"""
+        step = self.step
+        mask = self.start
+        for char in string:
+            mask = step(mask, char)
+            if not mask:
+                return False
+        return mask & self.accept != 0
+
+    def match(self, string: str) -> bool:
+        """字符串的某个前缀 (含空串) 是否被接受"""
+        step = self.step
+        accept = self.accept
+        mask = self.start
+        if mask & accept:
+            return True
+        for char in string:
+            mask = step(mask, char)
+            if not mask:
+                return False
+            if mask & accept:
+                return True
+        return False
+
+    def search(self, string: str) -> bool:
+        """字符串的某个子串是否被接受, 每个位置向活动集合并入起始闭包"""
+        step = self.step
+        accept = self.accept
+        start = self.start
+        mask = start
+        if mask & accept:
+            return True
+        for char in string:
+            mask = step(mask, char) | start
+            if mask & accept:
+                return True
+        return False
+
+    def __repr__(self):
+        return f"BitsetNFA(states={self.num_states}, symbols={len(self._successors)})"
@@ -0,0 +1,153 @@
+import hashlib
+import mmap
+import os
+import tempfile
+import threading
+from collections import OrderedDict, namedtuple
+from importlib import metadata
+from pathlib import Path
+
+from lab2.compiled import FORMAT_VERSION, CompiledDFA
+from lab2.dfa import DFA
+from lab2.regex import Regex
+
+try:
+    LIBRARY_VERSION = metadata.version("lab2")
+except metadata.PackageNotFoundError:  # 未安装时直接从源码树运行
+    LIBRARY_VERSION = "0+unknown"
+
+CompileCacheInfo = namedtuple(
+    "CompileCacheInfo", ["hits", "misses", "maxsize", "currsize"]
+)
+
+
+def pattern_key(pattern: str, minimize: bool = True, byte_mode: bool = False) -> str:
+    """缓存键: 规范化模式 (化简后的语法树)、编译选项、库版本与格式版本的 SHA-256"""
+    normalized = repr(Regex(pattern).ast)
+    material = "\0".join(
+        [
+            normalized,
+            str(minimize),
+            str(byte_mode),
+            LIBRARY_VERSION,
+            str(FORMAT_VERSION),
+        ]
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _map_file(path: Path) -> CompiledDFA:
+    """只读映射缓存文件, 转移表直接引用映射的页面"""
+    with open(path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return CompiledDFA.from_buffer(mapped)
+
+
+def load_or_compile(
+    pattern: str,
+    cache_dir: str | os.PathLike,
+    *,
+    minimize: bool = True,
+    byte_mode: bool = False,
+) -> CompiledDFA:
+    """从磁盘缓存加载模式的 CompiledDFA, 未命中或缓存损坏时编译并写入缓存
+
+    写入先落到同目录的临时文件再原子替换, 多个进程并发编译同一模式也不会读到半个文件。
+    """
+    cache_dir = Path(cache_dir)
+    path = cache_dir / f"{pattern_key(pattern, minimize, byte_mode)}.dfa"
+    if path.exists():
+        try:
+            return _map_file(path)
+        except (OSError, ValueError):
+            pass  # 文件损坏或格式过期, 重新编译覆盖
+
+    compiled = _build(pattern, minimize, byte_mode)
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(compiled.to_bytes())
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    return compiled
+
+
+def _build(pattern: str, minimize: bool, byte_mode: bool = False) -> CompiledDFA:
+    nfa = Regex(pattern).to_nfa()
+    dfa = DFA(nfa.to_utf8() if byte_mode else nfa)
+    return (dfa.minimize() if minimize else dfa).compile(byte_mode)
+
+
+class CompileCache:
+    """进程内的正规表达式编译缓存, 按模式与编译选项保存共享的不可变 CompiledDFA
+
+    容量有限, 超出时淘汰最久未使用的条目; 接口仿照 functools.lru_cache。
+    未命中时若给出 cache_dir 则经由磁盘缓存 load_or_compile 加载, 否则直接编译。
+    编译在锁外进行, 并发编译同一模式时以先写入者为准。
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self._entries: OrderedDict[tuple[str, bool, bool], CompiledDFA] = OrderedDict()
+        self._lock = threading.Lock()
+        self._maxsize = maxsize
+        self._hits = 0
+        self._misses = 0
+
+    def __call__(
+        self,
+        pattern: str,
+        *,
+        minimize: bool = True,
+        byte_mode: bool = False,
+        cache_dir: str | os.PathLike | None = None,
+    ) -> CompiledDFA:
+        key = (pattern, minimize, byte_mode)
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return compiled
+            self._misses += 1
+        if cache_dir is None:
+            compiled = _build(pattern, minimize, byte_mode)
+        else:
+            compiled = load_or_compile(
+                pattern, cache_dir, minimize=minimize, byte_mode=byte_mode
+            )
+        with self._lock:
+            compiled = self._entries.setdefault(key, compiled)
+            self._entries.move_to_end(key)
+            self._evict()
+        return compiled
+
+    def _evict(self):
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def cache_info(self) -> CompileCacheInfo:
+        """返回命中、未命中次数, 容量与当前条目数"""
+        with self._lock:
+            return CompileCacheInfo(
+                self._hits, self._misses, self._maxsize, len(self._entries)
+            )
+
+    def cache_clear(self):
+        """清空缓存与统计"""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = 0
+
+    def set_maxsize(self, maxsize: int):
+        """调整容量, 缩小时立即淘汰多余条目"""
+        assert maxsize >= 0, "maxsize must be non-negative"
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+
+compile = CompileCache()
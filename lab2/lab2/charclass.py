@@ -0,0 +1,219 @@
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
+
+MAX_CODEPOINT = 0x10FFFF
+
+
+class CharClass:
+    """字符类: 码点闭区间的集合, 作为自动机的区间转移符号
+
+    区间按起点排序且互不相交、互不相邻, 因此相等的字符类有相同的表示, 可作为字典键。
+    单个码点的字符类在构造自动机时退化为普通的单字符转移。
+    """
+
+    __slots__ = ("_hash", "_starts", "intervals")
+
+    def __init__(self, intervals: Iterable[tuple[int, int]]):
+        merged: list[tuple[int, int]] = []
+        for lo, hi in sorted(intervals):
+            if lo > hi:
+                raise ValueError(f"bad interval: {lo:#x}-{hi:#x}")
+            if merged and lo <= merged[-1][1] + 1:
+                if hi > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], hi)
+            else:
+                merged.append((lo, hi))
+        self.intervals: tuple[tuple[int, int], ...] = tuple(merged)
+        self._starts = tuple(lo for lo, _ in merged)
+        self._hash = hash(self.intervals)
+
+    @classmethod
+    def from_char(cls, char: str) -> "CharClass":
+        return cls([(ord(char), ord(char))])
+
+    @classmethod
+    def from_range(cls, first: str, last: str) -> "CharClass":
+        return cls([(ord(first), ord(last))])
+
+    def negate(self) -> "CharClass":
+        """补集 (相对于全部 Unicode 码点)"""
+        gaps = []
+        previous = 0
+        for lo, hi in self.intervals:
+            if lo > previous:
+                gaps.append((previous, lo - 1))
+            previous = hi + 1
+        if previous <= MAX_CODEPOINT:
+            gaps.append((previous, MAX_CODEPOINT))
+        return CharClass(gaps)
+
+    def union(self, other: "CharClass") -> "CharClass":
+        return CharClass(self.intervals + other.intervals)
+
+    def single(self) -> str | None:
+        """只含一个码点时返回该字符, 否则返回 None"""
+        if len(self.intervals) == 1 and self.intervals[0][0] == self.intervals[0][1]:
+            return chr(self.intervals[0][0])
+        return None
+
+    def __contains__(self, char: str) -> bool:
+        code = ord(char)
+        i = bisect_right(self._starts, code) - 1
+        return i >= 0 and code <= self.intervals[i][1]
+
+    def __len__(self):
+        """包含的码点数"""
+        return sum(hi - lo + 1 for lo, hi in self.intervals)
+
+    def __eq__(self, other):
+        return isinstance(other, CharClass) and self.intervals == other.intervals
+
+    def __hash__(self):
+        return self._hash
+
+    def __str__(self):
+        parts = []
+        for lo, hi in self.intervals:
+            parts.append(_show(lo) if lo == hi else f"{_show(lo)}-{_show(hi)}")
+        return "[" + "".join(parts) + "]"
+
+    def __repr__(self):
+        return f"CharClass({str(self)!r})"
+
+
+def _show(code: int) -> str:
+    char = chr(code)
+    if char.isprintable() and char not in "[]\\-^":
+        return char
+    if code <= 0xFF:
+        return f"\\x{code:02x}"
+    return f"\\u{code:04x}" if code <= 0xFFFF else f"\\U{code:08x}"
+
+
+DIGIT = CharClass([(ord("0"), ord("9"))])
+WORD = CharClass([(ord(lo), ord(hi)) for lo, hi in ("09", "AZ", "__", "az")])
+SPACE = CharClass([(ord(char), ord(char)) for char in " \t\n\r\f\v"])
+ANY = CharClass.from_char("\n").negate()  # . 匹配除换行外的任意字符
+
+
+def matches(label: str | CharClass, char: str) -> bool:
+    """转移符号 label 是否接受字符 char"""
+    if isinstance(label, CharClass):
+        return char in label
+    return label == char
+
+
+class Alphabet:
+    """把可能相互重叠的转移符号划分为互不相交的原子符号
+
+    扫描所有符号的区间端点得到基本区间, 被同一组符号覆盖的基本区间合为一个原子;
+    只含一个码点的原子用该字符表示, 其余用 CharClass 表示。
+    atoms_of 给出每个符号覆盖的原子, classify 用二分查找给出任意字符所属的原子。
+    """
+
+    __slots__ = ("_atoms_of", "_starts", "_symbols")
+
+    def __init__(self, labels: Iterable[str | CharClass]):
+        labels = list(dict.fromkeys(labels))
+        # 端点事件: (码点, 符号下标, 进入为 True)
+        events: dict[int, list[tuple[int, bool]]] = {}
+        for index, label in enumerate(labels):
+            intervals = (
+                label.intervals
+                if isinstance(label, CharClass)
+                else ((ord(label), ord(label)),)
+            )
+            for lo, hi in intervals:
+                events.setdefault(lo, []).append((index, True))
+                events.setdefault(hi + 1, []).append((index, False))
+
+        # 扫描得到基本区间 [bound, next_bound) 及其覆盖符号集合
+        active: set[int] = set()
+        segments: list[tuple[int, int, frozenset[int]]] = []
+        bounds = sorted(events)
+        for i, bound in enumerate(bounds):
+            for index, entering in events[bound]:
+                if entering:
+                    active.add(index)
+                else:
+                    active.discard(index)
+            if active and i + 1 < len(bounds):
+                segments.append((bound, bounds[i + 1] - 1, frozenset(active)))
+
+        groups: dict[frozenset[int], list[tuple[int, int]]] = {}
+        for lo, hi, signature in segments:
+            groups.setdefault(signature, []).append((lo, hi))
+        atom_of_signature: dict[frozenset[int], str | CharClass] = {}
+        for signature, pieces in groups.items():
+            if len(pieces) == 1 and pieces[0][0] == pieces[0][1]:
+                atom_of_signature[signature] = chr(pieces[0][0])
+            else:
+                atom_of_signature[signature] = CharClass(pieces)
+
+        self._atoms_of: dict[str | CharClass, list[str | CharClass]] = {
+            label: [] for label in labels
+        }
+        for signature, atom in atom_of_signature.items():
+            for index in signature:
+                self._atoms_of[labels[index]].append(atom)
+
+        # 分类表: 基本区间起点 -> 原子, 空隙为 None; 末项总是一段空隙
+        self._starts: list[int] = [0]
+        self._symbols: list[str | CharClass | None] = [None]
+        for lo, hi, signature in segments:
+            if lo == self._starts[-1]:
+                self._symbols[-1] = atom_of_signature[signature]
+            else:
+                self._starts.append(lo)
+                self._symbols.append(atom_of_signature[signature])
+            self._starts.append(hi + 1)
+            self._symbols.append(None)
+
+    def atoms_of(self, label: str | CharClass) -> list[str | CharClass]:
+        """符号 label 覆盖的原子"""
+        return self._atoms_of[label]
+
+    def classify(self, char: str) -> str | CharClass | None:
+        """字符所属的原子, 不属于任何符号时返回 None"""
+        return self._symbols[bisect_right(self._starts, ord(char)) - 1]
+
+
+def utf8_sequences(lo: int, hi: int) -> Iterator[list[tuple[int, int]]]:
+    """把码点区间 [lo, hi] 的 UTF-8 编码拆成若干字节区间序列
+
+    每个序列是逐字节的区间列表, 其笛卡尔积恰为一段连续码点的编码; 代理区不可编码, 被跳过。
+    先按编码长度切开, 再在低位字节未取满的位置切开, 直到首尾码点只在末尾若干字节上不同。
+    """
+    stack = [(lo, hi)]
+    while stack:
+        lo, hi = stack.pop()
+        if lo > hi:
+            continue
+        if lo <= 0xDFFF and hi >= 0xD800:
+            stack.append((lo, 0xD7FF))
+            stack.append((0xE000, hi))
+            continue
+        for boundary in (0x7F, 0x7FF, 0xFFFF):
+            if lo <= boundary < hi:
+                stack.append((lo, boundary))
+                stack.append((boundary + 1, hi))
+                break
+        else:
+            if hi <= 0x7F:
+                yield [(lo, hi)]
+                continue
+            for i in range(1, 4):
+                mask = (1 << (6 * i)) - 1
+                if lo & ~mask != hi & ~mask:
+                    if lo & mask != 0:
+                        stack.append((lo, lo | mask))
+                        stack.append(((lo | mask) + 1, hi))
+                        break
+                    if hi & mask != mask:
+                        stack.append((lo, (hi & ~mask) - 1))
+                        stack.append((hi & ~mask, hi))
+                        break
+            else:
+                first = chr(lo).encode("utf-8")
+                last = chr(hi).encode("utf-8")
+                yield list(zip(first, last))
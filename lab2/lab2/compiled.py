@@ -0,0 +1,580 @@
+import importlib
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable
+from itertools import repeat
+from types import ModuleType
+from typing import Any
+
+from lab2.charclass import MAX_CODEPOINT
+
+try:
+    np: ModuleType | None = importlib.import_module("numpy")
+except ImportError:  # numpy 为可选依赖
+    np = None
+
+# 转移表中表示"无转移"的死状态哨兵
+DEAD = -1
+# match_many 每批同时推进的字符串数量上限
+BATCH_SIZE = 1 << 16
+
+# 序列化格式: 魔数, 格式版本, 字节序标记, 状态数, 符号类数, 起始状态, 类映射条目数,
+# 区间分段数, 接受位集字节数, 标志位
+MAGIC = b"LAB2DFA\0"
+FORMAT_VERSION = 3
+_HEADER = struct.Struct("<8sIIIIIIIII")
+_FLAG_BYTE_MODE = 1
+_BYTE_ORDER = {"little": 1, "big": 2}
+# 二进制位串 '0'/'1' 到标记字节 0/1
+_BIT_FLAGS = bytes.maketrans(b"01", b"\0\1")
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+class CompiledDFA:
+    """表驱动的不可变DFA
+
+    状态编号为 0..n-1 (起始状态为 0), 字母表被压缩为稠密的符号类,
+    转移表为扁平的 array('i'), 下标为 state * stride + symbol_class,
+    接受状态保存为按状态编号的标记字节 (序列化时为整数位集)。
+    符号类 0 保留给字母表之外的字符, 其整列均为 DEAD。
+    单个字符经 classes 字典归类; 字符类 (区间) 符号保存为按码点排序的分段表,
+    字典中查不到的字符再在分段表上二分查找。
+
+    byte_mode 为真时符号为 UTF-8 字节, 字节 b 在 classes 中以字符 chr(b) 表示,
+    另有 256 项的字节到符号类映射; 输入为 bytes 类对象时用 bytes.translate 一次得到
+    符号类序列而无需解码, str 输入先编码为 UTF-8。
+
+    匹配时使用首次需要时才构造并缓存的运行表 (from_buffer 加载的转移表因此仍不复制):
+    预乘行宽的转移列表, 表项为目标状态的行首偏移, 每个字符只需一次加法和取值;
+    字符模式且没有字符类符号时, 全匹配与前缀匹配改用每个状态一个 字符 -> 目标行 的字典,
+    每个字符只需一次下标取值。
+    """
+
+    __slots__ = (
+        "_accept",
+        "_accepting",
+        "_bound_classes",
+        "_bounds",
+        "_byte_map",
+        "_char_rows",
+        "_classes",
+        "_np_tables",
+        "_num_states",
+        "_premultiplied",
+        "_start",
+        "_stride",
+        "_table",
+    )
+    _classes: dict[str, int]
+    _table: array | memoryview
+    _stride: int
+    _start: int
+    _accept: int
+    _num_states: int
+    _bounds: tuple[int, ...] | None
+    _bound_classes: tuple[int, ...]
+    _byte_map: bytes | None
+    _np_tables: tuple[Any, Any, Any] | None
+    _accepting: bytes
+    _premultiplied: tuple[list[int], bytearray] | None
+    _char_rows: list[dict] | None
+
+    def __init__(
+        self,
+        classes: dict[str, int],
+        table: array | memoryview,
+        stride: int,
+        start: int,
+        accept: int,
+        num_states: int,
+        byte_mode: bool = False,
+        ranges: Iterable[tuple[int, int, int]] = (),
+    ):
+        # 分段表: bounds[i] 起至 bounds[i + 1] 之前的码点属于 bound_classes[i], 空隙为 0
+        bounds = [0]
+        bound_classes = [0]
+        for lo, hi, cls in sorted(ranges):
+            if lo == bounds[-1]:
+                bound_classes[-1] = cls
+            else:
+                bounds.append(lo)
+                bound_classes.append(cls)
+            bounds.append(hi + 1)
+            bound_classes.append(0)
+        has_ranges = len(bounds) > 1
+        byte_map: bytes | None = None
+        if byte_mode:
+            if (
+                stride > 256
+                or any(ord(char) > 0xFF for char in classes)
+                or (has_ranges and bounds[-1] > 0x100)
+            ):
+                raise ValueError("byte mode needs byte symbols and at most 256 classes")
+            byte_classes = bytearray(256)
+            for i in range(len(bounds) - 1):
+                byte_classes[bounds[i] : bounds[i + 1]] = bytes(
+                    [bound_classes[i]] * (bounds[i + 1] - bounds[i])
+                )
+            for char, cls in classes.items():
+                byte_classes[ord(char)] = cls
+            byte_map = bytes(byte_classes)
+        object.__setattr__(self, "_classes", classes)
+        object.__setattr__(self, "_table", table)
+        object.__setattr__(self, "_stride", stride)
+        object.__setattr__(self, "_start", start)
+        object.__setattr__(self, "_accept", accept)
+        object.__setattr__(self, "_num_states", num_states)
+        object.__setattr__(self, "_bounds", tuple(bounds) if has_ranges else None)
+        object.__setattr__(self, "_bound_classes", tuple(bound_classes))
+        object.__setattr__(self, "_byte_map", byte_map)
+        object.__setattr__(self, "_np_tables", None)
+        object.__setattr__(
+            self,
+            "_accepting",
+            format(accept, f"0{num_states}b")[::-1].encode().translate(_BIT_FLAGS)
+            if num_states
+            else b"",
+        )
+        object.__setattr__(self, "_premultiplied", None)
+        object.__setattr__(self, "_char_rows", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CompiledDFA is immutable")
+
+    @property
+    def num_states(self) -> int:
+        return self._num_states
+
+    @property
+    def num_classes(self) -> int:
+        return self._stride
+
+    @property
+    def start(self) -> int:
+        return self._start
+
+    @property
+    def classes(self) -> dict[str, int]:
+        """字符到符号类的映射 (副本)"""
+        return dict(self._classes)
+
+    @property
+    def ranges(self) -> list[tuple[int, int, int]]:
+        """字符类符号的码点区间 (lo, hi, 符号类)"""
+        bounds = self._bounds
+        if bounds is None:
+            return []
+        classes = self._bound_classes
+        return [
+            (bounds[i], bounds[i + 1] - 1, classes[i])
+            for i in range(len(bounds) - 1)
+            if classes[i]
+        ]
+
+    def class_of(self, char: str) -> int:
+        """字符所属的符号类, 不在字母表中时为 0"""
+        cls = self._classes.get(char)
+        if cls is not None:
+            return cls
+        if self._bounds is None:
+            return 0
+        return self._bound_classes[bisect_right(self._bounds, ord(char)) - 1]
+
+    @property
+    def byte_mode(self) -> bool:
+        return self._byte_map is not None
+
+    @property
+    def byte_classes(self) -> bytes | None:
+        """字节模式下 256 项的字节到符号类映射, 字符模式为 None"""
+        return self._byte_map
+
+    def symbol_classes(
+        self, data: str | bytes | bytearray | memoryview
+    ) -> Iterable[int]:
+        """把输入转换为符号类序列
+
+        字符模式逐字符查类映射; 字节模式先 translate 为类编号构成的 bytes, 迭代即得整数。
+        """
+        byte_map = self._byte_map
+        if byte_map is None:
+            if not isinstance(data, str):
+                raise TypeError("character-mode CompiledDFA expects str input")
+            if self._bounds is not None:
+                return map(self.class_of, data)
+            return map(self._classes.get, data, repeat(0))
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        elif not isinstance(data, (bytes, bytearray)):
+            data = bytes(data)
+        return data.translate(byte_map)
+
+    @property
+    def table(self) -> memoryview:
+        """只读的扁平转移表"""
+        return memoryview(self._table).toreadonly()
+
+    def is_accept(self, state: int) -> bool:
+        """判断状态是否为接受状态"""
+        return 0 <= state < self._num_states and self._accepting[state] == 1
+
+    def _rows(self) -> tuple[list[int], bytearray]:
+        """构造 (并缓存) 预乘行宽的转移列表与按行首偏移的接受标记
+
+        表项为目标状态的行首偏移 target * stride, DEAD 仍为 -1;
+        accepting[state * stride] 为 1 表示该状态接受。
+        """
+        if self._premultiplied is not None:
+            return self._premultiplied
+        stride = self._stride
+        rows = [target * stride if target >= 0 else DEAD for target in self._table]
+        accepting = bytearray(len(rows))
+        for state, flag in enumerate(self._accepting):
+            accepting[state * stride] = flag
+        object.__setattr__(self, "_premultiplied", (rows, accepting))
+        return rows, accepting
+
+    def _dict_rows(self) -> list[dict]:
+        """构造 (并缓存) 每个状态的 字符 -> 目标状态行 字典, 接受状态的字典另有键 None
+
+        只用于字符模式且没有字符类符号的情形, 其他情形为空列表; 死转移不出现在字典中。
+        """
+        if self._char_rows is not None:
+            return self._char_rows
+        if self._byte_map is not None or self._bounds is not None:
+            object.__setattr__(self, "_char_rows", [])
+            return []
+        table = self._table
+        stride = self._stride
+        rows: list[dict] = [{} for _ in range(self._num_states)]
+        for state, row in enumerate(rows):
+            base = state * stride
+            for char, cls in self._classes.items():
+                target = table[base + cls]
+                if target >= 0:
+                    row[char] = rows[target]
+            if self._accepting[state]:
+                row[None] = True
+        object.__setattr__(self, "_char_rows", rows)
+        return rows
+
+    def step(self, state: int, char: str) -> int:
+        """单步转移, 无转移时返回 DEAD"""
+        if state < 0:
+            return DEAD
+        return self._table[state * self._stride + self.class_of(char)]
+
+    def fullmatch(self, string: str | bytes | bytearray | memoryview) -> bool:
+        """整个字符串是否被接受"""
+        dict_rows = self._char_rows
+        if dict_rows is None:
+            dict_rows = self._dict_rows()
+        if dict_rows and isinstance(string, str):
+            row = dict_rows[self._start]
+            try:
+                for char in string:
+                    row = row[char]
+            except KeyError:  # 字母表外的字符或死转移
+                return False
+            return None in row
+        rows, accepting = self._rows()
+        state = self._start * self._stride
+        for cls in self.symbol_classes(string):
+            state = rows[state + cls]
+            if state < 0:
+                return False
+        return accepting[state] == 1
+
+    def match(self, string: str | bytes | bytearray | memoryview) -> bool:
+        """字符串的某个前缀 (含空串) 是否被接受"""
+        dict_rows = self._char_rows
+        if dict_rows is None:
+            dict_rows = self._dict_rows()
+        if dict_rows and isinstance(string, str):
+            row = dict_rows[self._start]
+            if None in row:
+                return True
+            try:
+                for char in string:
+                    row = row[char]
+                    if None in row:
+                        return True
+            except KeyError:
+                pass
+            return False
+        rows, accepting = self._rows()
+        state = self._start * self._stride
+        if accepting[state]:
+            return True
+        for cls in self.symbol_classes(string):
+            state = rows[state + cls]
+            if state < 0:
+                return False
+            if accepting[state]:
+                return True
+        return False
+
+    def search(self, string: str | bytes | bytearray | memoryview) -> bool:
+        """字符串的某个子串是否被接受
+
+        同时推进所有起点的活动状态集合, 每个位置重新注入起始状态, 复杂度 O(len * n)
+        """
+        rows, accepting = self._rows()
+        start = self._start * self._stride
+        if accepting[start]:
+            return True
+        active = {start}
+        for cls in self.symbol_classes(string):
+            next_active = {start}
+            for state in active:
+                target = rows[state + cls]
+                if target >= 0:
+                    if accepting[target]:
+                        return True
+                    next_active.add(target)
+            active = next_active
+        return False
+
+    def unanchored(self) -> "CompiledDFA":
+        """构造识别 Σ*L 的CompiledDFA, 供单趟扫描的子串搜索使用
+
+        对原DFA状态集合 (总含起始状态) 做子集构造, 字母表外的字符回到只含起始状态的集合。
+        于是读完第 i 个字符后处于接受状态, 当且仅当有匹配恰好在偏移 i 处结束。
+        """
+        table = self._table
+        stride = self._stride
+        start = self._start
+        flags = self._accepting
+        initial = frozenset((start,))
+        ids = {initial: 0}
+        order = [initial]
+        rows = array("i")
+        accept = 0
+        for i, subset in enumerate(order):  # order 在遍历中增长
+            if any(flags[state] for state in subset):
+                accept |= 1 << i
+            for cls in range(stride):
+                target = {start}
+                for state in subset:
+                    next_state = table[state * stride + cls]
+                    if next_state >= 0:
+                        target.add(next_state)
+                key = frozenset(target)
+                target_id = ids.get(key)
+                if target_id is None:
+                    target_id = ids[key] = len(order)
+                    order.append(key)
+                rows.append(target_id)
+        return CompiledDFA(
+            dict(self._classes),
+            rows,
+            stride,
+            0,
+            accept,
+            len(order),
+            self._byte_map is not None,
+            self.ranges,
+        )
+
+    def to_bytes(self) -> bytes:
+        """序列化为紧凑的二进制布局
+
+        依次为: 头部, 类映射 (码点, 符号类) int32 对, 区间 (起点, 终点, 符号类) int32 三元组,
+        接受位集, 转移表 int32;
+        各段按 8 字节对齐, 整数使用本机字节序以便加载时直接映射转移表。
+        """
+        entries = array("i")
+        for char, cls in self._classes.items():
+            entries.extend((ord(char), cls))
+        ranges = array("i")
+        for segment in self.ranges:
+            ranges.extend(segment)
+        accept = self._accept.to_bytes((self._num_states + 7) // 8, "little")
+        header = _HEADER.pack(
+            MAGIC,
+            FORMAT_VERSION,
+            _BYTE_ORDER[sys.byteorder],
+            self._num_states,
+            self._stride,
+            self._start,
+            len(self._classes),
+            len(ranges) // 3,
+            len(accept),
+            _FLAG_BYTE_MODE if self._byte_map is not None else 0,
+        )
+        parts = [
+            header,
+            entries.tobytes(),
+            ranges.tobytes(),
+            accept,
+            bytes(memoryview(self._table)),
+        ]
+        chunks = []
+        offset = 0
+        for part in parts:
+            padding = _align(offset) - offset
+            chunks.append(b"\0" * padding)
+            chunks.append(part)
+            offset += padding + len(part)
+        return b"".join(chunks)
+
+    @classmethod
+    def from_buffer(cls, buffer) -> "CompiledDFA":
+        """从 to_bytes 的结果 (bytes、mmap 等) 加载
+
+        字节序与本机一致时转移表直接引用 buffer 的内存而不复制,
+        因此多个进程映射同一个只读文件时共享同一份物理页。
+        """
+        view = memoryview(buffer)
+        if len(view) < _HEADER.size:
+            raise ValueError("truncated CompiledDFA buffer")
+        (
+            magic,
+            version,
+            byte_order,
+            num_states,
+            stride,
+            start,
+            num_entries,
+            num_ranges,
+            accept_len,
+            flags,
+        ) = _HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError("not a CompiledDFA buffer")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"unsupported CompiledDFA format version: {version}")
+        offset = _align(_HEADER.size)
+        entries_end = offset + num_entries * 8
+        ranges_begin = _align(entries_end)
+        ranges_end = ranges_begin + num_ranges * 12
+        accept_begin = _align(ranges_end)
+        table_begin = _align(accept_begin + accept_len)
+        table_end = table_begin + num_states * stride * 4
+        if len(view) < table_end:
+            raise ValueError("truncated CompiledDFA buffer")
+
+        native = byte_order == _BYTE_ORDER[sys.byteorder]
+        entries = array("i")
+        entries.frombytes(view[offset:entries_end])
+        ranges = array("i")
+        ranges.frombytes(view[ranges_begin:ranges_end])
+        if native:
+            table: array | memoryview = view[table_begin:table_end].cast("i")
+        else:
+            entries.byteswap()
+            ranges.byteswap()
+            table = array("i")
+            table.frombytes(view[table_begin:table_end])
+            table.byteswap()
+        classes = {chr(entries[i]): entries[i + 1] for i in range(0, len(entries), 2)}
+        accept = int.from_bytes(
+            view[accept_begin : accept_begin + accept_len], "little"
+        )
+        return cls(
+            classes,
+            table,
+            stride,
+            start,
+            accept,
+            num_states,
+            flags & _FLAG_BYTE_MODE != 0,
+            list(zip(ranges[0::3], ranges[1::3], ranges[2::3])),
+        )
+
+    def match_many(self, strings: Iterable[str | bytes], backend: str | None = None):
+        """批量全匹配, 返回与输入一一对应的布尔数组
+
+        backend 为 "numpy" 时按长度排序分批, 每批内所有串逐列用花式索引同步推进;
+        为 "python" 时逐个调用 fullmatch。默认在 numpy 可用时使用 numpy,
+        否则返回 list[bool]。
+        """
+        strings = strings if isinstance(strings, list) else list(strings)
+        if backend is None:
+            backend = "python" if np is None else "numpy"
+        if backend == "python":
+            return [self.fullmatch(string) for string in strings]
+        if backend != "numpy":
+            raise ValueError(f"unknown backend: {backend!r}")
+        if np is None:
+            raise RuntimeError("numpy backend requested but numpy is not installed")
+        return self._match_many_numpy(strings)
+
+    def _numpy_tables(self):
+        """构造 (并缓存) numpy 版本的转移表、接受表与码点到符号类的查找表
+
+        死状态为真实的第 n 行并自环到自身; 表项预乘行宽, 推进时只需一次一维取值。
+        """
+        if self._np_tables is not None:
+            return self._np_tables
+        assert np is not None
+        n, stride = self._num_states, self._stride
+        table = np.full((n + 1, stride), n, dtype=np.int64)
+        table[:n] = np.frombuffer(self._table, dtype=np.int32).reshape(n, stride)
+        table[table < 0] = n
+        flat = (table * stride).ravel()
+        accept = np.zeros(n + 1, dtype=bool)
+        accept[:n] = np.frombuffer(self._accepting, dtype=np.uint8).astype(bool)
+        if self._byte_map is not None:
+            lookup = np.frombuffer(self._byte_map, dtype=np.uint8).astype(np.int64)
+        else:
+            # 码点截断到 top, lookup[top] 代表所有 >= top 的码点: 未知符号类 0,
+            # 或是一直延伸到最大码点的最后一个区间的符号类
+            top = max(map(ord, self._classes), default=-1) + 1
+            bounds, bound_classes = self._bounds, self._bound_classes
+            if bounds is not None:
+                top = max(top, bounds[-2] if bounds[-1] > MAX_CODEPOINT else bounds[-1])
+            lookup = np.zeros(top + 1, dtype=np.int64)
+            if bounds is not None:
+                for i in range(len(bounds) - 1):
+                    lookup[bounds[i] : bounds[i + 1]] = bound_classes[i]
+            for char, cls in self._classes.items():
+                lookup[ord(char)] = cls
+        tables = (flat, accept, lookup)
+        object.__setattr__(self, "_np_tables", tables)
+        return tables
+
+    def _match_many_numpy(self, strings: list):
+        assert np is not None
+        flat, accept, lookup = self._numpy_tables()
+        stride = self._stride
+        max_code = len(lookup) - 1
+        byte_mode = self._byte_map is not None
+        if byte_mode:
+            strings = [
+                string.encode("utf-8") if isinstance(string, str) else bytes(string)
+                for string in strings
+            ]
+        result = np.zeros(len(strings), dtype=bool)
+        lengths = np.fromiter(map(len, strings), dtype=np.int64, count=len(strings))
+        order = np.argsort(lengths, kind="stable")
+        for begin in range(0, len(strings), BATCH_SIZE):
+            index = order[begin : begin + BATCH_SIZE]
+            batch_lengths = lengths[index]
+            state = np.full(len(index), self._start * stride, dtype=np.int64)
+            batch = [strings[i] for i in index.tolist()]
+            if byte_mode:
+                codes = np.frombuffer(b"".join(batch), dtype=np.uint8)
+            else:
+                joined = "".join(batch).encode("utf-32-le")
+                codes = np.frombuffer(joined, dtype="<u4")
+            symbols = lookup[np.minimum(codes, max_code)]
+            offsets = np.cumsum(batch_lengths) - batch_lengths
+            # 批内按长度升序, 第 column 列仍未读完的串恰好构成一个后缀
+            width = int(batch_lengths[-1]) if len(index) else 0
+            for column in range(width):
+                low = int(np.searchsorted(batch_lengths, column, side="right"))
+                state[low:] = flat[state[low:] + symbols[offsets[low:] + column]]
+            result[index] = accept[state // stride]
+        return result
+
+    def __repr__(self):
+        return (
+            f"CompiledDFA(states={self._num_states}, classes={self._stride}, "
+            f"start={self._start})"
+        )
@@ -1,143 +1,318 @@
-import graphviz
+from array import array
+from collections import deque
+from collections.abc import Iterable
 
+from lab2.charclass import CharClass
+from lab2.compiled import DEAD, CompiledDFA
+from lab2.export import render
 from lab2.nfa import NFA
-from lab2.state import State
+from lab2.state import DFAState
+
+
+def _class_target(state: DFAState, char: str) -> DFAState | None:
+    for label, target in state.transitions.items():
+        if isinstance(label, CharClass) and char in label:
+            return target
+    return None
 
 
 class DFA:
     def __init__(self, nfa: NFA | None = None):
         """初始化DFA。如果提供NFA, 将其转换为DFA"""
-        self.states: list[State] = []
-        self.start_state: State | None = None
-        self.accept_states: list[State] = []
+        self.states: list[DFAState] = []
+        self.start_state: DFAState | None = None
+        self.accept_states: list[DFAState] = []
+        # 多模式时接受状态 -> 其接受的模式编号集合
+        self.tags: dict[DFAState, frozenset[int]] = {}
         if nfa:
             self.initialize_from_nfa(nfa)
 
     def initialize_from_nfa(self, nfa: NFA):
-        """根据给定的NFA构建DFA"""
+        """根据给定的NFA构建DFA (子集构造)
+
+        NFA状态编号为整数, 状态集合用位掩码表示; 闭包与各符号后继由 BitsetNFA 预先计算,
+        工作表使用双端队列, 已构造的状态以掩码为键索引。
+        NFA带有 accept_tags 时, 每个DFA状态记录其子集中接受状态的模式编号。
+        """
         assert nfa.start_state, "set start_state of NFA obj first"
-        initial_closure = nfa.epsilon_closure({nfa.start_state})
-        start_state = State()
-        self.add_state(start_state, nfa.start_state == nfa.accept_state)
+        bitset = nfa.to_bitset()
+        accept = bitset.accept
+        tags_of = bitset.tags_of
+        start_state = DFAState()
+        self.add_state(start_state, bitset.start & accept != 0, tags_of(bitset.start))
         self.set_start_state(start_state)
 
-        unmarked = [(start_state, initial_closure)]
-        marked = {}
-        marked[frozenset(initial_closure)] = start_state
-
+        marked: dict[int, DFAState] = {bitset.start: start_state}
+        unmarked = deque([bitset.start])
         while unmarked:
-            current_dfa_state, current_nfa_states = unmarked.pop(0)
-            for input_char in set(
-                char
-                for state in current_nfa_states
-                for char in state.transitions
-                if char is not None
-            ):
-                new_nfa_states = nfa.epsilon_closure(
-                    nfa.move(current_nfa_states, input_char)
-                )
-                state_set = frozenset(new_nfa_states)
-                if state_set not in marked:
-                    new_dfa_state = State()
+            current_mask = unmarked.popleft()
+            current_dfa_state = marked[current_mask]
+            for input_char in bitset.symbols_of(current_mask):
+                new_mask = bitset.step(current_mask, input_char)
+                new_dfa_state = marked.get(new_mask)
+                if new_dfa_state is None:
+                    new_dfa_state = DFAState()
                     self.add_state(
-                        new_dfa_state,
-                        any(s == nfa.accept_state for s in new_nfa_states),
+                        new_dfa_state, new_mask & accept != 0, tags_of(new_mask)
                     )
-                    marked[state_set] = new_dfa_state
-                    unmarked.append((new_dfa_state, new_nfa_states))
-                current_dfa_state.add_transition(input_char, marked[state_set])
+                    marked[new_mask] = new_dfa_state
+                    unmarked.append(new_mask)
+                current_dfa_state.add_transition(input_char, new_dfa_state)
 
-    def add_state(self, state: State, is_accept=False):
-        """添加一个状态到DFA, 并标记是否为接受状态"""
+    def add_state(
+        self, state: DFAState, is_accept=False, tags: frozenset[int] = frozenset()
+    ):
+        """添加一个状态到DFA, 并标记是否为接受状态及其模式编号
+
+        状态编号为其在本DFA中的下标
+        """
+        state.id = len(self.states)
         self.states.append(state)
         if is_accept:
             self.accept_states.append(state)
+        if tags:
+            self.tags[state] = tags
 
-    def set_start_state(self, state: State):
+    def set_start_state(self, state: DFAState):
         """设置DFA的起始状态"""
         self.start_state = state
 
     def simulate(self, input_string: str):
-        """模拟DFA, 检查是否接受给定的输入字符串"""
+        """模拟DFA, 检查是否接受给定的输入字符串
+
+        转移先按字符查找, 查不到时再逐个检查该状态的字符类转移 (它们互不相交)。
+        """
         current_state = self.start_state
         assert current_state is not None, "init first"
         for char in input_string:
-            if char in current_state.transitions:
-                current_state = current_state.transitions[char][0]
-            else:
-                return False
+            next_state = current_state.transitions.get(char)
+            if next_state is None:
+                next_state = _class_target(current_state, char)
+                if next_state is None:
+                    return False
+            current_state = next_state
         return current_state in self.accept_states
 
+    def compile(self, byte_mode: bool = False) -> CompiledDFA:
+        """将DFA编译为表驱动的不可变CompiledDFA
+
+        byte_mode 用于 NFA.to_utf8 得到的字节自动机, 编译结果直接匹配 bytes。
+        """
+        assert self.start_state is not None, "init first"
+        # 起始状态编号为 0
+        order = [self.start_state] + [
+            s for s in self.states if s is not self.start_state
+        ]
+        ids = {state: i for i, state in enumerate(order)}
+        num_states = len(order)
+
+        # 每个符号在所有状态上的转移列, 列相同的符号合并为同一符号类
+        columns: dict[str | CharClass, list[int]] = {}
+        for state in order:
+            for char, target in state.transitions.items():
+                column = columns.setdefault(char, [DEAD] * num_states)
+                column[ids[state]] = ids[target]
+        class_of_column: dict[tuple[int, ...], int] = {}
+        classes: dict[str, int] = {}
+        ranges: list[tuple[int, int, int]] = []
+        for char, column in columns.items():
+            key = tuple(column)
+            if key not in class_of_column:
+                class_of_column[key] = len(class_of_column) + 1  # 0 保留给未知字符
+            if isinstance(char, CharClass):
+                for lo, hi in char.intervals:
+                    ranges.append((lo, hi, class_of_column[key]))
+            else:
+                classes[char] = class_of_column[key]
+
+        stride = len(class_of_column) + 1
+        table = array("i", [DEAD]) * (num_states * stride)
+        for key, cls in class_of_column.items():
+            for state_id, target_id in enumerate(key):
+                table[state_id * stride + cls] = target_id
+
+        accept = 0
+        for state in self.accept_states:
+            if state in ids:
+                accept |= 1 << ids[state]
+        return CompiledDFA(
+            classes, table, stride, 0, accept, num_states, byte_mode, ranges
+        )
+
+    @classmethod
+    def from_compiled(cls, compiled: CompiledDFA) -> "DFA":
+        """由表驱动形式重建基于状态对象的DFA, 字节模式下字节 b 的转移以 chr(b) 为键"""
+        dfa = cls()
+        states = [DFAState() for _ in range(compiled.num_states)]
+        for i, state in enumerate(states):
+            dfa.add_state(state, compiled.is_accept(i))
+        dfa.set_start_state(states[compiled.start])
+        table = compiled.table
+        stride = compiled.num_classes
+        symbols: list[tuple[str | CharClass, int]] = list(compiled.classes.items())
+        intervals: dict[int, list[tuple[int, int]]] = {}
+        for lo, hi, symbol_class in compiled.ranges:
+            intervals.setdefault(symbol_class, []).append((lo, hi))
+        for symbol_class, group in intervals.items():
+            symbols.append((CharClass(group), symbol_class))
+        for char, symbol_class in symbols:
+            for i, state in enumerate(states):
+                target = table[i * stride + symbol_class]
+                if target != DEAD:
+                    state.add_transition(char, states[target])
+        return dfa
+
+    def match_many(self, strings: Iterable[str]):
+        """批量模拟DFA, 返回每个字符串是否被接受的布尔数组
+
+        编译为CompiledDFA后批量推进, numpy可用时返回 numpy 布尔数组, 否则返回 list[bool]
+        """
+        return self.compile().match_many(strings)
+
     def visualize(self, filename: str):
-        """使用Graphviz可视化DFA"""
-        dot = graphviz.Digraph()
-        dot.node("", shape="none")
-        dot.edge("", str(self.start_state), label="start")
-        for state in self.states:
-            shape = "doublecircle" if state in self.accept_states else "circle"
-            dot.node(str(state), shape=shape)
-            for char, next_states in state.transitions.items():
-                for next_state in next_states:
-                    dot.edge(str(state), str(next_state), label=str(char))
-        dot.render(filename, format="png", view=False)
+        """可视化DFA, 生成 DOT 文本并调用 Graphviz 渲染为 png"""
+        render(self, filename)
 
     def minimize(self):
-        """使用Hopcroft算法求异法最小化DFA"""
-        symbols = {symbol for state in self.states for symbol in state.transitions}
+        """使用Hopcroft算法 (求异法) 最小化DFA
 
-        accept = frozenset(self.accept_states)
-        non_accept = frozenset(self.states) - accept
-        P = {accept, non_accept}
-        W = P.copy()
+        状态编号为整数并补上一个虚拟死状态使DFA完全; 预先建立逆转移表, 分划用
+        可细化分划结构 (元素数组、位置数组、块边界与标记分界) 表示,
+        每次分裂只重标记较小的一半, 工作表中保存待作为分裂者的块。
+        与死状态等价的状态 (无法到达接受状态) 在结果中被删去。
+        初始分划按模式编号集合区分接受状态, 因此标签不同的状态不会被合并。
+        """
+        assert self.start_state is not None, "init first"
 
-        while W:
-            A = W.pop()
-            for symbol in symbols:
-                X = {
-                    state
-                    for state in self.states
-                    if any(
-                        next_state in A
-                        for next_state in state.transitions.get(symbol, [])
-                    )
-                }
-                if not X:
-                    continue
+        # 从起始状态出发广度优先编号, 顺便丢弃不可达状态
+        ids: dict[DFAState, int] = {self.start_state: 0}
+        order = [self.start_state]
+        symbol_ids: dict[str | CharClass, int] = {}
+        for state in order:
+            for symbol, target in state.transitions.items():
+                symbol_ids.setdefault(symbol, len(symbol_ids))
+                if target not in ids:
+                    ids[target] = len(order)
+                    order.append(target)
+        n = len(order)
+        dead = n
+        total = n + 1
+        accept_set = set(self.accept_states)
 
-                for Y in P.copy():
-                    intersection = Y & X
-                    difference = Y - X
-                    if intersection and difference:
-                        P.remove(Y)
-                        P.add(frozenset(intersection))
-                        P.add(frozenset(difference))
-                        if Y in W:
-                            W.remove(Y)
-                            W.add(frozenset(intersection))
-                            W.add(frozenset(difference))
-                        else:
-                            if len(intersection) <= len(difference):
-                                W.add(frozenset(intersection))
-                            else:
-                                W.add(frozenset(difference))
-
-        new_states = {frozenset(group): State() for group in P}
-        new_start_state = next(
-            new_states[group] for group in P if self.start_state in group
-        )
-        new_accept_states = {
-            new_states[group] for group in P if any(s in accept for s in group)
-        }
+        # 逆转移表: inverse[k][t] 为经符号 k 转移到 t 的所有状态
+        inverse: list[list[list[int]]] = [
+            [[] for _ in range(total)] for _ in symbol_ids
+        ]
+        for state, i in ids.items():
+            missing = set(range(len(symbol_ids)))
+            for symbol, target in state.transitions.items():
+                k = symbol_ids[symbol]
+                inverse[k][ids[target]].append(i)
+                missing.discard(k)
+            for k in missing:
+                inverse[k][dead].append(i)
+        for k in range(len(symbol_ids)):
+            inverse[k][dead].append(dead)
+
+        # 初始分划: 接受状态按标签分组, 非接受状态与死状态为一组
+        tags = self.tags
+        groups: dict[frozenset[int] | None, list[int]] = {}
+        for i in range(n):
+            state = order[i]
+            key = tags.get(state, frozenset()) if state in accept_set else None
+            groups.setdefault(key, []).append(i)
+        groups.setdefault(None, []).append(dead)
+
+        # 可细化分划: 块 b 的元素为 elems[first[b]:end[b]], 其中 [first[b], mid[b]) 为已标记部分
+        elems = [state_id for group in groups.values() for state_id in group]
+        loc = [0] * total
+        for pos, state_id in enumerate(elems):
+            loc[state_id] = pos
+        block_of = [0] * total
+        first: list[int] = []
+        end: list[int] = []
+        for group in groups.values():
+            begin = end[-1] if end else 0
+            for state_id in group:
+                block_of[state_id] = len(first)
+            first.append(begin)
+            end.append(begin + len(group))
+        mid = first.copy()
 
-        for group, new_state in new_states.items():
-            for state in group:
-                for sym, destinations in state.transitions.items():
-                    dest_group = next(g for g in P if any(d in g for d in destinations))
-                    if new_states[dest_group] not in new_state.transitions.get(sym, []):
-                        new_state.add_transition(sym, new_states[dest_group])
+        # 除最大的初始块外, 其余初始块都作为分裂者
+        largest = max(range(len(first)), key=lambda b: end[b] - first[b])
+        worklist = [b for b in range(len(first)) if b != largest]
+        in_worklist = [b != largest for b in range(len(first))]
 
+        while worklist:
+            splitter_block = worklist.pop()
+            in_worklist[splitter_block] = False
+            splitter = elems[first[splitter_block] : end[splitter_block]]
+            for k in range(len(symbol_ids)):
+                inverse_k = inverse[k]
+                touched: list[int] = []
+                for target_id in splitter:
+                    for source in inverse_k[target_id]:
+                        b = block_of[source]
+                        pos = loc[source]
+                        if pos < mid[b]:
+                            continue  # 已标记
+                        if mid[b] == first[b]:
+                            touched.append(b)
+                        # 交换到标记区末尾
+                        other = elems[mid[b]]
+                        elems[pos], elems[mid[b]] = other, source
+                        loc[other], loc[source] = pos, mid[b]
+                        mid[b] += 1
+                for b in touched:
+                    if mid[b] == end[b]:
+                        mid[b] = first[b]  # 整块被标记, 无需分裂
+                        continue
+                    new_block = len(first)
+                    # 新块取较小的一半, 只重标记其元素
+                    if mid[b] - first[b] <= end[b] - mid[b]:
+                        first.append(first[b])
+                        end.append(mid[b])
+                        first[b] = mid[b]
+                    else:
+                        first.append(mid[b])
+                        end.append(end[b])
+                        end[b] = mid[b]
+                    mid[b] = first[b]
+                    mid.append(first[new_block])
+                    for pos in range(first[new_block], end[new_block]):
+                        block_of[elems[pos]] = new_block
+                    # 无论 b 是否已在工作表中, 只需再加入较小的新块
+                    in_worklist.append(True)
+                    worklist.append(new_block)
+
+        # 按块重建DFA, 起始块在前, 丢弃死状态所在的块
+        symbols = list(symbol_ids)
+        dead_block = block_of[dead]
         new_dfa = DFA()
-        new_dfa.states = list(new_states.values())
-        new_dfa.start_state = new_start_state
-        new_dfa.accept_states = list(new_accept_states)
+        new_states: dict[int, DFAState] = {}
+        start_block = block_of[0]
+        for b in [start_block] + [b for b in range(len(first)) if b != start_block]:
+            if b == dead_block and b != start_block:
+                continue
+            new_state = DFAState()
+            new_states[b] = new_state
+            representative = order[elems[first[b]]]
+            new_dfa.add_state(
+                new_state,
+                representative in accept_set,
+                tags.get(representative, frozenset()),
+            )
+        new_dfa.set_start_state(new_states[start_block])
+        if start_block == dead_block:
+            return new_dfa
+        for b, new_state in new_states.items():
+            representative = order[elems[first[b]]]
+            for symbol in symbols:
+                successor = representative.transitions.get(symbol)
+                if successor is None:
+                    continue
+                target_block = block_of[ids[successor]]
+                if target_block != dead_block:
+                    new_state.add_transition(symbol, new_states[target_block])
         return new_dfa
@@ -0,0 +1,125 @@
+from collections import deque
+
+from lab2.charclass import Alphabet, CharClass
+from lab2.dfa import DFA
+from lab2.state import DFAState
+from lab2.syntax import (
+    Concat,
+    Empty,
+    Group,
+    Node,
+    Plus,
+    Question,
+    Repeat,
+    Star,
+    Symbol,
+    Union,
+)
+
+
+class FollowposBuilder:
+    """Aho/Sethi/Ullman 的 followpos 方法: 由语法树直接构造DFA
+
+    在语法树末尾连接一个结束标记位置, 每个 Symbol 叶子是一个位置, 位置集合用整数位掩码表示。
+    nullable/firstpos/lastpos 自底向上求出, followpos 由连接与闭包结点给出,
+    DFA状态即位置集合, 其中含结束标记位置的为接受状态。不产生任何 epsilon 状态。
+    """
+
+    def __init__(self, tree: Node):
+        self.symbols: list[str | CharClass | None] = []  # 位置 -> 符号, 结束标记为 None
+        self.followpos: list[int] = []
+        nullable, firstpos, lastpos = self._visit(tree)
+        self.end = len(self.symbols)
+        self.symbols.append(None)
+        self.followpos.append(0)
+        # 连接结束标记: lastpos(tree) 中每个位置的 followpos 包含结束标记
+        self._link(lastpos, 1 << self.end)
+        self.start = firstpos | (1 << self.end if nullable else 0)
+
+    def _link(self, sources: int, targets: int):
+        followpos = self.followpos
+        while sources:
+            low = sources & -sources
+            followpos[low.bit_length() - 1] |= targets
+            sources ^= low
+
+    def _visit(self, node: Node) -> tuple[bool, int, int]:
+        """返回 (nullable, firstpos, lastpos), 同时填充 followpos"""
+        if isinstance(node, Symbol):
+            position = len(self.symbols)
+            self.symbols.append(node.char)
+            self.followpos.append(0)
+            return False, 1 << position, 1 << position
+        if isinstance(node, Empty):
+            return True, 0, 0
+        if isinstance(node, Concat):
+            nullable, first, last = self._visit(node.items[0])
+            for item in node.items[1:]:
+                null2, first2, last2 = self._visit(item)
+                self._link(last, first2)
+                if nullable:
+                    first |= first2
+                last = last | last2 if null2 else last2
+                nullable = nullable and null2
+            return nullable, first, last
+        if isinstance(node, Union):
+            nullable, first, last = False, 0, 0
+            for item in node.items:
+                null2, first2, last2 = self._visit(item)
+                nullable = nullable or null2
+                first |= first2
+                last |= last2
+            return nullable, first, last
+        if isinstance(node, (Star, Plus)):
+            nullable, first, last = self._visit(node.child)
+            self._link(last, first)
+            return isinstance(node, Star) or nullable, first, last
+        if isinstance(node, Group):
+            return self._visit(node.child)
+        if isinstance(node, Question):
+            _, first, last = self._visit(node.child)
+            return True, first, last
+        if isinstance(node, Repeat):
+            # 共享的子树每访问一次就得到一组新的位置
+            return self._visit(node.expand())
+        raise TypeError(f"unknown syntax node: {node!r}")
+
+    def build(self) -> DFA:
+        """对位置集合做工作表构造, 返回DFA
+
+        含字符类时先把各位置的符号划分为互不相交的原子, DFA转移以原子为键。
+        """
+        symbols = self.symbols
+        followpos = self.followpos
+        end_bit = 1 << self.end
+        labels = [label for label in symbols if label is not None]
+        atoms = [[label] for label in labels]
+        if any(isinstance(label, CharClass) for label in labels):
+            alphabet = Alphabet(labels)
+            atoms = [alphabet.atoms_of(label) for label in labels]
+        dfa = DFA()
+        start_state = DFAState()
+        dfa.add_state(start_state, self.start & end_bit != 0)
+        dfa.set_start_state(start_state)
+        marked: dict[int, DFAState] = {self.start: start_state}
+        unmarked = deque([self.start])
+        while unmarked:
+            mask = unmarked.popleft()
+            current = marked[mask]
+            targets: dict[str | CharClass, int] = {}
+            positions = mask & ~end_bit
+            while positions:
+                low = positions & -positions
+                position = low.bit_length() - 1
+                for char in atoms[position]:
+                    targets[char] = targets.get(char, 0) | followpos[position]
+                positions ^= low
+            for char, target in targets.items():
+                state = marked.get(target)
+                if state is None:
+                    state = DFAState()
+                    dfa.add_state(state, target & end_bit != 0)
+                    marked[target] = state
+                    unmarked.append(target)
+                current.add_transition(char, state)
+        return dfa
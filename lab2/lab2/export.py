@@ -0,0 +1,87 @@
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from lab2.dfa import DFA
+    from lab2.nfa import NFA
+    from lab2.state import DFAState, State
+
+
+def _quote(text: str) -> str:
+    escaped = text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'"{escaped}"'
+
+
+def iter_dot(automaton: "NFA | DFA", name: str = "G") -> Iterator[str]:
+    """逐行生成自动机的 DOT 文本, 不依赖 graphviz 包
+
+    接受状态画为双圆, epsilon 边标记为 ε; NFA 的转移目标为列表, DFA 的为单个状态。
+    """
+    from lab2.nfa import NFA  # lab2.nfa 导入本模块, 在调用时再导入
+
+    accepting: set[State] | set[DFAState]
+    if isinstance(automaton, NFA):
+        accepting = automaton.accepting_states()
+    else:
+        accepting = set(automaton.accept_states)
+    yield f"digraph {_quote(name)} {{"
+    yield '\t"" [shape=none]'
+    yield f'\t"" -> {_quote(str(automaton.start_state))} [label=start]'
+    for state in automaton.states:
+        shape = "doublecircle" if state in accepting else "circle"
+        yield f"\t{_quote(str(state))} [shape={shape}]"
+        for char, targets in state.transitions.items():
+            label = _quote(str(char) if char is not None else "ε")
+            successors = targets if isinstance(targets, list) else [targets]
+            for target in successors:
+                yield f"\t{_quote(str(state))} -> {_quote(str(target))} [label={label}]"
+    yield "}"
+
+
+def to_dot(automaton: "NFA | DFA", name: str = "G") -> str:
+    """返回自动机的完整 DOT 文本"""
+    return "\n".join(iter_dot(automaton, name)) + "\n"
+
+
+def write_dot(automaton: "NFA | DFA", path: str) -> None:
+    """将 DOT 文本流式写入文件"""
+    with open(path, "w", encoding="utf-8") as file:
+        for line in iter_dot(automaton):
+            file.write(line)
+            file.write("\n")
+
+
+def render_source(source: str, filename: str, format: str = "png") -> str:
+    """用 Graphviz 渲染 DOT 文本, 写出 filename (DOT 源) 与 filename.format
+
+    仅在真正渲染时才导入 graphviz, 返回渲染结果的路径。
+    """
+    import graphviz
+
+    return graphviz.Source(source).render(filename, format=format, view=False)
+
+
+def render(automaton: "NFA | DFA", filename: str, format: str = "png") -> str:
+    """渲染单个自动机"""
+    return render_source(to_dot(automaton), filename, format)
+
+
+def render_many(
+    jobs: Iterable[tuple["NFA | DFA", str]],
+    format: str = "png",
+    max_workers: int | None = None,
+) -> list[str]:
+    """批量渲染, 每个任务为 (自动机, 文件名)
+
+    DOT 文本在当前进程生成, 调用 dot 的渲染工作分发到进程池并发执行。
+    """
+    sources = [(to_dot(automaton), filename) for automaton, filename in jobs]
+    if not sources:
+        return []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(render_source, source, filename, format)
+            for source, filename in sources
+        ]
+        return [future.result() for future in futures]
@@ -0,0 +1,131 @@
+from collections import OrderedDict, namedtuple
+
+from lab2.bitnfa import BitsetNFA
+from lab2.nfa import NFA
+
+CacheInfo = namedtuple(
+    "CacheInfo",
+    ["hits", "misses", "evictions", "flushes", "fallbacks", "maxsize", "currsize"],
+)
+
+
+class LazyDFA:
+    """按需构造的DFA (类似 RE2 的惰性DFA)
+
+    DFA状态以NFA活动状态集合为键 (BitsetNFA 的整数位掩码, 等价于 frozenset),
+    只有当输入真正到达某个状态时才会物化, 并保存在容量为 max_states 的 LRU 缓存中。
+    每个缓存状态记录已经求过的 字符 -> 后继状态 转移。
+
+    若一次扫描中整个缓存已被替换过一轮, 且平均每个淘汰对应的输入字符少于
+    min_chars_per_state, 认为缓存发生抖动: 清空缓存, 并用位集NFA模拟完成本次扫描的剩余部分。
+    """
+
+    def __init__(
+        self, nfa: NFA, max_states: int = 10000, min_chars_per_state: int = 10
+    ):
+        assert max_states > 0, "max_states must be positive"
+        self.nfa: BitsetNFA = nfa.to_bitset()
+        self.max_states: int = max_states
+        self.min_chars_per_state: int = min_chars_per_state
+        self._cache: OrderedDict[int, dict[str, int]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._flushes = 0
+        self._fallbacks = 0
+
+    def cache_info(self) -> CacheInfo:
+        """返回缓存统计: 转移命中/未命中次数、淘汰、清空与回退次数及容量"""
+        return CacheInfo(
+            self._hits,
+            self._misses,
+            self._evictions,
+            self._flushes,
+            self._fallbacks,
+            self.max_states,
+            len(self._cache),
+        )
+
+    def cache_clear(self):
+        """清空缓存与统计"""
+        self._cache.clear()
+        self._hits = self._misses = self._evictions = 0
+        self._flushes = self._fallbacks = 0
+
+    def _row(self, mask: int) -> dict[str, int]:
+        """取出 (必要时物化) 状态 mask 的转移行, 并将其标记为最近使用"""
+        row = self._cache.get(mask)
+        if row is not None:
+            self._cache.move_to_end(mask)
+            return row
+        if len(self._cache) >= self.max_states:
+            self._cache.popitem(last=False)
+            self._evictions += 1
+        row = self._cache[mask] = {}
+        return row
+
+    def _run(self, string: str, anchored: bool, stop_on_accept: bool) -> bool:
+        """从头扫描字符串; 非锚定时每一步都并入起始闭包"""
+        nfa = self.nfa
+        accept = nfa.accept
+        start = nfa.start
+        inject = 0 if anchored else start
+        mask = start
+        if stop_on_accept and mask & accept:
+            return True
+        row = self._row(mask)
+        evictions = self._evictions
+        for i, char in enumerate(string):
+            target = row.get(char)
+            if target is None:
+                self._misses += 1
+                target = row[char] = nfa.step(mask, char)
+            else:
+                self._hits += 1
+            mask = target | inject
+            if not mask:
+                return False
+            if stop_on_accept and mask & accept:
+                return True
+            row = self._row(mask)
+            evicted = self._evictions - evictions
+            if (
+                evicted >= self.max_states
+                and evicted * self.min_chars_per_state > i + 1
+            ):
+                self._cache.clear()
+                self._flushes += 1
+                self._fallbacks += 1
+                return self._finish_with_nfa(
+                    mask, string, i + 1, inject, stop_on_accept
+                )
+        return mask & accept != 0
+
+    def _finish_with_nfa(
+        self, mask: int, string: str, pos: int, inject: int, stop_on_accept: bool
+    ) -> bool:
+        """缓存抖动后直接用位集NFA模拟剩余输入"""
+        step = self.nfa.step
+        accept = self.nfa.accept
+        for char in string[pos:]:
+            mask = step(mask, char) | inject
+            if not mask:
+                return False
+            if stop_on_accept and mask & accept:
+                return True
+        return mask & accept != 0
+
+    def fullmatch(self, string: str) -> bool:
+        """整个字符串是否被接受"""
+        return self._run(string, anchored=True, stop_on_accept=False)
+
+    def match(self, string: str) -> bool:
+        """字符串的某个前缀 (含空串) 是否被接受"""
+        return self._run(string, anchored=True, stop_on_accept=True)
+
+    def search(self, string: str) -> bool:
+        """字符串的某个子串是否被接受"""
+        return self._run(string, anchored=False, stop_on_accept=True)
+
+    def __repr__(self):
+        return f"LazyDFA(nfa={self.nfa!r}, cache={self.cache_info()})"
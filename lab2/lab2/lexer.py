@@ -0,0 +1,120 @@
+from collections import namedtuple
+from collections.abc import Iterable, Iterator
+
+from lab2.regex import Regex
+from lab2.regexset import RegexSet
+
+Token = namedtuple("Token", ["kind", "lexeme", "offset"])
+
+
+class LexError(ValueError):
+    """词法错误: offset 处没有任何记号能匹配"""
+
+    def __init__(self, char: str, offset: int):
+        super().__init__(f"unexpected character {char!r} at offset {offset}")
+        self.char = char
+        self.offset = offset
+
+
+class Lexer:
+    """词法分析器生成器: 由 (记号种类, 正规表达式) 规则表构造最长匹配的分词器
+
+    全部规则经 RegexSet 并联为一个带标签的最小DFA, 每个接受状态取编号最小 (最先给出) 的规则,
+    因此同样长的匹配按规则顺序决定种类, 如把关键字写在标识符之前。
+    分词时从当前位置沿DFA前进直到死状态, 最后一次经过的接受状态即最长匹配 (maximal munch),
+    然后从它的终点继续; 种类在 skip 中的记号 (空白、注释等) 不产出。
+    记号为 Token(kind, lexeme, offset), 由生成器逐个产出, 可直接作为语法分析器的输入。
+    """
+
+    def __init__(self, rules: Iterable[tuple[str, str]], skip: Iterable[str] = ()):
+        self.rules: list[tuple[str, str]] = list(rules)
+        self.skip: frozenset[str] = frozenset(skip)
+        for kind, pattern in self.rules:
+            if Regex(pattern).literals().min_len == 0:
+                raise ValueError(f"token {kind!r} matches the empty string")
+        self.regexset = RegexSet(pattern for _, pattern in self.rules)
+        compiled = self.regexset.compiled
+        self.compiled = compiled
+        stride = compiled.num_classes
+        # 预乘行宽的转移表, 以及按行首下标索引的规则编号 (-1 表示不接受)
+        self._table = [
+            target * stride if target >= 0 else -1 for target in compiled.table
+        ]
+        self._rule = [-1] * len(self._table)
+        tags = self.regexset.dfa.tags
+        for i, state in enumerate(self.regexset.dfa.states):
+            if tags.get(state):
+                self._rule[i * stride] = min(tags[state])
+        self._kinds = [kind for kind, _ in self.rules]
+
+    def tokenize(self, text: str) -> Iterator[Token]:
+        """对整个字符串分词"""
+        yield from self.stream((text,))
+
+    def stream(self, chunks: Iterable[str]) -> Iterator[Token]:
+        """对分块到达的输入分词, 如文本文件对象或网络数据
+
+        只有在DFA进入死状态 (记号不可能再延长) 后才产出记号, 跨块的记号留到下一块。
+        DFA 的扫描进度跨块保留: 每块只求一次符号类, 从上一块停下的位置继续前进;
+        窗口文本按块存放, 有记号结束时才拼接, 每块至多拼接一次并丢弃已产出的部分,
+        因此跨越很多块的长记号也只需线性时间。offset 从流的开头算起。
+        """
+        table = self._table
+        rules = self._rule
+        kinds = self._kinds
+        skip = self.skip
+        compiled = self.compiled
+        start = compiled.start * compiled.num_classes
+        # 窗口: 尚未完成的记号及其后已到达的输入, 文本按块存放, text 为最近一次拼接的结果
+        pieces: list[str] = []
+        classes: list[int] = []
+        text = ""
+        base = 0  # 窗口开头在流中的偏移
+        # 当前记号从窗口的 i 处开始, 已扫描到 j, 最后一次经过接受状态在 end 处, 对应规则 rule
+        i = j = end = 0
+        state = start
+        rule = -1
+        chunks = iter(chunks)
+        final = False
+        while not final:
+            chunk = next(chunks, None)
+            if chunk is None:
+                final = True
+            else:
+                pieces.append(chunk)
+                classes.extend(compiled.symbol_classes(chunk))
+            n = len(classes)
+            while i < n:
+                while j < n:
+                    state = table[state + classes[j]]
+                    if state < 0:
+                        break
+                    j += 1
+                    if rules[state] >= 0:
+                        rule = rules[state]
+                        end = j
+                if j == n and state >= 0 and not final:
+                    break  # 记号可能被后续输入延长
+                if len(text) < n:
+                    text = "".join(pieces)
+                    pieces = [text]
+                if rule < 0:
+                    raise LexError(text[i], base + i)
+                kind = kinds[rule]
+                if kind not in skip:
+                    yield Token(kind, text[i:end], base + i)
+                i = j = end
+                state = start
+                rule = -1
+            if i:
+                # 产出过记号时窗口已拼接, 丢弃已完成的部分
+                text = text[i:]
+                pieces = [text]
+                del classes[:i]
+                base += i
+                j -= i
+                end -= i
+                i = 0
+
+    def __repr__(self):
+        return f"Lexer(rules={len(self.rules)}, states={self.compiled.num_states})"
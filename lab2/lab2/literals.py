@@ -0,0 +1,303 @@
+from lab2.charclass import CharClass
+from lab2.syntax import (
+    Concat,
+    Empty,
+    Group,
+    Node,
+    Plus,
+    Question,
+    Repeat,
+    Star,
+    Symbol,
+    Union,
+)
+
+# 每个字面量集合的最大元素数, 超出时放弃 (退回更短但更粗的集合)
+MAX_LITERALS = 32
+# 码点数不超过此值的字符类展开为单字符字面量
+MAX_CLASS_SIZE = 8
+# 不超过此数目的字面量逐个用 str.find 查找, 更多时使用 Aho-Corasick
+FIND_LIMIT = 4
+
+ANY = frozenset({""})  # 不提供任何信息: 每个串都以空串开头、包含空串
+
+
+class LiteralInfo:
+    """语法树的字面量信息
+
+    exact 为语言本身 (有限且不超过 MAX_LITERALS 个串时), 否则为 None;
+    每个匹配都以 prefixes 中的某个串开头、以 suffixes 中的某个串结尾、包含 factors 中的某个串,
+    这些集合含空串时不提供信息。min_len / max_len 为匹配长度的界, max_len 为 None 表示无界。
+    """
+
+    __slots__ = ("exact", "factors", "max_len", "min_len", "prefixes", "suffixes")
+
+    def __init__(
+        self,
+        exact: frozenset[str] | None,
+        prefixes: frozenset[str],
+        suffixes: frozenset[str],
+        factors: frozenset[str],
+        min_len: int,
+        max_len: int | None,
+    ):
+        if exact is not None:
+            prefixes = suffixes = factors = exact
+        self.exact = exact
+        self.prefixes = _prune(prefixes, str.startswith)
+        self.suffixes = _prune(suffixes, str.endswith)
+        self.factors = _best(
+            _prune(factors, str.__contains__), self.prefixes, self.suffixes
+        )
+        self.min_len = min_len
+        self.max_len = max_len
+
+    def __repr__(self):
+        return (
+            f"LiteralInfo(exact={_show(self.exact)}, prefixes={_show(self.prefixes)}, "
+            f"suffixes={_show(self.suffixes)}, factors={_show(self.factors)}, "
+            f"min_len={self.min_len}, max_len={self.max_len})"
+        )
+
+
+def _show(literals: frozenset[str] | None) -> str:
+    return "None" if literals is None else repr(sorted(literals))
+
+
+def _prune(literals: frozenset[str], covers) -> frozenset[str]:
+    """去掉被更弱的串蕴含的串, 如前缀集合中有 a 时 ab 是多余的"""
+    return frozenset(
+        s for s in literals if not any(t != s and covers(s, t) for t in literals)
+    )
+
+
+def quality(literals: frozenset[str]) -> tuple[int, int]:
+    """字面量集合作为筛选条件的质量: 最短串越长、串越少越好; 空集合 (语言为空) 最好"""
+    return min(map(len, literals), default=1 << 30), -len(literals)
+
+
+def _best(*candidates: frozenset[str]) -> frozenset[str]:
+    return max(candidates, key=quality)
+
+
+def _cross(left: frozenset[str], right: frozenset[str]) -> frozenset[str] | None:
+    """两个集合的连接, 超过 MAX_LITERALS 个串时返回 None"""
+    if len(left) * len(right) > MAX_LITERALS:
+        return None
+    return frozenset(a + b for a in left for b in right)
+
+
+def _union(sets: list[frozenset[str]]) -> frozenset[str] | None:
+    union = frozenset().union(*sets)
+    return union if len(union) <= MAX_LITERALS else None
+
+
+def _add(a: int | None, b: int | None) -> int | None:
+    return None if a is None or b is None else a + b
+
+
+def analyze(node: Node) -> LiteralInfo:
+    """自底向上求语法树的字面量信息"""
+    if isinstance(node, Empty):
+        return LiteralInfo(frozenset({""}), ANY, ANY, ANY, 0, 0)
+    if isinstance(node, Symbol):
+        char = node.char
+        if isinstance(char, CharClass):
+            if len(char) > MAX_CLASS_SIZE:
+                return LiteralInfo(None, ANY, ANY, ANY, 1, 1)
+            chars = frozenset(
+                chr(code) for lo, hi in char.intervals for code in range(lo, hi + 1)
+            )
+            return LiteralInfo(chars, ANY, ANY, ANY, 1, 1)
+        return LiteralInfo(frozenset({char}), ANY, ANY, ANY, 1, 1)
+    if isinstance(node, Group):
+        return analyze(node.child)
+    if isinstance(node, Concat):
+        info = analyze(node.items[0])
+        for item in node.items[1:]:
+            info = _concat(info, analyze(item))
+        return info
+    if isinstance(node, Union):
+        infos = [analyze(item) for item in node.items]
+        exacts = [info.exact for info in infos if info.exact is not None]
+        max_lens = [info.max_len for info in infos if info.max_len is not None]
+        return LiteralInfo(
+            _union(exacts) if len(exacts) == len(infos) else None,
+            _union([info.prefixes for info in infos]) or ANY,
+            _union([info.suffixes for info in infos]) or ANY,
+            _union([info.factors for info in infos]) or ANY,
+            min(info.min_len for info in infos),
+            max(max_lens) if len(max_lens) == len(infos) else None,
+        )
+    if isinstance(node, Star):
+        child = analyze(node.child)
+        return LiteralInfo(None, ANY, ANY, ANY, 0, 0 if child.max_len == 0 else None)
+    if isinstance(node, Plus):
+        child = analyze(node.child)
+        return LiteralInfo(
+            None,
+            child.prefixes,
+            child.suffixes,
+            child.factors,
+            child.min_len,
+            0 if child.max_len == 0 else None,
+        )
+    if isinstance(node, Question):
+        child = analyze(node.child)
+        exact = None if child.exact is None else _union([child.exact, ANY])
+        return LiteralInfo(exact, ANY, ANY, ANY, 0, child.max_len)
+    if isinstance(node, Repeat):
+        return analyze(node.expand())
+    raise TypeError(f"unknown syntax node: {node!r}")
+
+
+def _concat(left: LiteralInfo, right: LiteralInfo) -> LiteralInfo:
+    exact = None
+    if left.exact is not None and right.exact is not None:
+        exact = _cross(left.exact, right.exact)
+    prefixes = left.prefixes
+    if left.exact is not None:
+        prefixes = _cross(left.exact, right.prefixes) or left.exact
+    suffixes = right.suffixes
+    if right.exact is not None:
+        suffixes = _cross(left.suffixes, right.exact) or right.exact
+    # 跨越两部分边界的因子: 左边的后缀接右边的前缀
+    factors = _best(
+        left.factors, right.factors, _cross(left.suffixes, right.prefixes) or ANY
+    )
+    return LiteralInfo(
+        exact,
+        prefixes,
+        suffixes,
+        factors,
+        left.min_len + right.min_len,
+        _add(left.max_len, right.max_len),
+    )
+
+
+class AhoCorasick:
+    """Aho-Corasick 多模式串匹配自动机
+
+    由字面量构造 trie 与失败链接, 单趟扫描文本同时查找全部字面量。
+    字面量可为 str 或 bytes (同一自动机内类型一致), 转移以文本的元素 (字符或字节值) 为键。
+    """
+
+    __slots__ = ("_fail", "_goto", "_longest", "max_len", "words")
+
+    def __init__(self, words):
+        self.words = list(words)
+        self.max_len: int = max(map(len, self.words), default=0)
+        self._goto: list[dict] = [{}]
+        # 以各状态结尾的最长字面量长度 (含经失败链接到达的), 0 表示没有
+        self._longest: list[int] = [0]
+        for word in self.words:
+            state = 0
+            for element in word:
+                next_state = self._goto[state].get(element)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][element] = next_state
+                    self._goto.append({})
+                    self._longest.append(0)
+                state = next_state
+            self._longest[state] = max(self._longest[state], len(word))
+
+        # 按层 (BFS) 计算失败链接
+        self._fail: list[int] = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for state in queue:  # queue 在遍历中增长
+            for element, child in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and element not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(element, 0)
+                self._fail[child] = target if target != child else 0
+                self._longest[child] = max(
+                    self._longest[child], self._longest[self._fail[child]]
+                )
+                queue.append(child)
+
+    def find(
+        self, text, pos: int = 0, end: int | None = None
+    ) -> tuple[int, int] | None:
+        """text[pos:end] 中起点最靠左的出现 (起点, 终点), 起点相同时取最长的; 没有时返回 None
+
+        第一次命中后继续扫描到不可能再有起点更靠左的出现为止。
+        """
+        goto = self._goto
+        fail = self._fail
+        longest = self._longest
+        end = len(text) if end is None else end
+        best: tuple[int, int] | None = None
+        state = 0
+        for i in range(pos, end):
+            if best is not None and i >= best[0] + self.max_len:
+                break
+            element = text[i]
+            while True:
+                next_state = goto[state].get(element)
+                if next_state is not None or state == 0:
+                    break
+                state = fail[state]
+            state = next_state or 0
+            length = longest[state]
+            if length:
+                start = i + 1 - length
+                # 起点相同时后出现的更长
+                if best is None or start <= best[0]:
+                    best = (start, i + 1)
+        return best
+
+    def __repr__(self):
+        return f"AhoCorasick({len(self.words)} words, {len(self._goto)} states)"
+
+
+class Prefilter:
+    """字面量集合的候选位置查找器
+
+    不超过 FIND_LIMIT 个字面量时逐个调用 str.find / bytes.find (C 实现), 取最靠左的出现;
+    更多时使用 Aho-Corasick 单趟扫描。文本为 bytes 时字面量按 UTF-8 编码。
+    """
+
+    __slots__ = ("_automata", "_encoded", "literals", "min_len")
+
+    def __init__(self, literals):
+        self.literals: list[str] = sorted(literals)
+        self.min_len: int = min(map(len, self.literals), default=0)
+        self._encoded = [literal.encode("utf-8") for literal in self.literals]
+        self._automata: dict[type, AhoCorasick] = {}
+
+    @classmethod
+    def build(cls, literals: frozenset[str]) -> "Prefilter | None":
+        """字面量集合足以筛选时构造查找器: 不含空串, 且串不短于 2 或数目很少"""
+        if "" in literals:
+            return None
+        if literals and min(map(len, literals)) < 2 and len(literals) > FIND_LIMIT:
+            return None
+        return cls(literals)
+
+    def find(
+        self, text, pos: int = 0, end: int | None = None
+    ) -> tuple[int, int] | None:
+        """text[pos:end] 中任一字面量起点最靠左的出现 (起点, 终点), 起点相同时取最长的; 没有时返回 None"""
+        end = len(text) if end is None else end
+        words = self._encoded if isinstance(text, (bytes, bytearray)) else self.literals
+        if len(words) > FIND_LIMIT:
+            kind = type(words[0])
+            automaton = self._automata.get(kind)
+            if automaton is None:
+                automaton = self._automata[kind] = AhoCorasick(words)
+            return automaton.find(text, pos, end)
+        best: tuple[int, int] | None = None
+        for word in words:
+            index = text.find(
+                word, pos, end if best is None else min(end, best[0] + len(word))
+            )
+            if index >= 0 and (
+                best is None or (index, -len(word)) < (best[0], best[0] - best[1])
+            ):
+                best = (index, index + len(word))
+        return best
+
+    def __repr__(self):
+        return f"Prefilter({self.literals!r})"
@@ -1,8 +1,30 @@
-from collections.abc import Sequence
-
-import graphviz
+from array import array
+from collections import namedtuple
 
+from lab2.bitnfa import BitsetNFA
+from lab2.charclass import CharClass, utf8_sequences
+from lab2.export import render
 from lab2.state import State
+from lab2.storage import NFAArrays
+
+
+class ReductionStats(
+    namedtuple(
+        "ReductionStats",
+        ["states_before", "states_after", "edges_before", "edges_after"],
+    )
+):
+    """NFA化简前后的状态数与边数 (epsilon 边计入边数)"""
+
+    __slots__ = ()
+
+    @property
+    def states_removed(self) -> int:
+        return self.states_before - self.states_after
+
+    @property
+    def edges_removed(self) -> int:
+        return self.edges_before - self.edges_after
 
 
 class NFA:
@@ -10,9 +32,20 @@ class NFA:
         self.states: list[State] = states if states is not None else []
         self.start_state: State | None = states[0] if states else None
         self.accept_state: State | None = states[-1] if states else None
+        # accept_state 之外的接受状态, 消除 epsilon 或化简后的NFA一般有多个接受状态
+        self.final_states: set[State] = set()
+        # 多模式时的带标签接受状态: 接受状态 -> 模式编号集合
+        self.accept_tags: dict[State, frozenset[int]] = {}
+        # 捕获状态 -> 槽位: 经过该状态时记录当前位置, 第 i 组的起止为槽位 2i 与 2i+1
+        self.captures: dict[State, int] = {}
+        # 由 remove_epsilons / reduce 得到时, 相对原NFA的规模变化
+        self.reduction: ReductionStats | None = None
+        for i, state in enumerate(self.states):
+            state.id = i
 
     def add_state(self, state: State):
-        """添加状态到NFA"""
+        """添加状态到NFA, 状态编号为其在本NFA中的下标"""
+        state.id = len(self.states)
         self.states.append(state)
 
     def set_start_state(self, state: State):
@@ -23,6 +56,26 @@ class NFA:
         """添加接受状态"""
         self.accept_state = state
 
+    def accepting_states(self) -> set[State]:
+        """全部接受状态: accept_state、final_states 与带标签的接受状态"""
+        return self._plain_accept_states() | set(self.accept_tags)
+
+    def _plain_accept_states(self) -> set[State]:
+        """不带标签的接受状态: accept_state 与 final_states"""
+        accepting = set(self.final_states)
+        if self.accept_state is not None:
+            accepting.add(self.accept_state)
+        return accepting
+
+    @property
+    def num_edges(self) -> int:
+        """转移边数, 含 epsilon 边"""
+        return sum(
+            len(targets)
+            for state in self.states
+            for targets in state.transitions.values()
+        )
+
     def epsilon_closure(self, states: set[State]) -> set[State]:
         """计算给定状态集的epsilon闭包"""
         stack = list(states)
@@ -37,11 +90,14 @@ class NFA:
         return closure
 
     def move(self, states: set[State], input_char) -> set[State]:
-        """返回从给定状态集出发, 经过input_char可以到达的状态集"""
+        """返回从给定状态集出发, 经过input_char可以到达的状态集 (含字符类转移)"""
         next_states = set()
         for state in states:
-            if input_char in state.transitions:
-                next_states.update(state.transitions[input_char])
+            for label, targets in state.transitions.items():
+                if label == input_char or (
+                    isinstance(label, CharClass) and input_char in label
+                ):
+                    next_states.update(targets)
         return next_states
 
     def simulate(self, input_string: str):
@@ -49,28 +105,304 @@ class NFA:
         assert self.start_state is not None, "init first"
         current_states = self.epsilon_closure({self.start_state})
         for char in input_string:
-            next_states = set()
-            for state in current_states:
-                if char in state.transitions:
-                    for next_state in state.transitions[char]:
-                        next_states.update(self.epsilon_closure({next_state}))
-            current_states = next_states
-        return self.accept_state in current_states
+            current_states = self.epsilon_closure(self.move(current_states, char))
+            if not current_states:
+                return False
+        return not current_states.isdisjoint(self.accepting_states())
 
-    def visualize(self, filename: str):
-        """可视化NFA, 使用Graphviz"""
-        dot = graphviz.Digraph()
-        dot.node("", shape="none")
-        dot.edge("", str(self.start_state), label="start")
-        states: Sequence[State | None] = [self.start_state]
+    def to_bitset(self) -> BitsetNFA:
+        """构造基于位集的模拟引擎, 闭包与后继只计算一次"""
+        return BitsetNFA(self)
+
+    def to_arrays(self) -> NFAArrays:
+        """转换为结构数组存储, 状态编号为其在 states 中的下标"""
+        ids = {state: i for i, state in enumerate(self.states)}
+        symbol_ids: dict[str | CharClass, int] = {}
+        offsets = array("i", [0])
+        labels = array("i")
+        targets = array("i")
         for state in self.states:
-            shape = "doublecircle" if state == self.accept_state else "circle"
-            dot.node(str(state), shape=shape)
-            for char, states in state.transitions.items():
-                label = char if char is not None else "ε"
-                for next_state in states:
-                    dot.edge(str(state), str(next_state), label=label)
-        dot.render(filename, format="png", view=False)
+            for char, next_states in state.transitions.items():
+                if char is None:
+                    label = -1
+                else:
+                    label = symbol_ids.setdefault(char, len(symbol_ids))
+                for next_state in next_states:
+                    labels.append(label)
+                    targets.append(ids[next_state])
+            offsets.append(len(targets))
+        return NFAArrays(
+            list(symbol_ids),
+            offsets,
+            labels,
+            targets,
+            ids[self.start_state] if self.start_state else -1,
+            ids[self.accept_state] if self.accept_state else -1,
+        )
+
+    @classmethod
+    def from_arrays(cls, arrays: NFAArrays) -> "NFA":
+        """由结构数组存储重建NFA"""
+        states = [State() for _ in range(arrays.num_states)]
+        for i, state in enumerate(states):
+            for char, target in arrays.edges(i):
+                state.add_transition(char, states[target])
+        nfa = cls(states)
+        nfa.start_state = states[arrays.start] if arrays.start >= 0 else None
+        nfa.accept_state = states[arrays.accept] if arrays.accept >= 0 else None
+        return nfa
+
+    def to_utf8(self) -> "NFA":
+        """转换为等价的 UTF-8 字节NFA, 字节 b 以字符 chr(b) 作为转移符号
+
+        单字节字符的转移直接改写, 多字节字符的转移拆成经过中间状态的字节链;
+        字符类转移按 utf8_sequences 拆成若干条字节区间链, 字节区间仍用 CharClass 表示。
+        """
+        state_map = {state: State() for state in self.states}
+        new_nfa = NFA([])
+        for state in self.states:
+            new_nfa.add_state(state_map[state])
+
+        def add_chain(source: State, target: State, sequence: list[tuple[int, int]]):
+            for i, (lo, hi) in enumerate(sequence):
+                label = chr(lo) if lo == hi else CharClass([(lo, hi)])
+                if i == len(sequence) - 1:
+                    source.add_transition(label, target)
+                else:
+                    middle = State()
+                    new_nfa.add_state(middle)
+                    source.add_transition(label, middle)
+                    source = middle
+
+        for state in self.states:
+            source = state_map[state]
+            for char, targets in state.transitions.items():
+                for target in targets:
+                    if char is None:
+                        source.add_transition(None, state_map[target])
+                    elif isinstance(char, CharClass):
+                        for lo, hi in char.intervals:
+                            for sequence in utf8_sequences(lo, hi):
+                                add_chain(source, state_map[target], sequence)
+                    else:
+                        add_chain(
+                            source,
+                            state_map[target],
+                            [(byte, byte) for byte in char.encode("utf-8")],
+                        )
+        if self.start_state:
+            new_nfa.set_start_state(state_map[self.start_state])
+        if self.accept_state:
+            new_nfa.set_accept_state(state_map[self.accept_state])
+        new_nfa.final_states = {state_map[state] for state in self.final_states}
+        new_nfa.captures = {
+            state_map[state]: slot for state, slot in self.captures.items()
+        }
+        new_nfa.accept_tags = {
+            state_map[state]: tags for state, tags in self.accept_tags.items()
+        }
+        return new_nfa
+
+    def remove_epsilons(self) -> "NFA":
+        """消除 epsilon 转移, 返回等价的无 epsilon NFA
+
+        状态 s 的新出边是其 epsilon 闭包中各状态的非 epsilon 出边, 闭包含接受状态时 s 为接受状态。
+        只保留起始状态与非 epsilon 转移的目标, 仅经 epsilon 到达的状态不再需要。
+        结果的接受状态都在 final_states (或 accept_tags) 中, accept_state 为 None; 不保留捕获状态。
+        """
+        start_state = self.start_state
+        assert start_state is not None, "init first"
+        ids = {state: i for i, state in enumerate(self.states)}
+        closures = BitsetNFA._compute_closures(self, ids)
+        accept_mask = 0
+        for state in self._plain_accept_states():
+            accept_mask |= 1 << ids[state]
+        tag_bits = [(1 << ids[state], tags) for state, tags in self.accept_tags.items()]
+
+        kept = {start_state: None}
+        for state in self.states:
+            for char, targets in state.transitions.items():
+                if char is not None:
+                    kept.update(dict.fromkeys(targets))
+        state_map = {state: State() for state in kept}
+        new_nfa = NFA([])
+        for state in kept:
+            new_nfa.add_state(state_map[state])
+
+        for state in kept:
+            source = state_map[state]
+            closure = closures[ids[state]]
+            edges: dict[str | CharClass, dict[State, None]] = {}
+            mask = closure
+            while mask:
+                low = mask & -mask
+                for char, targets in self.states[
+                    low.bit_length() - 1
+                ].transitions.items():
+                    if char is not None:
+                        row = edges.setdefault(char, {})
+                        row.update(dict.fromkeys(state_map[t] for t in targets))
+                mask ^= low
+            source.transitions = {char: list(row) for char, row in edges.items()}
+            if closure & accept_mask:
+                new_nfa.final_states.add(source)
+            tags = frozenset().union(*(tags for bit, tags in tag_bits if closure & bit))
+            if tags:
+                new_nfa.accept_tags[source] = tags
+
+        new_nfa.set_start_state(state_map[start_state])
+        new_nfa.accept_state = None
+        new_nfa.reduction = self._stats_to(new_nfa)
+        return new_nfa
+
+    def reduce(self, remove_epsilons: bool = True) -> "NFA":
+        """化简NFA, 返回等价且不更大的新NFA
+
+        依次: (可选) 消除 epsilon 转移; 删去从起始状态不可达或到达不了接受状态的状态;
+        按互模拟 (bisimulation) 合并状态: 接受属性相同, 且每个符号 (epsilon 亦视为符号)
+        的后继落在相同的等价块中的状态语言相同。等价块用签名迭代细化直到不再分裂。
+        结果不再满足 Thompson 构造的单接受状态约定, 只用于模拟与确定化。
+        """
+        assert self.start_state is not None, "init first"
+        nfa = self.remove_epsilons() if remove_epsilons else self
+        start_state = nfa.start_state
+        assert start_state is not None
+        plain = nfa._plain_accept_states()
+        useful = nfa._useful_states(nfa.accepting_states())
+        if not useful:
+            # 语言为空: 只剩一个没有出边的非接受起始状态
+            new_nfa = NFA([State()])
+            new_nfa.accept_state = None
+            new_nfa.reduction = self._stats_to(new_nfa)
+            return new_nfa
+
+        block, count = nfa._bisimulation_blocks(useful, plain)
+
+        merged = [State() for _ in range(count)]
+        new_nfa = NFA([])
+        for state in merged:
+            new_nfa.add_state(state)
+        done: set[int] = set()
+        for state in useful:
+            index = block[state]
+            if index in done:
+                continue
+            done.add(index)
+            target_state = merged[index]
+            for char, targets in state.transitions.items():
+                row = dict.fromkeys(merged[block[t]] for t in targets if t in block)
+                if row:
+                    target_state.transitions[char] = list(row)
+            if state in plain:
+                new_nfa.final_states.add(target_state)
+            if state in nfa.accept_tags:
+                new_nfa.accept_tags[target_state] = nfa.accept_tags[state]
+        new_nfa.set_start_state(merged[block[start_state]])
+        new_nfa.accept_state = None
+        new_nfa.reduction = self._stats_to(new_nfa)
+        return new_nfa
+
+    def _bisimulation_blocks(
+        self, useful: list[State], plain: set[State]
+    ) -> tuple[dict[State, int], int]:
+        """求 useful 上最粗的互模拟划分, 返回 (状态 -> 块编号, 块数)
+
+        初始按 (是否普通接受, 模式编号集合) 划分。状态的签名是其各条边 (符号, 目标块) 的集合,
+        同一块内签名不同的状态被分开。块编号保持稳定: 分裂时最大的一组 (或未受影响的成员)
+        留在原块, 其余各组分到新块; 只有后继换了块的状态才需在下一轮重新计算签名,
+        因此长链等结构只需线性时间而不是每轮扫描全部状态。
+        """
+        kinds: dict[tuple[bool, frozenset[int]], int] = {}
+        block: dict[State, int] = {}
+        members: list[set[State]] = []
+        for state in useful:
+            kind = (state in plain, self.accept_tags.get(state, frozenset()))
+            index = kinds.setdefault(kind, len(kinds))
+            if index == len(members):
+                members.append(set())
+            members[index].add(state)
+            block[state] = index
+        predecessors: dict[State, set[State]] = {}
+        for state in useful:
+            for targets in state.transitions.values():
+                for target in targets:
+                    if target in block:
+                        predecessors.setdefault(target, set()).add(state)
+
+        # 每块全体成员共同的签名; 初始尚未计算, 为 None
+        block_signature: list[frozenset | None] = [None] * len(members)
+        dirty: set[State] = set(useful)
+        while dirty:
+            signatures = {
+                state: frozenset(
+                    (char, block[target])
+                    for char, targets in state.transitions.items()
+                    for target in targets
+                    if target in block
+                )
+                for state in dirty
+            }
+            by_block: dict[int, dict[frozenset, list[State]]] = {}
+            for state, signature in signatures.items():
+                groups = by_block.setdefault(block[state], {})
+                groups.setdefault(signature, []).append(state)
+            moved: list[State] = []
+            for index, groups in by_block.items():
+                if sum(map(len, groups.values())) < len(members[index]):
+                    keep = block_signature[index]
+                else:
+                    keep = max(groups, key=lambda signature: len(groups[signature]))
+                block_signature[index] = keep
+                for signature, group in groups.items():
+                    if signature == keep:
+                        continue
+                    new_index = len(members)
+                    members.append(set(group))
+                    block_signature.append(signature)
+                    members[index].difference_update(group)
+                    for state in group:
+                        block[state] = new_index
+                    moved.extend(group)
+            dirty = {
+                source for state in moved for source in predecessors.get(state, ())
+            }
+        return block, len(members)
+
+    def _useful_states(self, accepting: set[State]) -> list[State]:
+        """从起始状态可达且能到达某个接受状态的状态, 按原顺序; 语言为空时为空列表"""
+        assert self.start_state is not None, "init first"
+        reachable = {self.start_state}
+        stack = [self.start_state]
+        predecessors: dict[State, list[State]] = {}
+        while stack:
+            state = stack.pop()
+            for targets in state.transitions.values():
+                for target in targets:
+                    predecessors.setdefault(target, []).append(state)
+                    if target not in reachable:
+                        reachable.add(target)
+                        stack.append(target)
+        coaccessible = accepting & reachable
+        stack = list(coaccessible)
+        while stack:
+            for source in predecessors.get(stack.pop(), ()):
+                if source not in coaccessible:
+                    coaccessible.add(source)
+                    stack.append(source)
+        return [state for state in self.states if state in coaccessible]
+
+    def _stats_to(self, other: "NFA") -> ReductionStats:
+        before = self.reduction
+        return ReductionStats(
+            before.states_before if before else len(self.states),
+            len(other.states),
+            before.edges_before if before else self.num_edges,
+            other.num_edges,
+        )
+
+    def visualize(self, filename: str):
+        """可视化NFA, 生成 DOT 文本并调用 Graphviz 渲染为 png"""
+        render(self, filename)
 
     def copy(self):
         """创建并返回此NFA的深拷贝"""
@@ -86,4 +418,11 @@ class NFA:
             new_nfa.set_start_state(state_map[self.start_state])
         if self.accept_state:
             new_nfa.set_accept_state(state_map[self.accept_state])
+        new_nfa.final_states = {state_map[state] for state in self.final_states}
+        new_nfa.captures = {
+            state_map[state]: slot for state, slot in self.captures.items()
+        }
+        new_nfa.accept_tags = {
+            state_map[state]: tags for state, tags in self.accept_tags.items()
+        }
         return new_nfa
@@ -0,0 +1,238 @@
+from lab2.charclass import ANY, DIGIT, MAX_CODEPOINT, SPACE, WORD, CharClass
+from lab2.syntax import (
+    Concat,
+    Empty,
+    Group,
+    Node,
+    Plus,
+    Question,
+    Repeat,
+    Star,
+    Symbol,
+    Union,
+)
+
+_CLASS_ESCAPES = {
+    "d": DIGIT,
+    "D": DIGIT.negate(),
+    "w": WORD,
+    "W": WORD.negate(),
+    "s": SPACE,
+    "S": SPACE.negate(),
+}
+_CHAR_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "f": "\f", "v": "\v", "0": "\0"}
+_HEX_ESCAPES = {"x": 2, "u": 4, "U": 8}
+_QUANTIFIERS = "*+?"
+
+
+class RegexSyntaxError(ValueError):
+    """正规表达式语法错误, position 为出错处在模式中的下标"""
+
+    def __init__(self, message: str, pattern: str, position: int):
+        super().__init__(f"{message} at position {position}")
+        self.pattern = pattern
+        self.position = position
+
+
+def parse(pattern: str) -> Node:
+    """把模式解析为语法树"""
+    return Parser(pattern).parse()
+
+
+class Parser:
+    """正规表达式的递归下降分析器, 一趟扫描直接构造语法树
+
+    文法 (优先级由低到高):
+        alternation -> concat ('|' concat)*
+        concat      -> repeat*
+        repeat      -> atom ('*' | '+' | '?' | '{m,n}')?
+        atom        -> '(' alternation ')' | '[' class ']' | '\\' escape | '.' | 字符
+    空的 concat (如空模式、() 与 a| 的空分支) 为 Empty; 单字符的字符类退化为普通字符。
+    括号为捕获组, 按左括号出现的顺序从 1 编号, groups 为已分析的组数。
+    """
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.pos = 0
+        self.groups = 0
+
+    def error(self, message: str, position: int | None = None) -> RegexSyntaxError:
+        return RegexSyntaxError(
+            message, self.pattern, self.pos if position is None else position
+        )
+
+    def parse(self) -> Node:
+        node = self.alternation()
+        if self.pos < len(self.pattern):
+            # alternation 只会停在多余的右括号上
+            raise self.error("unbalanced parenthesis")
+        return node
+
+    def alternation(self) -> Node:
+        branches = [self.concat()]
+        while self.pos < len(self.pattern) and self.pattern[self.pos] == "|":
+            self.pos += 1
+            branches.append(self.concat())
+        return branches[0] if len(branches) == 1 else Union(*branches)
+
+    def concat(self) -> Node:
+        items: list[Node] = []
+        pattern = self.pattern
+        while self.pos < len(pattern) and pattern[self.pos] not in "|)":
+            items.append(self.repeat())
+        if not items:
+            return Empty()
+        return items[0] if len(items) == 1 else Concat(*items)
+
+    def repeat(self) -> Node:
+        node = self.atom()
+        pattern = self.pattern
+        quantified = False
+        while self.pos < len(pattern):
+            char = pattern[self.pos]
+            if char in _QUANTIFIERS:
+                bounds = None
+                end = self.pos + 1
+            elif char == "{" and (repeat := self.bounds(self.pos + 1)) is not None:
+                bounds, end = repeat
+            else:
+                break
+            if quantified:
+                raise self.error("multiple repeat")
+            quantified = True
+            if char == "*":
+                node = Star(node)
+            elif char == "+":
+                node = Plus(node)
+            elif char == "?":
+                node = Question(node)
+            else:
+                assert bounds is not None
+                node = Repeat(node, *bounds)
+            self.pos = end
+        return node
+
+    def atom(self) -> Node:
+        pattern = self.pattern
+        begin = self.pos
+        char = pattern[begin]
+        if char == "(":
+            self.pos += 1
+            self.groups += 1
+            index = self.groups
+            node = self.alternation()
+            if self.pos >= len(pattern):
+                raise self.error("missing ), unterminated subpattern", begin)
+            self.pos += 1
+            return Group(node, index)
+        if char in _QUANTIFIERS or (
+            char == "{" and self.bounds(self.pos + 1) is not None
+        ):
+            raise self.error("nothing to repeat")
+        atom: str | CharClass
+        if char == "[":
+            atom = self.char_class()
+        elif char == "\\":
+            atom = self.escape()
+        elif char == ".":
+            self.pos += 1
+            atom = ANY
+        else:
+            self.pos += 1
+            atom = char
+        if isinstance(atom, CharClass):
+            atom = atom.single() or atom
+        return Symbol(atom)
+
+    def escape(self) -> str | CharClass:
+        """解析反斜杠开始的转义, 返回字符或字符类"""
+        pattern = self.pattern
+        begin = self.pos
+        i = begin + 1
+        if i >= len(pattern):
+            raise self.error("trailing backslash", begin)
+        char = pattern[i]
+        self.pos = i + 1
+        if char in _CLASS_ESCAPES:
+            return _CLASS_ESCAPES[char]
+        if char in _CHAR_ESCAPES:
+            return _CHAR_ESCAPES[char]
+        if char in _HEX_ESCAPES:
+            width = _HEX_ESCAPES[char]
+            digits = pattern[i + 1 : i + 1 + width]
+            if len(digits) != width or not all(
+                d in "0123456789abcdefABCDEF" for d in digits
+            ):
+                raise self.error(f"bad escape \\{char}", begin)
+            code = int(digits, 16)
+            if code > MAX_CODEPOINT:
+                raise self.error(f"escape \\{char}{digits} out of range", begin)
+            self.pos = i + 1 + width
+            return chr(code)
+        if char.isalnum():
+            raise self.error(f"bad escape \\{char}", begin)
+        return char
+
+    def char_class(self) -> CharClass:
+        """解析方括号字符类"""
+        pattern = self.pattern
+        begin = self.pos
+        self.pos += 1
+        negated = self.pos < len(pattern) and pattern[self.pos] == "^"
+        if negated:
+            self.pos += 1
+        intervals: list[tuple[int, int]] = []
+        first = True
+        while True:
+            if self.pos >= len(pattern):
+                raise self.error("unterminated character class", begin)
+            if pattern[self.pos] == "]" and not first:
+                self.pos += 1
+                break
+            first = False
+            item = self.class_item()
+            if isinstance(item, CharClass):
+                intervals.extend(item.intervals)
+                continue
+            i = self.pos
+            if i + 1 < len(pattern) and pattern[i] == "-" and pattern[i + 1] != "]":
+                self.pos += 1
+                last = self.class_item()
+                if isinstance(last, CharClass):
+                    raise self.error("bad range in character class", i)
+                if ord(last) < ord(item):
+                    raise self.error(f"bad range {item}-{last}", i - 1)
+                intervals.append((ord(item), ord(last)))
+            else:
+                intervals.append((ord(item), ord(item)))
+        atom = CharClass(intervals)
+        return atom.negate() if negated else atom
+
+    def class_item(self) -> str | CharClass:
+        if self.pattern[self.pos] == "\\":
+            return self.escape()
+        self.pos += 1
+        return self.pattern[self.pos - 1]
+
+    def bounds(self, i: int) -> tuple[tuple[int, int | None], int] | None:
+        """解析 pattern[i] 起的 {m} {m,} {,n} {m,n} (左花括号之后)
+
+        返回 ((m, n), 右花括号之后的位置); 不符合语法时返回 None, 此时 { 作普通字符。
+        """
+        pattern = self.pattern
+        close = pattern.find("}", i)
+        if close < 0:
+            return None
+        low_text, comma, high_text = pattern[i:close].partition(",")
+        if not (low_text or high_text) or not all(
+            part.isascii() and part.isdigit() for part in (low_text, high_text) if part
+        ):
+            return None
+        low = int(low_text) if low_text else 0
+        if not comma:
+            high: int | None = low
+        else:
+            high = int(high_text) if high_text else None
+        if high is not None and high < low:
+            raise self.error(f"bad repetition {{{pattern[i:close]}}}", i - 1)
+        return (low, high), close + 1
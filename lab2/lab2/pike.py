@@ -0,0 +1,235 @@
+from collections.abc import Iterator
+
+from lab2.cache import compile as compile_pattern
+from lab2.charclass import CharClass
+from lab2.compiled import DEAD
+from lab2.literals import Prefilter, quality
+from lab2.regex import Regex
+
+
+class Match:
+    """一次匹配的结果, 接口仿照 re.Match; 未参与匹配的组的位置为 -1"""
+
+    __slots__ = ("_slots", "string")
+
+    def __init__(self, string: str, slots: tuple[int, ...]):
+        self.string = string
+        self._slots = slots
+
+    def span(self, group: int = 0) -> tuple[int, int]:
+        return self._slots[2 * group], self._slots[2 * group + 1]
+
+    def start(self, group: int = 0) -> int:
+        return self._slots[2 * group]
+
+    def end(self, group: int = 0) -> int:
+        return self._slots[2 * group + 1]
+
+    def group(self, group: int = 0) -> str | None:
+        start, end = self.span(group)
+        if start < 0 or end < 0:
+            return None
+        return self.string[start:end]
+
+    def groups(self) -> tuple[str | None, ...]:
+        """各捕获组匹配的子串"""
+        return tuple(self.group(i) for i in range(1, len(self._slots) // 2))
+
+    def __repr__(self):
+        return f"<Match span={self.span()} match={self.group()!r}>"
+
+
+class PikeVM:
+    """Pike 虚拟机: 在带捕获状态的 Thompson NFA 上求最左最长匹配及各组的子匹配位置
+
+    所有线程在输入上同步推进, 每一步的线程表按NFA状态去重, 先到达某状态的线程优先级更高,
+    后到者被丢弃, 因此每个位置至多处理 len(states) 个线程, 总时间为 O(len * states), 不会回溯。
+    线程的捕获槽位是共享的不可变元组, 只有经过捕获状态时才复制出新的元组。
+    线程表中起点早的线程排在前面; 找到匹配后不再注入新线程, 并丢弃起点更晚的线程,
+    起点相同的线程继续推进以寻找更长的匹配, 终点相同时取优先级最高 (与回溯顺序一致) 的子匹配。
+
+    搜索前先用DFA预筛选: 单趟的 unanchored DFA 给出最早的匹配终点, 没有匹配时直接返回,
+    有匹配时最左匹配的起点不会晚于它; 此外只在DFA起始状态有转移的字符处注入新线程。
+
+    在此之前还用模式的字面量信息 (Regex.literals) 跳过不可能的位置: 每个匹配都以某个必需前缀开头时,
+    直接跳到前缀的下一个出现处; 每个匹配都包含某个必需因子时, 因子不再出现即可返回,
+    模式长度有界时还可跳到因子出现处之前 max_len 以内。查找用 str.find 或 Aho-Corasick,
+    代价远小于逐字符的自动机转移, 在匹配稀疏的长文本上效果明显。prefilter=False 时关闭这一步。
+    """
+
+    def __init__(self, pattern: str, prefilter: bool = True):
+        self.pattern: str = pattern
+        regex = Regex(pattern, simplify=False)
+        nfa = regex.to_nfa()
+        self.groups: int = regex.groups
+        start_state, accept_state = nfa.start_state, nfa.accept_state
+        assert start_state is not None and accept_state is not None
+        ids = {state: i for i, state in enumerate(nfa.states)}
+        self._start = ids[start_state]
+        self._accept = ids[accept_state]
+        self._epsilons: list[tuple[int, ...]] = []
+        self._edges: list[tuple[tuple[str | CharClass, tuple[int, ...]], ...]] = []
+        self._captures: list[int] = []
+        for state in nfa.states:
+            self._epsilons.append(
+                tuple(ids[target] for target in state.transitions.get(None, ()))
+            )
+            self._edges.append(
+                tuple(
+                    (label, tuple(ids[target] for target in targets))
+                    for label, targets in state.transitions.items()
+                    if label is not None
+                )
+            )
+            self._captures.append(nfa.captures.get(state, -1))
+
+        compiled = compile_pattern(pattern)
+        self._classes = compiled
+        self._nullable = compiled.is_accept(compiled.start)
+        table = compiled.table
+        row = compiled.start * compiled.num_classes
+        # 符号类 -> 能否作为匹配的第一个字符
+        self._can_start = bytearray(
+            table[row + cls] != DEAD for cls in range(compiled.num_classes)
+        )
+        self._finder = compiled.unanchored()
+        self._finder_accepting = bytearray(
+            self._finder.is_accept(state) for state in range(self._finder.num_states)
+        )
+
+        self._prefix: Prefilter | None = None
+        self._factor: Prefilter | None = None
+        self._max_len: int | None = None
+        if prefilter:
+            info = Regex(pattern).literals()
+            self._prefix = Prefilter.build(info.prefixes)
+            # 因子只在比前缀更有选择性时才额外查找
+            if self._prefix is None or quality(info.factors) > quality(info.prefixes):
+                self._factor = Prefilter.build(info.factors)
+            self._max_len = info.max_len
+
+    def _skip(self, string: str, pos: int, endpos: int) -> int:
+        """用必需的字面量跳到第一个可能的匹配起点, 不可能再有匹配时返回 -1"""
+        if self._factor is not None:
+            hit = self._factor.find(string, pos, endpos)
+            if hit is None:
+                return -1
+            if self._max_len is not None:
+                # 匹配包含起点不早于 hit[0] 的因子, 其终点至少为 hit[0] + min_len
+                pos = max(pos, hit[0] + self._factor.min_len - self._max_len)
+        if self._prefix is not None:
+            hit = self._prefix.find(string, pos, endpos)
+            if hit is None:
+                return -1
+            pos = hit[0]
+        return pos
+
+    def _earliest_end(self, string: str, pos: int, endpos: int) -> int:
+        """从 pos 起最早结束的匹配的终点, 没有匹配时返回 -1"""
+        finder = self._finder
+        accepting = self._finder_accepting
+        state = finder.start
+        if accepting[state]:
+            return pos
+        table = finder.table
+        stride = finder.num_classes
+        class_of = finder.class_of
+        for i in range(pos, endpos):
+            state = table[state * stride + class_of(string[i])]
+            if accepting[state]:
+                return i + 1
+        return -1
+
+    def search(
+        self, string: str, pos: int = 0, endpos: int | None = None
+    ) -> Match | None:
+        """在 string[pos:endpos] 中查找最左最长匹配"""
+        end = len(string) if endpos is None else min(endpos, len(string))
+        pos = self._skip(string, pos, end)
+        if pos < 0:
+            return None
+        last_start = self._earliest_end(string, pos, end)
+        if last_start < 0:
+            return None
+
+        epsilons = self._epsilons
+        edges = self._edges
+        captures = self._captures
+        accept = self._accept
+        start = self._start
+        nullable = self._nullable
+        can_start = self._can_start
+        class_of = self._classes.class_of
+        marks = [-1] * len(edges)
+        unset = (-1,) * (2 * self.groups + 1)
+
+        def add(threads: list, generation: int, state: int, slots: tuple, at: int):
+            """按优先级 (深度优先, epsilon 边依次) 把 state 的闭包加入线程表"""
+            stack = [(state, slots)]
+            while stack:
+                state, slots = stack.pop()
+                if marks[state] == generation:
+                    continue
+                marks[state] = generation
+                slot = captures[state]
+                if slot >= 0:
+                    slots = slots[:slot] + (at,) + slots[slot + 1 :]
+                targets = epsilons[state]
+                if targets:
+                    stack.extend((target, slots) for target in reversed(targets))
+                if edges[state] or state == accept:
+                    threads.append((state, slots))
+
+        threads: list[tuple[int, tuple[int, ...]]] = []
+        best: tuple[int, ...] | None = None
+        generation = 0
+        at = pos
+        while True:
+            if (
+                best is None
+                and at <= last_start
+                and (nullable or (at < end and can_start[class_of(string[at])]))
+            ):
+                add(threads, generation, start, (at,) + unset, at)
+            for state, slots in threads:
+                if state == accept:
+                    # 线程表按起点排序, 第一个接受的线程起点最早、优先级最高
+                    if best is None or slots[0] < best[0] or at > best[1]:
+                        best = (slots[0], at) + slots[2:]
+                    break
+            if best is not None:
+                threads = [thread for thread in threads if thread[1][0] <= best[0]]
+            if at >= end or (not threads and (best is not None or at >= last_start)):
+                break
+            generation += 1
+            if not threads:
+                at += 1
+                continue
+            char = string[at]
+            at += 1
+            next_threads: list[tuple[int, tuple[int, ...]]] = []
+            for state, slots in threads:
+                for label, targets in edges[state]:
+                    if label == char or (
+                        isinstance(label, CharClass) and char in label
+                    ):
+                        for target in targets:
+                            add(next_threads, generation, target, slots, at)
+            threads = next_threads
+        return None if best is None else Match(string, best)
+
+    def finditer(
+        self, string: str, pos: int = 0, endpos: int | None = None
+    ) -> Iterator[Match]:
+        """依次产生互不重叠的最左最长匹配; 空匹配之后从下一个位置继续"""
+        end = len(string) if endpos is None else min(endpos, len(string))
+        while pos <= end:
+            match = self.search(string, pos, end)
+            if match is None:
+                return
+            yield match
+            start, stop = match.span()
+            pos = stop + 1 if stop == start else stop
+
+    def __repr__(self):
+        return f"PikeVM({self.pattern!r})"
@@ -1,92 +1,103 @@
+from lab2.charclass import CharClass
+from lab2.dfa import DFA
+from lab2.direct import FollowposBuilder
+from lab2.literals import LiteralInfo, analyze
 from lab2.nfa import NFA
+from lab2.parser import Parser
+from lab2.simplify import simplify as simplify_tree
 from lab2.state import State
+from lab2.syntax import (
+    Concat,
+    Empty,
+    Group,
+    Node,
+    Plus,
+    Question,
+    Repeat,
+    Star,
+    Symbol,
+    Union,
+)
 
 
 class Regex:
-    def __init__(self, pattern: str):
-        self.pattern: str = self._add_explicit_concat_operator(pattern)
-
-    @staticmethod
-    def _add_explicit_concat_operator(expression: str):
-        """添加显示连接符号"""
-        output = []
-        unaryOperators = {"*", "+", "?"}
-        binaryOperators = {"|"}
-        operators = unaryOperators.union(binaryOperators)
-        for i in range(len(expression) - 1):
-            output.append(expression[i])
-            assert not (
-                expression[i] in unaryOperators and expression[i + 1] in unaryOperators
-            )
-            assert not (
-                expression[i] in binaryOperators
-                and expression[i + 1] in binaryOperators
-            )
-            assert not (
-                expression[i] in binaryOperators and expression[i + 1] in unaryOperators
-            )
-            if (expression[i] not in binaryOperators and expression[i] != "(") and (
-                expression[i + 1] not in operators and expression[i + 1] != ")"
-            ):
-                output.append(".")
-        output.append(expression[-1])
-        return "".join(output)
-
-    def to_postfix(self):
-        """将正则表达式转换为后缀表达式"""
-        precedence = {".": 2, "|": 1}  # '.'表示连接操作
-        output: list[str] = []
-        stack: list[str] = []
-        for char in self.pattern:
-            if char in precedence:
-                while (
-                    stack
-                    and stack[-1] != "("
-                    and precedence[stack[-1]] >= precedence[char]
-                ):
-                    output.append(stack.pop())
-                stack.append(char)
-            elif char == "(":
-                stack.append(char)
-            elif char == ")":
-                while stack and stack[-1] != "(":
-                    output.append(stack.pop())
-                stack.pop()
-            else:
-                output.append(char)
-        while stack:
-            output.append(stack.pop())
-        return "".join(output)
-
-    def to_nfa(self):
-        postfix = self.to_postfix()
-        stack: list[NFA] = []
-        for char in postfix:
-            if char == "*":
-                stack.append(self.apply_closure(stack.pop()))
-            elif char == "+":
-                stack.append(self.apply_plus(stack.pop()))
-            elif char == "?":
-                stack.append(self.apply_question(stack.pop()))
-            elif char == "|":
-                nfa2 = stack.pop()
-                nfa1 = stack.pop()
-                stack.append(self.apply_union(nfa1, nfa2))
-            elif char == ".":
-                nfa2 = stack.pop()
-                nfa1 = stack.pop()
-                stack.append(self.apply_concatenation(nfa1, nfa2))
-            else:
-                stack.append(self.create_basic_nfa(char))
-        return stack.pop()
-
-    def create_basic_nfa(self, char):
-        """实现单个符号的NFA"""
+    """正规表达式
+
+    支持单字符、转义 (\\n \\t \\xHH \\uHHHH \\d \\w \\s 及其大写补集等)、任意字符 .、
+    字符类 [a-z] [^...]、闭包 * + ?、有界重复 {m} {m,} {,n} {m,n}、并联 | 与括号。
+    模式由递归下降分析器一趟解析为语法树并化简, Thompson 构造与直接构造DFA都从语法树出发。
+    字符类与区间在自动机中是一条区间转移, 不会展开为逐字符的边。
+    """
+
+    def __init__(self, pattern: str, simplify: bool = True):
+        self.pattern: str = pattern
+        parser = Parser(pattern)
+        tree = parser.parse()
+        self.groups: int = parser.groups  # 捕获组数
+        # 化简会去掉捕获组, 保留捕获组的 NFA 需用 simplify=False 构造
+        self.ast: Node = simplify_tree(tree) if simplify else tree
+
+    def to_syntax_tree(self) -> Node:
+        """返回 (化简后的) 语法树"""
+        return self.ast
+
+    def to_nfa(self) -> NFA:
+        return self._thompson(self.ast)
+
+    def _thompson(self, node: Node) -> NFA:
+        """Thompson 构造: 对语法树自底向上构造NFA
+
+        {m,n} 需要多份子自动机时对子树重新构造, 而不是深拷贝已构造的NFA。
+        """
+        if isinstance(node, Symbol):
+            return self.create_basic_nfa(node.char)
+        if isinstance(node, Empty):
+            return self.create_empty_nfa()
+        if isinstance(node, Concat):
+            result = self._thompson(node.items[0])
+            for item in node.items[1:]:
+                result = self.apply_concatenation(result, self._thompson(item))
+            return result
+        if isinstance(node, Union):
+            return self.apply_union(*map(self._thompson, node.items))
+        if isinstance(node, Star):
+            return self.apply_closure(self._thompson(node.child))
+        if isinstance(node, Plus):
+            return self.apply_plus(self._thompson(node.child))
+        if isinstance(node, Question):
+            return self.apply_question(self._thompson(node.child))
+        if isinstance(node, Group):
+            return self.apply_group(self._thompson(node.child), node.index)
+        if isinstance(node, Repeat):
+            count = max(node.low, 1) if node.high is None else node.high
+            copies = [self._thompson(node.child) for _ in range(count)]
+            return self.apply_repeat(copies, node.low, node.high)
+        raise TypeError(f"unknown syntax node: {node!r}")
+
+    def to_dfa_direct(self) -> DFA:
+        """不经过NFA, 用 followpos 方法由语法树直接构造DFA"""
+        return FollowposBuilder(self.ast).build()
+
+    def literals(self) -> LiteralInfo:
+        """提取每个匹配必须的字面量: 前缀、后缀与内部因子, 供搜索时预筛选候选位置"""
+        return analyze(self.ast)
+
+    def create_basic_nfa(self, char: str | CharClass):
+        """实现单个符号的NFA, 字符类为一条区间转移, 只含一个字符时退化为普通转移"""
+        if isinstance(char, CharClass):
+            char = char.single() or char
         start_state = State()
         accept_state = State()
         start_state.add_transition(char, accept_state)
         return NFA([start_state, accept_state])
 
+    def create_empty_nfa(self):
+        """只接受空串的NFA"""
+        start_state = State()
+        accept_state = State()
+        start_state.add_transition(None, accept_state)
+        return NFA([start_state, accept_state])
+
     def apply_closure(self, nfa: NFA):
         """实现闭包操作: NFA*"""
         assert nfa.accept_state, "set accept_state for NFA first"
@@ -103,31 +114,89 @@ class Regex:
         return nfa
 
     def apply_plus(self, nfa: NFA):
-        """实现一次或多次重复: NFA+ 相当于 NFA . NFA*"""
-        nfa_copy = nfa.copy()
-        nfa_copy.visualize("test")
-        return self.apply_concatenation(nfa_copy, self.apply_closure(nfa))
+        """实现一次或多次重复: NFA+, 与闭包相同但没有跳过的 epsilon 边, 无需复制NFA"""
+        assert nfa.accept_state, "set accept_state for NFA first"
+        start_state = State()
+        accept_state = State()
+        start_state.add_transition(None, nfa.start_state)
+        nfa.accept_state.add_transition(None, nfa.start_state)
+        nfa.accept_state.add_transition(None, accept_state)
+        nfa.add_state(start_state)
+        nfa.add_state(accept_state)
+        nfa.set_start_state(start_state)
+        nfa.set_accept_state(accept_state)
+        return nfa
+
+    def apply_group(self, nfa: NFA, index: int):
+        """实现捕获组 (NFA): 前后各加一个捕获状态, 经过时分别记录第 index 组的起止位置"""
+        assert nfa.accept_state, "set accept_state for NFA first"
+        open_state = State()
+        close_state = State()
+        open_state.add_transition(None, nfa.start_state)
+        nfa.accept_state.add_transition(None, close_state)
+        nfa.add_state(open_state)
+        nfa.add_state(close_state)
+        nfa.set_start_state(open_state)
+        nfa.set_accept_state(close_state)
+        nfa.captures[open_state] = 2 * index
+        nfa.captures[close_state] = 2 * index + 1
+        return nfa
+
+    def apply_repeat(self, copies: list[NFA], low: int, high: int | None):
+        """实现有界重复 NFA{low,high}, copies 为各自独立构造的子NFA
+
+        前 low 份顺序连接; 无上界时最后一份改为 NFA+ (low 为 0 时为 NFA*),
+        有上界时其余各份嵌套为 (NFA(NFA(...)?)?)?, 使状态数与展开后的模式长度成正比。
+        """
+        if high is None:
+            *mandatory, last = copies
+            tail = self.apply_plus(last) if low else self.apply_closure(last)
+            parts = mandatory + [tail]
+        else:
+            parts = copies[:low]
+            optional = None
+            for nfa in reversed(copies[low:]):
+                if optional is not None:
+                    nfa = self.apply_concatenation(nfa, optional)
+                optional = self.apply_question(nfa)
+            if optional is not None:
+                parts.append(optional)
+        if not parts:
+            return self.create_empty_nfa()
+        result = parts[0]
+        for nfa in parts[1:]:
+            result = self.apply_concatenation(result, nfa)
+        return result
 
     def apply_question(self, nfa: NFA):
-        """实现零次或一次出现: NFA? 相当于 (ε|NFA)"""
+        """实现零次或一次出现: NFA? 相当于 (ε|NFA), 跳过的 epsilon 边直接连到新的接受状态"""
+        assert nfa.accept_state, "set accept_state for NFA first"
         start_state = State()
         accept_state = State()
+        start_state.add_transition(None, nfa.start_state)
         start_state.add_transition(None, accept_state)
-        epsilon_nfa = NFA([start_state, accept_state])
-        return self.apply_union(epsilon_nfa, nfa)
+        nfa.accept_state.add_transition(None, accept_state)
+        nfa.add_state(start_state)
+        nfa.add_state(accept_state)
+        nfa.set_start_state(start_state)
+        nfa.set_accept_state(accept_state)
+        return nfa
 
-    def apply_union(self, nfa1: NFA, nfa2: NFA):
-        """实现并联操作: NFA1 | NFA2"""
-        assert nfa1.accept_state is not None and nfa2.accept_state is not None, (
-            "set accept_state for NFAs first"
-        )
+    def apply_union(self, *nfas: NFA):
+        """实现并联操作: NFA1 | NFA2 | ..., 多个分支共用一对新的开始与接受状态"""
         start_state = State()
         accept_state = State()
-        start_state.add_transition(None, nfa1.start_state)
-        start_state.add_transition(None, nfa2.start_state)
-        nfa1.accept_state.add_transition(None, accept_state)
-        nfa2.accept_state.add_transition(None, accept_state)
-        return NFA([start_state] + nfa1.states + nfa2.states + [accept_state])
+        states = [start_state]
+        for nfa in nfas:
+            assert nfa.accept_state is not None, "set accept_state for NFAs first"
+            start_state.add_transition(None, nfa.start_state)
+            nfa.accept_state.add_transition(None, accept_state)
+            states.extend(nfa.states)
+        states.append(accept_state)
+        result = NFA(states)
+        for nfa in nfas:
+            result.captures.update(nfa.captures)
+        return result
 
     def apply_concatenation(self, nfa1: NFA, nfa2: NFA):
         """实现连接操作: NFA1 . NFA2"""
@@ -139,4 +208,5 @@ class Regex:
         nfa = NFA(nfa1.states + nfa2.states)
         nfa.set_start_state(nfa1.start_state)
         nfa.set_accept_state(nfa2.accept_state)
+        nfa.captures = {**nfa1.captures, **nfa2.captures}
         return nfa
@@ -0,0 +1,65 @@
+from collections.abc import Iterable
+
+from lab2.compiled import CompiledDFA
+from lab2.dfa import DFA
+from lab2.nfa import NFA
+from lab2.regex import Regex
+from lab2.state import State
+
+_EMPTY: frozenset[int] = frozenset()
+
+
+class RegexSet:
+    """多模式匹配器: 把多个正规表达式并联成一个带标签的DFA
+
+    新的起始状态经 epsilon 边连到各模式NFA的起始状态, 各模式的接受状态以其下标为标签;
+    子集构造与最小化都保留标签, 匹配时一次扫描输入即可得到所有完全匹配的模式编号。
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: list[str] = list(patterns)
+        self.dfa: DFA = DFA(self.to_nfa()).minimize()
+        self.compiled: CompiledDFA = self.dfa.compile()
+        # compile 以起始状态为 0, 其余按 states 顺序编号; 最小化结果的起始状态本就在首位
+        assert self.dfa.states[0] is self.dfa.start_state
+        self._table = self.compiled.table
+        self._stride = self.compiled.num_classes
+        tags = self.dfa.tags
+        self._tags: list[frozenset[int]] = [
+            tags.get(state, _EMPTY) for state in self.dfa.states
+        ]
+
+    def to_nfa(self) -> NFA:
+        """构造并联后的带标签NFA"""
+        start = State()
+        nfa = NFA([start])
+        for tag, pattern in enumerate(self.patterns):
+            sub_nfa = Regex(pattern).to_nfa()
+            assert sub_nfa.start_state and sub_nfa.accept_state, "invalid pattern"
+            for state in sub_nfa.states:
+                nfa.add_state(state)
+            start.add_transition(None, sub_nfa.start_state)
+            nfa.accept_tags[sub_nfa.accept_state] = frozenset({tag})
+        nfa.accept_state = None
+        return nfa
+
+    def matches(self, string: str) -> frozenset[int]:
+        """一次扫描, 返回完全匹配 string 的所有模式编号"""
+        table = self._table
+        stride = self._stride
+        state = self.compiled.start
+        for cls in self.compiled.symbol_classes(string):
+            state = table[state * stride + cls]
+            if state < 0:
+                return _EMPTY
+        return self._tags[state]
+
+    def is_match(self, string: str) -> bool:
+        """是否有任一模式完全匹配 string"""
+        return self.compiled.fullmatch(string)
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def __repr__(self):
+        return f"RegexSet(patterns={len(self.patterns)}, states={len(self.dfa.states)})"
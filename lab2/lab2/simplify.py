@@ -0,0 +1,184 @@
+from lab2.charclass import CharClass
+from lab2.syntax import (
+    Concat,
+    Empty,
+    Group,
+    Node,
+    Plus,
+    Question,
+    Repeat,
+    Star,
+    Symbol,
+    Union,
+)
+
+
+def simplify(node: Node) -> Node:
+    """自底向上化简语法树, 不改变其描述的语言
+
+    每个结点由化简后的子结点经下面的规范化构造函数重建:
+    展平嵌套的连接与并联, 合并嵌套的闭包 ((x*)* -> x*, (x+)? -> x* 等),
+    并联分支去重并提取公共前缀 (ab|ac -> a(b|c)), 单字符分支合并为一个字符类。
+    捕获组不影响语言, 化简时去掉, 需要子匹配位置时使用未化简的语法树。
+    """
+    if isinstance(node, (Empty, Symbol)):
+        return node
+    if isinstance(node, Group):
+        return simplify(node.child)
+    if isinstance(node, Concat):
+        return concat([simplify(item) for item in node.items])
+    if isinstance(node, Union):
+        return union([simplify(item) for item in node.items])
+    if isinstance(node, Star):
+        return star(simplify(node.child))
+    if isinstance(node, Plus):
+        return plus(simplify(node.child))
+    if isinstance(node, Question):
+        return question(simplify(node.child))
+    if isinstance(node, Repeat):
+        return repeat(simplify(node.child), node.low, node.high)
+    raise TypeError(f"unknown syntax node: {node!r}")
+
+
+def nullable(node: Node) -> bool:
+    """语法树是否接受空串"""
+    if isinstance(node, (Empty, Star, Question)):
+        return True
+    if isinstance(node, Symbol):
+        return False
+    if isinstance(node, Concat):
+        return all(nullable(item) for item in node.items)
+    if isinstance(node, Union):
+        return any(nullable(item) for item in node.items)
+    if isinstance(node, (Plus, Group)):
+        return nullable(node.child)
+    if isinstance(node, Repeat):
+        return node.low == 0 or nullable(node.child)
+    raise TypeError(f"unknown syntax node: {node!r}")
+
+
+def concat(items: list[Node]) -> Node:
+    """连接: 展平嵌套的连接并去掉空串"""
+    flat: list[Node] = []
+    for item in items:
+        if isinstance(item, Concat):
+            flat.extend(item.items)
+        elif not isinstance(item, Empty):
+            flat.append(item)
+    if not flat:
+        return Empty()
+    return flat[0] if len(flat) == 1 else Concat(*flat)
+
+
+def union(items: list[Node]) -> Node:
+    """并联: 展平、去重, 提取公共前缀, 再把单字符分支合并为一个字符类
+
+    空串分支改写为整体可选; 分支顺序按各自首次出现的位置保留。
+    """
+    branches: dict[Node, None] = {}
+    for item in items:
+        for branch in item.items if isinstance(item, Union) else (item,):
+            branches[branch] = None
+    has_empty = Empty() in branches
+    branches.pop(Empty(), None)
+    if not branches:
+        return Empty()
+
+    factored = _factor_prefixes(list(branches))
+    merged = _merge_symbols(factored)
+    if len(merged) < len(factored) and len(set(map(_head, merged))) < len(merged):
+        # 合并出的字符类恰为另一分支的首项, 如 [ab]x|a|b, 再提取一次
+        result = union(merged)
+    else:
+        result = merged[0] if len(merged) == 1 else Union(*merged)
+    return question(result) if has_empty else result
+
+
+def _head(node: Node) -> Node:
+    return node.items[0] if isinstance(node, Concat) else node
+
+
+def _tail(node: Node) -> Node:
+    return concat(list(node.items[1:])) if isinstance(node, Concat) else Empty()
+
+
+def _factor_prefixes(branches: list[Node]) -> list[Node]:
+    """把首项相同的分支合并: ab|ac -> a(b|c), 更长的公共前缀在对剩余部分的并联中继续提取
+
+    合并后的分支放在组内第一个分支的位置。
+    """
+    groups: dict[Node, list[Node]] = {}
+    for branch in branches:
+        groups.setdefault(_head(branch), []).append(branch)
+    return [
+        group[0] if len(group) == 1 else concat([head, union(list(map(_tail, group)))])
+        for head, group in groups.items()
+    ]
+
+
+def _merge_symbols(branches: list[Node]) -> list[Node]:
+    """单字符与字符类分支合并为一个字符类, 放在第一个这样的分支处"""
+    merged: list[Node] = []
+    symbol_index = -1
+    for branch in branches:
+        if not isinstance(branch, Symbol):
+            merged.append(branch)
+        elif symbol_index < 0:
+            symbol_index = len(merged)
+            merged.append(branch)
+        else:
+            first = merged[symbol_index]
+            assert isinstance(first, Symbol)
+            classes = [
+                CharClass.from_char(s.char) if isinstance(s.char, str) else s.char
+                for s in (first, branch)
+            ]
+            atom = classes[0].union(classes[1])
+            merged[symbol_index] = Symbol(atom.single() or atom)
+    return merged
+
+
+def star(child: Node) -> Node:
+    """闭包: (x*)* (x+)* (x?)* 均为 x*"""
+    if isinstance(child, Empty):
+        return child
+    if isinstance(child, (Star, Plus, Question)):
+        return star(child.child)
+    if isinstance(child, Repeat) and child.low <= 1:
+        return star(child.child)
+    return Star(child)
+
+
+def plus(child: Node) -> Node:
+    """正闭包: (x+)+ 为 x+, (x*)+ 与 (x?)+ 为 x*, 可空的 x 使 x+ 等于 x*"""
+    if isinstance(child, Empty):
+        return child
+    if isinstance(child, Plus):
+        return child
+    if isinstance(child, (Star, Question)):
+        return star(child.child)
+    if nullable(child):
+        return star(child)
+    return Plus(child)
+
+
+def question(child: Node) -> Node:
+    """可选: 可空的 x 使 x? 等于 x, (x+)? 为 x*"""
+    if isinstance(child, Plus):
+        return star(child.child)
+    if nullable(child):
+        return child
+    return Question(child)
+
+
+def repeat(child: Node, low: int, high: int | None) -> Node:
+    """有界重复: 能用 ? * + 表示或退化为单份、空串时改写"""
+    if isinstance(child, Empty) or high == 0:
+        return Empty()
+    if (low, high) == (1, 1):
+        return child
+    if (low, high) == (0, 1):
+        return question(child)
+    if high is None and low <= 1:
+        return star(child) if low == 0 else plus(child)
+    return Repeat(child, low, high)
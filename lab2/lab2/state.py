@@ -1,13 +1,41 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from lab2.charclass import CharClass
+
+
 class State:
-    id_counter = 0
+    """NFA状态, 转移为 符号 -> 目标状态列表, 符号 None 表示 epsilon, 符号可为字符类
 
-    def __init__(self, name=None):
-        self.name = name or f"S{State.id_counter}"
-        State.id_counter += 1
-        self.transitions: dict[str | None, list[State]] = {}
+    id 由所属自动机按加入顺序分配, 未加入任何自动机时为 -1。
+    """
+
+    __slots__ = ("id", "name", "transitions")
+
+    def __init__(self, name: str | None = None):
+        self.id: int = -1
+        self.name: str | None = name
+        self.transitions: dict[str | CharClass | None, list[State]] = {}
 
     def add_transition(self, input_char, state):
         self.transitions.setdefault(input_char, []).append(state)
 
     def __str__(self):
-        return self.name
+        return self.name if self.name is not None else f"S{self.id}"
+
+
+class DFAState:
+    """DFA状态, 每个符号只有一个目标状态, 各符号 (字符或字符类) 互不相交"""
+
+    __slots__ = ("id", "name", "transitions")
+
+    def __init__(self, name: str | None = None):
+        self.id: int = -1
+        self.name: str | None = name
+        self.transitions: dict[str | CharClass, DFAState] = {}
+
+    def add_transition(self, input_char: "str | CharClass", state: "DFAState"):
+        self.transitions[input_char] = state
+
+    def __str__(self):
+        return self.name if self.name is not None else f"S{self.id}"
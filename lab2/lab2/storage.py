@@ -0,0 +1,47 @@
+from array import array
+
+from lab2.charclass import CharClass
+
+
+class NFAArrays:
+    """NFA的结构数组 (CSR) 存储
+
+    状态 i 的出边为下标 offsets[i]..offsets[i+1] 的边, 第 e 条边的符号为
+    symbols[labels[e]] (字符或字符类, labels[e] == -1 表示 epsilon), 目标状态为 targets[e]。
+    """
+
+    __slots__ = ("accept", "labels", "offsets", "start", "symbols", "targets")
+
+    def __init__(
+        self,
+        symbols: list[str | CharClass],
+        offsets: array,
+        labels: array,
+        targets: array,
+        start: int,
+        accept: int,
+    ):
+        self.symbols: list[str | CharClass] = symbols
+        self.offsets: array = offsets
+        self.labels: array = labels
+        self.targets: array = targets
+        self.start: int = start
+        self.accept: int = accept  # 无接受状态时为 -1
+
+    @property
+    def num_states(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    def edges(self, state: int):
+        """依次产生状态 state 的出边 (符号, 目标), 符号 None 表示 epsilon"""
+        symbols = self.symbols
+        for e in range(self.offsets[state], self.offsets[state + 1]):
+            label = self.labels[e]
+            yield (symbols[label] if label >= 0 else None), self.targets[e]
+
+    def __repr__(self):
+        return f"NFAArrays(states={self.num_states}, edges={self.num_edges})"
@@ -0,0 +1,131 @@
+import codecs
+import mmap
+import os
+from collections.abc import Iterator
+
+from lab2.compiled import CompiledDFA
+
+# 读取文件时每次送入匹配器的字节数
+CHUNK_SIZE = 1 << 20
+
+
+class StreamMatcher:
+    """可恢复的流式匹配器, 分块读入输入, 块与块之间只保存当前状态
+
+    search=True 时使用 CompiledDFA.unanchored() 的单趟表, feed 返回在本块内结束的
+    所有匹配的结束偏移 (含空匹配); search=False 时为锚定匹配, 返回被接受的前缀的结束偏移,
+    进入死状态后不再扫描。偏移从流的开头算起, 字符模式以字符 (码点) 计,
+    bytes 输入按 encoding 增量解码, 跨块截断的多字节字符会在下一块补齐;
+    字节模式 (CompiledDFA.byte_mode) 以字节计, bytes 输入不经解码直接扫描。
+    """
+
+    def __init__(
+        self, compiled: CompiledDFA, search: bool = True, encoding: str = "utf-8"
+    ):
+        self.compiled: CompiledDFA = compiled.unanchored() if search else compiled
+        self.search: bool = search
+        self.encoding: str = encoding
+        self._stride = self.compiled.num_classes
+        # 预乘行宽的转移表与按状态的接受表, 扫描时只做一次取值
+        stride = self._stride
+        self._table = [
+            target * stride if target >= 0 else -1 for target in self.compiled.table
+        ]
+        # 以预乘后的行首下标索引的接受标记
+        self._accepting = bytearray(len(self._table))
+        for state in range(self.compiled.num_states):
+            if self.compiled.is_accept(state):
+                self._accepting[state * stride] = 1
+        self.reset()
+
+    def reset(self):
+        """回到流的开头"""
+        self._state = self.compiled.start * self._stride
+        self._offset = 0
+        self._pending_start = True  # 起始状态的空匹配尚未报告
+        self._decoder = codecs.getincrementaldecoder(self.encoding)()
+
+    @property
+    def offset(self) -> int:
+        """已消耗的字符数"""
+        return self._offset
+
+    @property
+    def dead(self) -> bool:
+        """锚定匹配是否已进入死状态, 此后的输入不可能再产生匹配"""
+        return self._state < 0
+
+    def feed(self, chunk: str | bytes | bytearray | memoryview) -> list[int]:
+        """送入一块输入, 返回在本块内结束的匹配的结束偏移"""
+        if self.compiled.byte_mode:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+        elif not isinstance(chunk, str):
+            chunk = self._decoder.decode(chunk)
+        return self._scan(chunk)
+
+    def finish(self) -> bool:
+        """结束输入, 返回整个流 (锚定) 或流的末尾 (搜索) 是否处于接受状态
+
+        bytes 输入的末尾若是不完整的字符会抛出 UnicodeDecodeError。之后匹配器回到开头。
+        """
+        tail = self._decoder.decode(b"", final=True)
+        if tail:
+            self._scan(tail)
+        accepted = self._state >= 0 and self._accepting[self._state] == 1
+        self.reset()
+        return accepted
+
+    def _scan(self, text: str | bytes | bytearray | memoryview) -> list[int]:
+        accepting = self._accepting
+        ends: list[int] = []
+        state = self._state
+        offset = self._offset
+        if self._pending_start:
+            self._pending_start = False
+            if accepting[state]:
+                ends.append(offset)
+        if state < 0:
+            self._offset = offset + len(text)
+            return ends
+        table = self._table
+        for cls in self.compiled.symbol_classes(text):
+            state = table[state + cls]
+            offset += 1
+            if state < 0:
+                break
+            if accepting[state]:
+                ends.append(offset)
+        self._state = state
+        self._offset = self._offset + len(text)
+        return ends
+
+    def scan_file(
+        self, path: str | os.PathLike, chunk_size: int = CHUNK_SIZE
+    ) -> Iterator[int]:
+        """从头扫描文件, 逐个产出匹配的结束偏移
+
+        普通文件用只读 mmap 按块切片送入, 无法映射的 (空文件、管道等) 则用可复用的缓冲区
+        readinto 读取; 两种方式都不按行切分, 不为每行创建对象。
+        """
+        self.reset()
+        with open(path, "rb") as file:
+            try:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                mapped = None
+            if mapped is not None:
+                with mapped, memoryview(mapped) as view:
+                    for begin in range(0, len(view), chunk_size):
+                        yield from self.feed(view[begin : begin + chunk_size])
+            else:
+                buffer = bytearray(chunk_size)
+                with memoryview(buffer) as view:
+                    while size := file.readinto(buffer):
+                        yield from self.feed(view[:size])
+        yield from self._scan(self._decoder.decode(b"", final=True))
+        self.reset()
+
+    def __repr__(self):
+        mode = "search" if self.search else "anchored"
+        return f"StreamMatcher({mode}, offset={self._offset})"
@@ -0,0 +1,192 @@
+from abc import ABC, abstractmethod
+
+from lab2.charclass import CharClass
+
+
+class Node(ABC):
+    """正规表达式语法树结点
+
+    结点构造后不再修改, 按结构比较相等, 哈希值在构造时由子结点的哈希值算出。
+    """
+
+    __slots__ = ("_hash",)
+    _hash: int
+
+    @abstractmethod
+    def _key(self) -> tuple: ...
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        return (
+            type(self) is type(other)
+            and self._hash == other._hash
+            and self._key() == other._key()
+        )
+
+    def __hash__(self):
+        return self._hash
+
+
+class Empty(Node):
+    """空串 ε, 如 (a|) 中的空分支"""
+
+    __slots__ = ()
+
+    def __init__(self):
+        self._hash = hash(Empty)
+
+    def _key(self) -> tuple:
+        return ()
+
+    def __repr__(self):
+        return "Empty()"
+
+
+class Symbol(Node):
+    """单个字符或字符类"""
+
+    __slots__ = ("char",)
+
+    def __init__(self, char: str | CharClass):
+        self.char = char
+        self._hash = hash((Symbol, char))
+
+    def _key(self) -> tuple:
+        return (self.char,)
+
+    def __repr__(self):
+        return f"Symbol({self.char!r})"
+
+
+class Concat(Node):
+    """连接: items[0] items[1] ..."""
+
+    __slots__ = ("items",)
+
+    def __init__(self, *items: Node):
+        self.items: tuple[Node, ...] = items
+        self._hash = hash((Concat, items))
+
+    def _key(self) -> tuple:
+        return self.items
+
+    def __repr__(self):
+        return f"Concat({', '.join(map(repr, self.items))})"
+
+
+class Union(Node):
+    """并联: items[0] | items[1] | ..."""
+
+    __slots__ = ("items",)
+
+    def __init__(self, *items: Node):
+        self.items: tuple[Node, ...] = items
+        self._hash = hash((Union, items))
+
+    def _key(self) -> tuple:
+        return self.items
+
+    def __repr__(self):
+        return f"Union({', '.join(map(repr, self.items))})"
+
+
+class Star(Node):
+    """闭包: child*"""
+
+    __slots__ = ("child",)
+
+    def __init__(self, child: Node):
+        self.child = child
+        self._hash = hash((Star, child))
+
+    def _key(self) -> tuple:
+        return (self.child,)
+
+    def __repr__(self):
+        return f"Star({self.child!r})"
+
+
+class Plus(Node):
+    """正闭包: child+"""
+
+    __slots__ = ("child",)
+
+    def __init__(self, child: Node):
+        self.child = child
+        self._hash = hash((Plus, child))
+
+    def _key(self) -> tuple:
+        return (self.child,)
+
+    def __repr__(self):
+        return f"Plus({self.child!r})"
+
+
+class Question(Node):
+    """可选: child?"""
+
+    __slots__ = ("child",)
+
+    def __init__(self, child: Node):
+        self.child = child
+        self._hash = hash((Question, child))
+
+    def _key(self) -> tuple:
+        return (self.child,)
+
+    def __repr__(self):
+        return f"Question({self.child!r})"
+
+
+class Group(Node):
+    """捕获组: (child), index 为其左括号在模式中的序号, 从 1 开始"""
+
+    __slots__ = ("child", "index")
+
+    def __init__(self, child: Node, index: int):
+        self.child = child
+        self.index = index
+        self._hash = hash((Group, child, index))
+
+    def _key(self) -> tuple:
+        return (self.child, self.index)
+
+    def __repr__(self):
+        return f"Group({self.child!r}, {self.index})"
+
+
+class Repeat(Node):
+    """有界重复: child{low,high}, high 为 None 表示无上界"""
+
+    __slots__ = ("child", "high", "low")
+
+    def __init__(self, child: Node, low: int, high: int | None):
+        self.child = child
+        self.low = low
+        self.high = high
+        self._hash = hash((Repeat, child, low, high))
+
+    def _key(self) -> tuple:
+        return (self.child, self.low, self.high)
+
+    def expand(self) -> Node:
+        """展开为连接、闭包与可选的组合, 各份共享同一子树; {0,0} 展开为空串"""
+        child = self.child
+        parts: list[Node] = [child] * self.low
+        if self.high is None:
+            parts.append(Star(child))
+        else:
+            optional: Node | None = None
+            for _ in range(self.high - self.low):
+                optional = Question(
+                    child if optional is None else Concat(child, optional)
+                )
+            if optional is not None:
+                parts.append(optional)
+        if not parts:
+            return Empty()
+        return parts[0] if len(parts) == 1 else Concat(*parts)
+
+    def __repr__(self):
+        return f"Repeat({self.child!r}, {self.low}, {self.high})"
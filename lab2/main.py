@@ -1,6 +1,7 @@
 import os
 
-from lab2 import DFA, Regex
+from lab2 import DFA, NFA, Regex
+from lab2.export import render_many
 
 
 def replace_char_to_fw(text: str) -> str:
@@ -33,6 +34,7 @@ def main():
         "(a|b)*abb",
     ]
     strings = ["ab", "abc", "abcc", "c", "abbbbb", "abab", "bababababaaa"]
+    render_jobs: list[tuple[NFA | DFA, str]] = []
 
     for pattern in patterns:
         regex = Regex(pattern)
@@ -40,21 +42,26 @@ def main():
         nfa = regex.to_nfa()
         dfa = DFA(nfa)
         mini_dfa = dfa.minimize()
-        os.makedirs("result", exist_ok=True)
-        nfa.visualize("result/nfa_" + replace_char_to_fw(pattern))
-        dfa.visualize("result/dfa_" + replace_char_to_fw(pattern))
-        mini_dfa.visualize("result/dfa_minimize_" + replace_char_to_fw(pattern))
-        for string in strings:
+        name = replace_char_to_fw(pattern)
+        render_jobs.append((nfa, "result/nfa_" + name))
+        render_jobs.append((dfa, "result/dfa_" + name))
+        render_jobs.append((mini_dfa, "result/dfa_minimize_" + name))
+        batch_results = mini_dfa.match_many(strings)
+        for string, batch_result in zip(strings, batch_results):
             nfa_result = nfa.simulate(string)
             dfa_result = dfa.simulate(string)
             mini_dfa_result = mini_dfa.simulate(string)
             assert nfa_result == dfa_result
             assert mini_dfa_result == dfa_result
+            assert batch_result == dfa_result
             if nfa_result:
                 print(f"Matched: {string}")
             else:
                 print(f"Unmatched: {string}")
 
+    os.makedirs("result", exist_ok=True)
+    render_many(render_jobs)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,17 @@
+from tests.test_bitnfa import *
+from tests.test_bytes import *
+from tests.test_cache import *
+from tests.test_compiled import *
+from tests.test_dfa import *
+from tests.test_direct import *
+from tests.test_export import *
+from tests.test_lazy import *
+from tests.test_lexer import *
+from tests.test_literals import *
+from tests.test_parser import *
+from tests.test_pike import *
+from tests.test_reduce import *
+from tests.test_regex import *
+from tests.test_regexset import *
+from tests.test_state import *
+from tests.test_stream import *
@@ -0,0 +1,37 @@
+import pytest
+
+from lab2 import DFA, NFA, Regex, State
+from tests.test_compiled import PATTERNS, STRINGS
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_bitset_agrees_with_simulate(pattern):
+    nfa = Regex(pattern).to_nfa()
+    bitset = nfa.to_bitset()
+    compiled = DFA(nfa).compile()
+    for string in STRINGS:
+        assert bitset.fullmatch(string) == nfa.simulate(string)
+        assert bitset.match(string) == compiled.match(string)
+        assert bitset.search(string) == compiled.search(string)
+
+
+def test_epsilon_cycle_closure():
+    # S0 -ε-> S1 -ε-> S2 -ε-> S0 构成环, 且 S2 -a-> S3
+    states = [State() for _ in range(4)]
+    states[0].add_transition(None, states[1])
+    states[1].add_transition(None, states[2])
+    states[2].add_transition(None, states[0])
+    states[2].add_transition("a", states[3])
+    bitset = NFA(states).to_bitset()
+    assert bitset.closures[:3] == [0b111] * 3
+    assert bitset.closures[3] == 0b1000
+    assert bitset.fullmatch("a")
+    assert not bitset.fullmatch("")
+
+
+def test_long_input_on_large_nfa():
+    pattern = "(a|b)*a" + "(a|b)" * 60
+    bitset = Regex(pattern, simplify=False).to_nfa().to_bitset()
+    assert bitset.num_states > 300
+    assert bitset.fullmatch("ab" * 2000 + "a" + "b" * 60)
+    assert not bitset.fullmatch("ab" * 2000 + "b" * 61)
@@ -0,0 +1,91 @@
+import pytest
+
+import lab2
+from lab2 import DFA, Regex, StreamMatcher
+from lab2.compiled import CompiledDFA
+from tests.test_compiled import PATTERNS, STRINGS
+
+UNICODE_PATTERNS = ["中(文|字)*", "(é|e)+a", "a(ß|ss)?b", "😀|😃+"]
+UNICODE_STRINGS = [
+    "中",
+    "中文字",
+    "éea",
+    "eéa",
+    "ab",
+    "aßb",
+    "assb",
+    "😀",
+    "😃😃",
+    "中x",
+]
+
+
+def byte_dfa(pattern: str) -> DFA:
+    return DFA(Regex(pattern).to_nfa().to_utf8()).minimize()
+
+
+@pytest.mark.parametrize("pattern", PATTERNS + UNICODE_PATTERNS)
+def test_byte_mode_agrees_with_characters(pattern):
+    char_dfa = DFA(Regex(pattern).to_nfa()).minimize()
+    compiled = byte_dfa(pattern).compile(byte_mode=True)
+    assert compiled.byte_mode
+    for string in STRINGS + UNICODE_STRINGS:
+        data = string.encode("utf-8")
+        expected = char_dfa.simulate(string)
+        assert compiled.fullmatch(data) == expected
+        assert compiled.fullmatch(memoryview(data)) == expected
+        assert compiled.fullmatch(string) == expected  # str 先编码为 UTF-8
+        assert compiled.search(data) == char_dfa.compile().search(string)
+
+
+def test_byte_classes_are_compressed():
+    compiled = byte_dfa("(中|文)+").compile(byte_mode=True)
+    byte_classes = compiled.byte_classes
+    assert byte_classes is not None and len(byte_classes) == 256
+    # 中 = e4 b8 ad, 文 = e6 96 87: 两个首字节不同, 其余字节各自成类
+    assert compiled.num_classes <= 8
+    assert byte_classes[0x00] == byte_classes[0xFF] == 0
+    assert byte_classes[0xE4] != 0 and byte_classes[0xE6] != 0
+    assert compiled.fullmatch("中文中".encode())
+    assert not compiled.fullmatch("中".encode()[:2])
+
+
+def test_character_mode_rejects_bytes():
+    compiled = DFA(Regex("ab").to_nfa()).compile()
+    with pytest.raises(TypeError):
+        compiled.fullmatch(b"ab")
+    with pytest.raises(ValueError):
+        DFA(Regex("中").to_nfa()).compile(byte_mode=True)
+
+
+def test_byte_mode_serialization_and_cache(tmp_path):
+    compiled = lab2.compile("中(文|字)*", byte_mode=True)
+    assert compiled is lab2.compile("中(文|字)*", byte_mode=True)
+    assert compiled is not lab2.compile("中(文|字)*")
+    loaded = CompiledDFA.from_buffer(compiled.to_bytes())
+    assert loaded.byte_mode
+    assert loaded.byte_classes == compiled.byte_classes
+    assert loaded.fullmatch("中字文".encode())
+    cached = lab2.load_or_compile("a|中", tmp_path, byte_mode=True)
+    assert cached.byte_mode
+    assert lab2.load_or_compile("a|中", tmp_path, byte_mode=True).fullmatch(b"a")
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_byte_mode_match_many(backend):
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    compiled = byte_dfa("(é|e)+a").compile(byte_mode=True)
+    strings = [string.encode("utf-8") for string in UNICODE_STRINGS] + ["éa"]
+    result = compiled.match_many(strings, backend=backend)
+    assert list(result) == [compiled.fullmatch(string) for string in strings]
+
+
+def test_stream_byte_offsets():
+    matcher = StreamMatcher(byte_dfa("中").compile(byte_mode=True))
+    data = "a中b中".encode()
+    ends = []
+    for i in range(len(data)):
+        ends.extend(matcher.feed(data[i : i + 1]))
+    assert ends == [4, 8]
+    assert matcher.finish()
@@ -0,0 +1,84 @@
+import pytest
+
+import lab2
+from lab2 import DFA, Regex, load_or_compile
+from lab2.cache import CompileCache, pattern_key
+from lab2.compiled import CompiledDFA
+from tests.test_compiled import PATTERNS, STRINGS
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_serialization_round_trip(pattern):
+    compiled = DFA(Regex(pattern).to_nfa()).minimize().compile()
+    loaded = CompiledDFA.from_buffer(compiled.to_bytes())
+    assert loaded.num_states == compiled.num_states
+    assert loaded.classes == compiled.classes
+    assert list(loaded.table) == list(compiled.table)
+    for string in STRINGS:
+        assert loaded.fullmatch(string) == compiled.fullmatch(string)
+        assert loaded.search(string) == compiled.search(string)
+
+
+def test_from_buffer_rejects_garbage():
+    with pytest.raises(ValueError):
+        CompiledDFA.from_buffer(b"not a dfa")
+    data = bytearray(DFA(Regex("ab").to_nfa()).compile().to_bytes())
+    data[8] = 99  # 格式版本
+    with pytest.raises(ValueError):
+        CompiledDFA.from_buffer(bytes(data))
+
+
+def test_load_or_compile_uses_cache(tmp_path):
+    cold = load_or_compile("(a|b)*abb", tmp_path)
+    files = list(tmp_path.iterdir())
+    assert len(files) == 1
+    assert files[0].name == pattern_key("(a|b)*abb") + ".dfa"
+
+    warm = load_or_compile("(a|b)*abb", tmp_path)
+    # 热启动时转移表直接引用映射的文件
+    assert isinstance(warm._table, memoryview)
+    for string in STRINGS + ["babb", "aabb"]:
+        assert warm.fullmatch(string) == cold.fullmatch(string)
+
+
+def test_load_or_compile_recovers_from_corruption(tmp_path):
+    path = tmp_path / (pattern_key("ab") + ".dfa")
+    path.write_bytes(b"garbage")
+    compiled = load_or_compile("ab", tmp_path)
+    assert compiled.fullmatch("ab")
+    assert CompiledDFA.from_buffer(path.read_bytes()).fullmatch("ab")
+
+
+def test_pattern_key_distinguishes_options():
+    assert pattern_key("ab") == pattern_key("ab")
+    assert pattern_key("ab") != pattern_key("a|b")
+    assert pattern_key("ab") != pattern_key("ab", minimize=False)
+
+
+def test_compile_memoizes():
+    compile = CompileCache(maxsize=2)
+    first = compile("(a|b)*abb")
+    assert compile("(a|b)*abb") is first
+    assert compile("(a|b)*abb", minimize=False) is not first
+    assert compile.cache_info() == (1, 2, 2, 2)
+    compile("ab")
+    # 最久未使用的 (a|b)*abb 被淘汰
+    assert compile.cache_info().currsize == 2
+    assert compile("(a|b)*abb") is not first
+    compile.set_maxsize(1)
+    assert compile.cache_info().currsize == 1
+    compile.cache_clear()
+    assert compile.cache_info() == (0, 0, 1, 0)
+
+
+def test_compile_front_of_disk_cache(tmp_path):
+    compile = CompileCache()
+    compiled = compile("b(a|b)*aa", cache_dir=tmp_path)
+    assert compiled.fullmatch("baa")
+    assert len(list(tmp_path.iterdir())) == 1
+    assert compile("b(a|b)*aa", cache_dir=tmp_path) is compiled
+
+
+def test_module_level_compile():
+    assert lab2.compile("a(b|c)") is lab2.compile("a(b|c)")
+    assert lab2.compile("a(b|c)").fullmatch("ac")
@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from lab2 import DFA, Regex
+
+PATTERNS = [
+    "ab",
+    "a|c",
+    "a(b|c)",
+    "(a|b)*",
+    "(a|b)+",
+    "ab+c?",
+    "(ab)*|c+",
+    "b(a|b)*aa",
+    "(a|b)*abb",
+]
+STRINGS = ["", "ab", "abc", "abcc", "c", "abbbbb", "abab", "bababababaaa", "xab"]
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_compiled_fullmatch_agrees_with_simulate(pattern):
+    dfa = DFA(Regex(pattern).to_nfa())
+    compiled = dfa.compile()
+    mini_compiled = dfa.minimize().compile()
+    for string in STRINGS:
+        assert compiled.fullmatch(string) == dfa.simulate(string)
+        assert mini_compiled.fullmatch(string) == dfa.simulate(string)
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_compiled_match_and_search(pattern):
+    dfa = DFA(Regex(pattern).to_nfa())
+    compiled = dfa.minimize().compile()
+    for string in STRINGS:
+        prefixes = [string[:i] for i in range(len(string) + 1)]
+        substrings = [
+            string[i:j]
+            for i in range(len(string) + 1)
+            for j in range(i, len(string) + 1)
+        ]
+        assert compiled.match(string) == any(map(dfa.simulate, prefixes))
+        assert compiled.search(string) == any(map(dfa.simulate, substrings))
+
+
+@pytest.mark.parametrize("pattern", ["(a|b)*a(a|b){3}c", "[a-c]+x?", "(é|a)*b"])
+def test_compiled_row_paths_agree(pattern):
+    # 字典行 (纯字符)、预乘行宽的转移列表 (字符类区间) 与字节模式三条路径
+    dfa = DFA(Regex(pattern).to_nfa()).minimize()
+    compiled = dfa.compile()
+    byte_compiled = DFA(Regex(pattern).to_nfa().to_utf8()).minimize().compile(True)
+    rng = random.Random(pattern)
+    for _ in range(200):
+        string = "".join(rng.choice("abcxé") for _ in range(rng.randint(0, 8)))
+        prefixes = [string[:i] for i in range(len(string) + 1)]
+        expected_match = any(map(dfa.simulate, prefixes))
+        for matcher in (compiled, byte_compiled):
+            assert matcher.fullmatch(string) == dfa.simulate(string)
+            assert matcher.match(string) == expected_match
+    assert not compiled.is_accept(-1)
+    assert not compiled.is_accept(compiled.num_states)
+
+
+def test_compiled_layout():
+    compiled = DFA(Regex("(a|b)*abb").to_nfa()).minimize().compile()
+    assert compiled.num_states == 4
+    assert compiled.start == 0
+    # a 与 b 的转移列不同, 再加上保留的未知符号类
+    assert compiled.num_classes == 3
+    assert len(compiled.table) == compiled.num_states * compiled.num_classes
+    with pytest.raises(AttributeError):
+        compiled.start = 1  # type: ignore[misc]
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_match_many(backend):
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    dfa = DFA(Regex("b(a|b)*aa").to_nfa()).minimize()
+    strings = STRINGS + ["baa", "bbaa", "bäaa", "b" * 40 + "aa", "baaé"]
+    result = dfa.compile().match_many(strings, backend=backend)
+    assert list(result) == [dfa.simulate(string) for string in strings]
+
+
+def test_match_many_without_numpy(monkeypatch):
+    import lab2.compiled
+
+    monkeypatch.setattr(lab2.compiled, "np", None)
+    dfa = DFA(Regex("a(b|c)").to_nfa())
+    assert dfa.match_many(["ab", "ac", "ad", ""]) == [True, True, False, False]
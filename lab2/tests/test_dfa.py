@@ -0,0 +1,88 @@
+import itertools
+import random
+
+import pytest
+
+from lab2 import DFA, DFAState, Regex
+
+
+def random_dfa(num_states: int, alphabet: str, seed: int) -> DFA:
+    rng = random.Random(seed)
+    dfa = DFA()
+    states = [DFAState() for _ in range(num_states)]
+    for state in states:
+        dfa.add_state(state, rng.random() < 0.3)
+        for char in alphabet:
+            if rng.random() < 0.9:
+                state.add_transition(char, rng.choice(states))
+    dfa.set_start_state(states[0])
+    return dfa
+
+
+def moore_state_count(dfa: DFA, alphabet: str) -> int:
+    """朴素的 Moore 划分细化, 返回删去死状态后的最小DFA状态数"""
+    assert dfa.start_state is not None
+    reachable = [dfa.start_state]
+    for state in reachable:
+        for target in state.transitions.values():
+            if target not in reachable:
+                reachable.append(target)
+    dead = None
+    states = reachable + [dead]
+
+    def step(state, char):
+        return None if state is None else state.transitions.get(char)
+
+    label = {state: int(state in dfa.accept_states) for state in states}
+    while True:
+        signature = {
+            state: (label[state],) + tuple(label[step(state, c)] for c in alphabet)
+            for state in states
+        }
+        ids = {sig: i for i, sig in enumerate(dict.fromkeys(signature.values()))}
+        new_label = {state: ids[signature[state]] for state in states}
+        if len(set(new_label.values())) == len(set(label.values())):
+            break
+        label = new_label
+    classes = set(label.values())
+    if label[dead] != label[dfa.start_state]:
+        classes.discard(label[dead])
+    return len(classes)
+
+
+def all_strings(alphabet: str, max_len: int):
+    for length in range(max_len + 1):
+        for chars in itertools.product(alphabet, repeat=length):
+            yield "".join(chars)
+
+
+@pytest.mark.parametrize(
+    "pattern, expected",
+    [("ab", 3), ("a|c", 2), ("(a|b)*", 1), ("(a|b)*abb", 4), ("b(a|b)*aa", 4)],
+)
+def test_minimize_state_count(pattern, expected):
+    dfa = DFA(Regex(pattern).to_nfa()).minimize()
+    assert len(dfa.states) == expected
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_minimize_random_dfa(seed):
+    dfa = random_dfa(30, "ab", seed)
+    minimized = dfa.minimize()
+    for string in all_strings("ab", 7):
+        assert minimized.simulate(string) == dfa.simulate(string)
+    assert len(minimized.states) == moore_state_count(dfa, "ab")
+    assert len(minimized.minimize().states) == len(minimized.states)
+
+
+def test_minimize_empty_language():
+    dfa = DFA()
+    start, other = DFAState(), DFAState()
+    dfa.add_state(start)
+    dfa.add_state(other)
+    dfa.set_start_state(start)
+    start.add_transition("a", other)
+    minimized = dfa.minimize()
+    assert len(minimized.states) == 1
+    assert not minimized.accept_states
+    assert not minimized.simulate("a")
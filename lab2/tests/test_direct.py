@@ -0,0 +1,30 @@
+import itertools
+
+import pytest
+
+from lab2 import DFA, Regex
+from tests.test_compiled import PATTERNS
+
+EXTRA_PATTERNS = ["a?", "(a|b)?c", "(a*)*", "((a|b)?)+", "(a|b)*a(a|b)(a|b)"]
+
+
+def all_strings(alphabet: str, max_len: int):
+    for length in range(max_len + 1):
+        for chars in itertools.product(alphabet, repeat=length):
+            yield "".join(chars)
+
+
+@pytest.mark.parametrize("pattern", PATTERNS + EXTRA_PATTERNS)
+def test_direct_dfa_matches_pipeline(pattern):
+    regex = Regex(pattern)
+    pipeline = DFA(regex.to_nfa()).minimize()
+    direct = regex.to_dfa_direct()
+    for string in all_strings("abc", 6):
+        assert direct.simulate(string) == pipeline.simulate(string), string
+    assert len(direct.minimize().states) == len(pipeline.states)
+
+
+def test_direct_dfa_is_small():
+    regex = Regex("(a|b)*abb")
+    # followpos 构造本身即得到最小DFA
+    assert len(regex.to_dfa_direct().states) == 4
@@ -0,0 +1,41 @@
+import subprocess
+import sys
+
+from lab2 import DFA, Regex
+from lab2.export import to_dot, write_dot
+
+
+def test_nfa_dot_has_epsilon_and_accept():
+    nfa = Regex("a|b", simplify=False).to_nfa()
+    source = to_dot(nfa)
+    assert source.startswith('digraph "G" {')
+    assert "ε" in source
+    assert source.count("doublecircle") == 1
+    assert f'"" -> "{nfa.start_state}"' in source
+
+
+def test_dfa_dot_edges(tmp_path):
+    dfa = DFA(Regex("(a|b)*abb").to_nfa()).minimize()
+    source = to_dot(dfa)
+    edges = sum(len(state.transitions) for state in dfa.states)
+    assert source.count("[label=") == edges + 1  # 外加 start 箭头
+    assert source.count("doublecircle") == len(dfa.accept_states)
+    path = tmp_path / "dfa.gv"
+    write_dot(dfa, str(path))
+    assert path.read_text(encoding="utf-8") == source
+
+
+def test_char_class_label():
+    source = to_dot(Regex("x|y|z").to_nfa())
+    assert '[label="[x-z]"]' in source
+
+
+def test_import_does_not_load_graphviz():
+    code = (
+        "import sys, lab2; lab2.Regex('(a|b)+').to_nfa(); "
+        "print('graphviz' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
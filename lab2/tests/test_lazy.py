@@ -0,0 +1,41 @@
+import pytest
+
+from lab2 import DFA, LazyDFA, Regex
+from tests.test_compiled import PATTERNS, STRINGS
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_lazy_agrees_with_compiled(pattern):
+    nfa = Regex(pattern).to_nfa()
+    lazy = LazyDFA(nfa)
+    compiled = DFA(nfa).compile()
+    for string in STRINGS:
+        assert lazy.fullmatch(string) == compiled.fullmatch(string)
+        assert lazy.match(string) == compiled.match(string)
+        assert lazy.search(string) == compiled.search(string)
+
+
+def test_lazy_materializes_only_reached_states():
+    # 完整子集构造会产生 2^13 个状态
+    lazy = LazyDFA(Regex("(a|b)*a" + "(a|b)" * 12).to_nfa())
+    assert lazy.fullmatch("aaaaaaaaaaaaa")
+    assert not lazy.fullmatch("bbbbbbbbbbbbb")
+    # 起始状态、读 a 途经的 13 个状态以及读 b 后的自环状态
+    assert lazy.cache_info()[:3] == (11, 15, 0)
+    assert lazy.cache_info().currsize == 15
+    assert lazy.fullmatch("aaaaaaaaaaaaa")
+    assert lazy.cache_info().hits == 11 + 13
+
+
+def test_lazy_thrash_falls_back_to_nfa():
+    pattern = "(a|b)*a" + "(a|b)" * 12
+    nfa = Regex(pattern).to_nfa()
+    lazy = LazyDFA(nfa, max_states=4, min_chars_per_state=10)
+    compiled = DFA(nfa).compile()
+    text = "abbabaabbbaababbbaaabab" * 20
+    for end in (len(text), len(text) - 3):
+        assert lazy.fullmatch(text[:end]) == compiled.fullmatch(text[:end])
+    info = lazy.cache_info()
+    assert info.flushes >= 1
+    assert info.fallbacks >= 1
+    assert info.currsize <= 4
@@ -0,0 +1,77 @@
+import random
+
+import pytest
+
+from lab2 import Lexer, LexError, Token
+
+RULES = [
+    ("if", "if"),
+    ("id", r"[A-Za-z_]\w*"),
+    ("num", r"\d+(\.\d+)?"),
+    ("ge", ">="),
+    ("gt", ">"),
+    ("assign", "="),
+    ("eq", "=="),
+    ("ws", r"\s+"),
+]
+
+
+@pytest.fixture(scope="module")
+def lexer():
+    return Lexer(RULES, skip={"ws"})
+
+
+def test_maximal_munch_and_priority(lexer):
+    tokens = list(lexer.tokenize("if iffy>=3.25 == x>y"))
+    assert [(t.kind, t.lexeme) for t in tokens] == [
+        ("if", "if"),
+        ("id", "iffy"),
+        ("ge", ">="),
+        ("num", "3.25"),
+        ("eq", "=="),
+        ("id", "x"),
+        ("gt", ">"),
+        ("id", "y"),
+    ]
+    assert tokens[1] == Token("id", "iffy", 3)
+
+
+def test_error_reports_offset(lexer):
+    tokens = lexer.tokenize("x = 1 ? 2")
+    assert next(tokens) == ("id", "x", 0)
+    with pytest.raises(LexError) as info:
+        list(tokens)
+    assert info.value.offset == 6 and info.value.char == "?"
+
+
+def test_stream_matches_tokenize(lexer):
+    rng = random.Random(20)
+    text = "if x>=10 then y == 3.5\n  iffy = x_1 > 2.0 " * 20
+    expected = list(lexer.tokenize(text))
+    for _ in range(30):
+        cuts = sorted(rng.sample(range(1, len(text)), rng.randint(1, 40)))
+        chunks = [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+        assert list(lexer.stream(chunks)) == expected
+
+
+def test_stream_long_token_in_small_chunks(lexer):
+    text = "x = " + "y" * 5000 + " >= 12" + " " * 3000 + "z"
+    chunks = [text[i : i + 7] for i in range(0, len(text), 7)]
+
+    tokens = list(lexer.stream(chunks))
+    assert tokens == list(lexer.tokenize(text))
+    assert tokens[2] == Token("id", "y" * 5000, 4)
+    assert tokens[-1] == Token("id", "z", len(text) - 1)
+
+
+def test_tokens_are_lazy(lexer):
+    tokens = lexer.stream(iter(["x ", "y ", "?"]))
+    assert next(tokens).lexeme == "x"
+    assert next(tokens).lexeme == "y"
+    with pytest.raises(LexError):
+        next(tokens)
+
+
+def test_empty_token_is_rejected():
+    with pytest.raises(ValueError):
+        Lexer([("blank", "a*")])
@@ -0,0 +1,117 @@
+import random
+import re
+
+import pytest
+
+from lab2 import AhoCorasick, PikeVM, Prefilter, Regex
+
+LITERAL_PATTERNS = [
+    "abc",
+    "b(a|b)*aa",
+    "hello(world|there)",
+    r"\d{3}-\d{4}",
+    "(ab|cd)+e",
+    "x[a-c]+y",
+    "colou?r",
+    "(foo|bar|baz|qux|quux)!",
+    "a.{2}b",
+    "[ab]+ba",
+]
+
+
+def test_exact_language():
+    assert Regex("colou?r").literals().exact == {"color", "colour"}
+    assert Regex("[ab]c").literals().exact == {"ac", "bc"}
+    assert Regex("a{3}").literals().exact == {"aaa"}
+    assert Regex("a*").literals().exact is None
+
+
+def test_prefixes_suffixes_and_factors():
+    info = Regex("b(a|b)*aa").literals()
+    assert info.prefixes == {"b"} and info.suffixes == {"aa"}
+    assert info.factors == {"aa"}
+    assert (info.min_len, info.max_len) == (3, None)
+
+    info = Regex("(foo|bar)baz+qux").literals()
+    assert info.prefixes == {"foobaz", "barbaz"}
+    assert info.suffixes == {"zqux"}
+
+    info = Regex(r"[a-z]+ing").literals()
+    assert info.prefixes == {""} and info.factors == {"ing"}
+
+    info = Regex(r"\d{3}-\d{4}").literals()
+    assert info.factors == {"-"}
+    assert (info.min_len, info.max_len) == (8, 8)
+
+
+def test_nullable_pattern_has_no_literals():
+    info = Regex("(abc)?").literals()
+    assert info.prefixes == {""} and info.factors == {""}
+    assert Prefilter.build(info.prefixes) is None
+
+
+def test_aho_corasick_finds_leftmost_occurrence():
+    rng = random.Random(19)
+    for _ in range(300):
+        words = {
+            "".join(rng.choice("abc") for _ in range(rng.randint(1, 4)))
+            for _ in range(rng.randint(1, 6))
+        }
+        text = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 20)))
+        pos = rng.randint(0, len(text))
+        occurrences = [
+            (i, i + len(word))
+            for word in words
+            for i in range(pos, len(text) - len(word) + 1)
+            if text.startswith(word, i)
+        ]
+        # 起点最靠左, 起点相同时最长
+        expected = min(occurrences, key=lambda o: (o[0], -o[1]), default=None)
+        assert AhoCorasick(words).find(text, pos) == expected, (words, text, pos)
+
+
+def test_prefilter_respects_end():
+    # 重叠的字面量: 找到 b 之后缩小的查找范围不能越过 end
+    assert Prefilter(["b", "bb"]).find("bb", 0, 1) == (0, 1)
+    assert Prefilter(["b", "bb"]).find(b"bb", 0, 1) == (0, 1)
+
+    rng = random.Random(19)
+    for _ in range(300):
+        words = sorted(
+            {
+                "".join(rng.choice("ab") for _ in range(rng.randint(1, 3)))
+                for _ in range(rng.randint(1, 4))
+            }
+        )
+        text = "".join(rng.choice("abc") for _ in range(rng.randint(0, 12)))
+        pos = rng.randint(0, len(text))
+        end = rng.randint(pos, len(text))
+        expected = AhoCorasick(words).find(text, pos, end)
+        assert Prefilter(words).find(text, pos, end) == expected, (words, text, end)
+
+
+def test_prefilter_on_bytes():
+    prefilter = Prefilter(["é", "fox", "dog", "cat", "emu"])
+    assert prefilter.find("a fox") == (2, 5)
+    assert prefilter.find("café".encode()) == (3, 5)
+    assert Prefilter(["fox"]).find(b"the fox", 5) is None
+
+
+@pytest.mark.parametrize("pattern", LITERAL_PATTERNS)
+def test_prefilter_does_not_change_matches(pattern):
+    rng = random.Random(pattern)
+    plain = PikeVM(pattern, prefilter=False)
+    filtered = PikeVM(pattern)
+    compiled = re.compile(pattern)
+    for _ in range(200):
+        text = "".join(rng.choice("abcdexy0123-!r") for _ in range(rng.randint(0, 30)))
+        spans = [match.span() for match in filtered.finditer(text)]
+        assert spans == [match.span() for match in plain.finditer(text)], text
+        assert (filtered.search(text) is None) == (compiled.search(text) is None)
+
+
+def test_prefilter_rejects_without_scanning():
+    vm = PikeVM("[a-z]+ing")
+    assert vm.search("x" * 10000) is None
+    match = vm.search("y" * 100 + "sing")
+    assert match is not None and match.span() == (0, 104)
@@ -0,0 +1,141 @@
+import random
+import re
+
+import pytest
+
+from lab2 import DFA, Regex, RegexSyntaxError, parse
+from lab2.cache import pattern_key
+from lab2.charclass import CharClass
+from lab2.simplify import simplify
+from lab2.syntax import (
+    Concat,
+    Empty,
+    Group,
+    Plus,
+    Question,
+    Repeat,
+    Star,
+    Symbol,
+    Union,
+)
+from tests.test_direct import all_strings
+
+a, b, c = Symbol("a"), Symbol("b"), Symbol("c")
+
+
+def test_parse_builds_flat_tree():
+    assert parse("abc") == Concat(a, b, c)
+    assert parse("a|b|c") == Union(a, b, c)
+    assert parse("(ab)*c?") == Concat(Star(Group(Concat(a, b), 1)), Question(c))
+    assert parse("a{2,}|") == Union(Repeat(a, 2, None), Empty())
+    assert parse("()(a)") == Concat(Group(Empty(), 1), Group(a, 2))
+    assert parse("") == Empty()
+    assert parse("[a]+") == Plus(a)
+
+
+@pytest.mark.parametrize("pattern", ["a{²}", "a{1,٣}", "a{١}"])
+def test_non_ascii_digits_are_not_counts(pattern):
+    # 只有 ASCII 数字构成重复次数, 否则 { 作普通字符
+    literal = pattern[0] + "".join(f"[{char}]" for char in pattern[1:])
+    assert parse(pattern) == parse(literal)
+
+
+@pytest.mark.parametrize(
+    "pattern, position",
+    [
+        ("a)", 1),
+        ("(ab", 0),
+        ("*a", 0),
+        ("a|+", 2),
+        ("a**", 2),
+        ("a{2}?", 4),
+        ("[a-", 0),
+        ("x[z-a]", 2),
+        ("ab\\", 2),
+        ("\\q", 0),
+        ("a{3,1}", 1),
+    ],
+)
+def test_syntax_error_position(pattern, position):
+    with pytest.raises(RegexSyntaxError) as info:
+        parse(pattern)
+    assert info.value.position == position
+    assert isinstance(info.value, ValueError)
+
+
+@pytest.mark.parametrize(
+    "pattern, expected",
+    [
+        ("(a*)*", Star(a)),
+        ("(a+)*", Star(a)),
+        ("(a?)+", Star(a)),
+        ("(a+)?", Star(a)),
+        ("(a{0,3})*", Star(a)),
+        ("((a|b)?)+", Star(Symbol(CharClass.from_range("a", "b")))),
+        ("(a(bc))(a)", Concat(a, b, c, a)),
+        ("a|(b|c)|a", Symbol(CharClass.from_range("a", "c"))),
+        ("abc|abd", Concat(a, b, Symbol(CharClass.from_range("c", "d")))),
+        ("ab|a", Concat(a, Question(b))),
+        ("ab|ac|c", Union(Concat(a, Symbol(CharClass.from_range("b", "c"))), c)),
+        ("a|b|", Question(Symbol(CharClass.from_range("a", "b")))),
+        ("a{1}b{0,1}c{0,}", Concat(a, Question(b), Star(c))),
+        ("a{0}b", b),
+        ("(a|)*", Star(a)),
+    ],
+)
+def test_simplify(pattern, expected):
+    assert Regex(pattern).ast == expected
+
+
+def test_simplify_is_idempotent():
+    for pattern in ["(ab|ac)*d", "x(a|b|ab)?", "(a?b?)+"]:
+        tree = Regex(pattern).ast
+        assert simplify(tree) == tree
+
+
+def random_pattern(rng: random.Random, depth: int) -> str:
+    if depth == 0 or rng.random() < 0.3:
+        return rng.choice(["a", "b", "c", "[ab]", "."])
+    kind = rng.randrange(4)
+    if kind == 0:
+        return "".join(random_pattern(rng, depth - 1) for _ in range(rng.randint(2, 3)))
+    if kind == 1:
+        branches = [random_pattern(rng, depth - 1) for _ in range(rng.randint(2, 3))]
+        return "(" + "|".join(branches) + ")"
+    quantifier = rng.choice(["*", "+", "?", "{2}", "{0,2}", "{1,}"])
+    return "(" + random_pattern(rng, depth - 1) + ")" + quantifier
+
+
+def test_simplified_automata_agree_with_re():
+    rng = random.Random(16)
+    strings = list(all_strings("abc", 4))
+    for _ in range(150):
+        pattern = random_pattern(rng, 3)
+        simplified = Regex(pattern)
+        plain = Regex(pattern, simplify=False)
+        dfa = DFA(simplified.to_nfa())
+        direct = simplified.to_dfa_direct()
+        reference = DFA(plain.to_nfa())
+        for string in strings:
+            expected = re.fullmatch(pattern, string) is not None
+            assert dfa.simulate(string) == expected, (pattern, string)
+            assert direct.simulate(string) == expected, (pattern, string)
+            assert reference.simulate(string) == expected, (pattern, string)
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    ["((a|b)?)+", "(a*)*b", "if|in|int|for|foreach", "(ab|ac|ad)*", "a|b|c|d"],
+)
+def test_simplified_automata_are_smaller(pattern):
+    simplified = Regex(pattern)
+    plain = Regex(pattern, simplify=False)
+    assert len(simplified.to_nfa().states) < len(plain.to_nfa().states)
+    assert len(DFA(simplified.to_nfa()).states) <= len(DFA(plain.to_nfa()).states)
+    assert len(simplified.to_dfa_direct().states) <= len(plain.to_dfa_direct().states)
+
+
+def test_cache_key_uses_simplified_tree():
+    assert pattern_key("(a*)*") == pattern_key("a*")
+    assert pattern_key("a|b") == pattern_key("[ab]")
+    assert pattern_key("a") != pattern_key("b")
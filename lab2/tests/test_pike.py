@@ -0,0 +1,122 @@
+import random
+import re
+
+import pytest
+
+from lab2 import PikeVM
+
+SPAN_PATTERNS = [
+    "a|ab",
+    "abcd|bc",
+    "a*",
+    "(a|b)*abb",
+    "b+|ab*",
+    "[ab]{2,3}",
+    "(ab|a)(bc|c)?",
+    r"\d+(\.\d+)?",
+    "x?",
+    "c(a|b)*c",
+]
+CAPTURE_PATTERNS = [
+    "(a|ab)(c|bcd)(d*)",
+    "(a+)(b+)?",
+    "((a)|b)+",
+    "(a*)(a)",
+    "c((a|b)*)c",
+    "(a)|(b)",
+    "(ab){2}(c)?",
+]
+
+
+def leftmost_longest(pattern: str, text: str, pos: int = 0) -> list[tuple[int, int]]:
+    """逐个起点枚举子串的朴素最左最长匹配, 作为对照"""
+    spans = []
+    while pos <= len(text):
+        found = None
+        for start in range(pos, len(text) + 1):
+            ends = [
+                end
+                for end in range(start, len(text) + 1)
+                if re.fullmatch(pattern, text[start:end])
+            ]
+            if ends:
+                found = (start, max(ends))
+                break
+        if found is None:
+            break
+        spans.append(found)
+        pos = found[1] + 1 if found[0] == found[1] else found[1]
+    return spans
+
+
+def random_texts(alphabet: str, count: int, seed: int = 18) -> list[str]:
+    rng = random.Random(seed)
+    return [""] + [
+        "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 9)))
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize("pattern", SPAN_PATTERNS)
+def test_finditer_spans_are_leftmost_longest(pattern):
+    vm = PikeVM(pattern)
+    for text in random_texts("abcx1.", 150):
+        spans = [match.span() for match in vm.finditer(text)]
+        assert spans == leftmost_longest(pattern, text), text
+
+
+@pytest.mark.parametrize("pattern", CAPTURE_PATTERNS)
+def test_captures_agree_with_backtracking(pattern):
+    vm = PikeVM(pattern)
+    for text in random_texts("abcd", 150):
+        match = vm.search(text)
+        spans = leftmost_longest(pattern, text)
+        if not spans:
+            assert match is None, text
+            continue
+        start, end = spans[0]
+        assert match is not None and match.span() == (start, end), text
+        # 同一区间上回溯引擎按优先级找到的第一条路径即 Pike VM 保留的线程
+        expected = re.fullmatch(pattern, text[start:end])
+        assert expected is not None
+        for group in range(1, vm.groups + 1):
+            first, last = expected.span(group)
+            if first >= 0:
+                first, last = first + start, last + start
+            assert match.span(group) == (first, last), (text, group)
+        assert match.groups() == expected.groups()
+
+
+def test_search_with_pos_and_endpos():
+    vm = PikeVM("ab+")
+    match = vm.search("abbxabbb", 1)
+    assert match is not None and match.span() == (4, 8)
+    match = vm.search("abbxabbb", 1, 6)
+    assert match is not None and match.span() == (4, 6)
+    assert vm.search("abbxabbb", 5) is None
+    assert [m.group() for m in vm.finditer("abbxabbb", 0, 7)] == ["abb", "abb"]
+
+
+def test_unmatched_group_is_unset():
+    match = PikeVM("(a)|(b)").search("b")
+    assert match is not None
+    assert match.span(1) == (-1, -1) and match.group(1) is None
+    assert match.groups() == (None, "b")
+
+
+def test_no_backtracking_blowup():
+    # 回溯引擎上为指数时间的模式
+    vm = PikeVM("(a|aa)*c")
+    text = "a" * 2000
+    assert vm.search(text) is None
+    match = vm.search(text + "c")
+    assert match is not None and match.span() == (0, 2001)
+    assert PikeVM("(a*)*b").search("a" * 2000) is None
+
+
+def test_prefilter_skips_to_candidates():
+    vm = PikeVM("[0-9]+")
+    text = "x" * 5000 + "123" + "y" * 10
+    match = vm.search(text)
+    assert match is not None and match.span() == (5000, 5003)
+    assert [m.group() for m in vm.finditer("a1b22c333")] == ["1", "22", "333"]
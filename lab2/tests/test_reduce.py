@@ -0,0 +1,100 @@
+import pytest
+
+from lab2 import DFA, NFA, Regex, RegexSet, State
+from lab2.export import to_dot
+from tests.test_compiled import PATTERNS
+from tests.test_direct import EXTRA_PATTERNS, all_strings
+from tests.test_regex import SYNTAX_PATTERNS, random_strings
+
+
+@pytest.mark.parametrize("pattern", PATTERNS + EXTRA_PATTERNS)
+def test_reduced_nfa_is_equivalent(pattern):
+    nfa = Regex(pattern).to_nfa()
+    epsilon_free = nfa.remove_epsilons()
+    reduced = nfa.reduce()
+    for string in all_strings("abc", 5):
+        expected = nfa.simulate(string)
+        assert epsilon_free.simulate(string) == expected, string
+        assert reduced.simulate(string) == expected, string
+        assert reduced.to_bitset().fullmatch(string) == expected, string
+    minimal = DFA(nfa).minimize()
+    assert len(DFA(reduced).minimize().states) == len(minimal.states)
+
+
+@pytest.mark.parametrize("pattern", SYNTAX_PATTERNS)
+def test_reduce_keeps_char_classes(pattern):
+    nfa = Regex(pattern).to_nfa()
+    reduced = nfa.reduce()
+    dfa = DFA(reduced).minimize()
+    for string in random_strings(300):
+        assert dfa.simulate(string) == nfa.simulate(string), string
+
+
+def test_remove_epsilons_stats():
+    nfa = Regex("(ab|cd)*x").to_nfa()
+    epsilon_free = nfa.remove_epsilons()
+    assert all(None not in state.transitions for state in epsilon_free.states)
+    stats = epsilon_free.reduction
+    assert stats is not None
+    assert stats.states_before == len(nfa.states) == 14
+    assert stats.states_after == len(epsilon_free.states) == 6
+    assert stats.edges_before == nfa.num_edges
+    assert stats.edges_removed == nfa.num_edges - epsilon_free.num_edges > 0
+    # 分两步化简时统计仍相对最初的NFA
+    reduced = epsilon_free.reduce(remove_epsilons=False)
+    stats = reduced.reduction
+    assert stats is not None
+    assert stats.states_before == 14
+    assert stats.states_after == len(reduced.states) == 4
+
+
+def test_bisimilar_states_merge():
+    # (a|b)*abb 的 epsilon-free NFA 中由 a 与 b 进入循环的状态互模拟
+    nfa = Regex("(a|b)*abb", simplify=False).to_nfa()
+    assert len(nfa.remove_epsilons().states) == 6
+    assert len(nfa.reduce().states) == 4
+
+
+def test_useless_states_are_removed():
+    start, middle, dead, accept = State(), State(), State(), State()
+    start.add_transition("a", middle)
+    start.add_transition("b", dead)
+    middle.add_transition("c", accept)
+    nfa = NFA([start, middle, dead, accept])
+    reduced = nfa.reduce()
+    assert reduced.reduction is not None
+    assert reduced.reduction.states_removed == 1
+    assert reduced.simulate("ac") and not reduced.simulate("b")
+
+    start, accept = State(), State()
+    start.add_transition("a", start)
+    nfa = NFA([start, accept])  # 接受状态不可达, 语言为空
+    reduced = nfa.reduce()
+    assert len(reduced.states) == 1 and reduced.num_edges == 0
+    assert not reduced.simulate("") and len(DFA(reduced).accept_states) == 0
+
+
+def test_reduce_keeps_tags():
+    regex_set = RegexSet(["a*", "b*", "ab", "a|b"])
+    nfa = regex_set.to_nfa()
+    reduced = nfa.reduce()
+    assert len(reduced.states) < len(nfa.states)
+    # 空串同时被前两个模式接受, 起始状态带有两个标签
+    assert reduced.start_state is not None
+    assert reduced.accept_tags[reduced.start_state] == {0, 1}
+    dfa = DFA(reduced)
+    for string in all_strings("ab", 4):
+        state = dfa.start_state
+        for char in string:
+            if state is None:
+                break
+            state = state.transitions.get(char)
+        tags = frozenset() if state is None else dfa.tags.get(state, frozenset())
+        assert tags == regex_set.matches(string), string
+
+
+def test_reduced_dot_marks_all_accepting_states():
+    reduced = Regex("ab|a(cd)*").to_nfa().reduce()
+    source = to_dot(reduced)
+    assert source.count("doublecircle") == len(reduced.accepting_states()) > 1
+    assert "ε" not in source
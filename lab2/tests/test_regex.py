@@ -0,0 +1,111 @@
+import random
+import re
+
+import pytest
+
+from lab2 import DFA, CompiledDFA, Regex
+from lab2.charclass import Alphabet, CharClass
+
+SYNTAX_PATTERNS = [
+    r"[a-c]+x",
+    r"[^ab]*",
+    r"a{3}",
+    r"a{2,4}b",
+    r"(ab){1,}",
+    r"(a|b){0,2}c",
+    r"a{,2}",
+    r"\d+\.\d*",
+    r"[\w-]+@\w+",
+    r"\s*\S+",
+    r".*a.*",
+    r"[a-z]{2,3}|[0-9]",
+    r"\x41é+",
+    r"[-a]b[a-]",
+    r"[]a]+",
+    r"a{0}b",
+    r"(a{2}){2}",
+    r"é[à-ÿ]?",
+    r"\.\*\+",
+    r"a{x}",
+    r"[^\n]+",
+]
+ALPHABET = "abcx09.-@ é\nàA*+{}]"
+
+
+def random_strings(count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    return [""] + [
+        "".join(rng.choice(ALPHABET) for _ in range(rng.randint(1, 6)))
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize("pattern", SYNTAX_PATTERNS)
+def test_syntax_agrees_with_re(pattern):
+    oracle = re.compile(pattern, re.ASCII)
+    nfa = Regex(pattern).to_nfa()
+    dfa = DFA(Regex(pattern).to_nfa())
+    compiled = dfa.minimize().compile()
+    direct = Regex(pattern).to_dfa_direct()
+    byte_compiled = DFA(Regex(pattern).to_nfa().to_utf8()).compile(byte_mode=True)
+    strings = random_strings(500) + ["aaa", "aab", "12.5", "a-b@c", "a{x}", "éà"]
+    batch = list(compiled.match_many(strings))
+    for string, batch_result in zip(strings, batch):
+        expected = oracle.fullmatch(string) is not None
+        assert nfa.simulate(string) == expected, string
+        assert dfa.simulate(string) == expected, string
+        assert compiled.fullmatch(string) == expected, string
+        assert bool(batch_result) == expected, string
+        assert direct.simulate(string) == expected, string
+        assert byte_compiled.fullmatch(string.encode("utf-8")) == expected, string
+        assert compiled.search(string) == (oracle.search(string) is not None)
+
+
+def test_class_is_one_interval_edge():
+    nfa = Regex("[a-z]").to_nfa()
+    edges = [
+        (label, target)
+        for state in nfa.states
+        for label, targets in state.transitions.items()
+        for target in targets
+    ]
+    assert edges == [(CharClass([(ord("a"), ord("z"))]), nfa.accept_state)]
+    compiled = DFA(nfa).compile()
+    assert compiled.num_classes == 2
+    assert compiled.ranges == [(ord("a"), ord("z"), 1)]
+
+
+def test_repetition_is_linear():
+    assert len(Regex("a{50}").to_nfa().states) == 100
+    assert len(Regex("a{0,50}").to_nfa().states) == 50 * 4
+    # + 不再复制子自动机: 比 * 的构造少一条 epsilon 边, 状态数相同
+    assert len(Regex("(ab|cd)+").to_nfa().states) == len(
+        Regex("(ab|cd)*").to_nfa().states
+    )
+    assert len(DFA(Regex("[a-z]{20}").to_nfa()).minimize().states) == 21
+
+
+def test_bad_syntax():
+    for pattern in ["[a-", "[z-a]", "a{3,1}", "\\q", "ab\\", "\\x4"]:
+        with pytest.raises(ValueError):
+            Regex(pattern)
+
+
+def test_ranges_survive_serialization_and_rebuild():
+    compiled = DFA(Regex(r"[^a-c]x|\d+").to_nfa()).minimize().compile()
+    loaded = CompiledDFA.from_buffer(compiled.to_bytes())
+    assert loaded.ranges == compiled.ranges
+    rebuilt = DFA.from_compiled(compiled)
+    for string in ["zx", "ax", "123", "\U0010ffffx", "", "1a"]:
+        expected = compiled.fullmatch(string)
+        assert loaded.fullmatch(string) == expected
+        assert rebuilt.simulate(string) == expected
+
+
+def test_alphabet_atoms_are_disjoint():
+    letters = CharClass([(ord("a"), ord("z"))])
+    alphabet = Alphabet(["a", letters, CharClass.from_char("\n").negate()])
+    assert alphabet.atoms_of("a") == ["a"]
+    assert set(alphabet.atoms_of(letters)) == {"a", CharClass([(98, 122)])}
+    assert alphabet.classify("q") == CharClass([(98, 122)])
+    assert alphabet.classify("\n") is None
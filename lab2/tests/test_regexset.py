@@ -0,0 +1,54 @@
+import pytest
+
+from lab2 import DFA, Regex, RegexSet
+from tests.test_compiled import PATTERNS, STRINGS
+
+
+@pytest.fixture(scope="module")
+def regex_set():
+    return RegexSet(PATTERNS)
+
+
+@pytest.mark.parametrize("string", STRINGS)
+def test_matches_agree_with_single_patterns(regex_set, string):
+    expected = {
+        tag
+        for tag, pattern in enumerate(PATTERNS)
+        if DFA(Regex(pattern).to_nfa()).simulate(string)
+    }
+    assert regex_set.matches(string) == expected
+    assert regex_set.is_match(string) == bool(expected)
+
+
+def test_minimize_keeps_tags_apart():
+    # 语言相同的两个模式共享同一接受状态, 标签集合为两者之并
+    same = RegexSet(["a", "a"])
+    assert same.matches("a") == {0, 1}
+    # 不区分标签的最小化会把 a 与 b 的接受状态合并为一个
+    regex_set = RegexSet(["a", "b"])
+    assert len(regex_set.dfa.states) == 3
+    assert regex_set.matches("a") == {0}
+    assert regex_set.matches("b") == {1}
+    assert regex_set.matches("ab") == set()
+
+
+def test_tagged_dfa_states():
+    regex_set = RegexSet(["(a|b)*abb", "(a|b)*"])
+    dfa = regex_set.dfa
+    assert set(dfa.tags) == set(dfa.accept_states)
+    assert {tags for tags in dfa.tags.values()} == {frozenset({1}), frozenset({0, 1})}
+    unminimized = DFA(regex_set.to_nfa())
+    assert len(dfa.states) <= len(unminimized.states)
+    for string in STRINGS:
+        state = unminimized.start_state
+        for char in string:
+            state = state.transitions.get(char) if state else None
+        expected = unminimized.tags.get(state, frozenset()) if state else frozenset()
+        assert regex_set.matches(string) == expected
+
+
+def test_empty_set():
+    regex_set = RegexSet([])
+    assert len(regex_set) == 0
+    assert regex_set.matches("a") == set()
+    assert regex_set.matches("") == set()
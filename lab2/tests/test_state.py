@@ -0,0 +1,42 @@
+import pytest
+
+from lab2 import DFA, NFA, Regex
+from tests.test_compiled import PATTERNS, STRINGS
+
+
+def test_state_ids_are_per_automaton():
+    nfa1 = Regex("ab").to_nfa()
+    nfa2 = Regex("a|c").to_nfa()
+    assert [state.id for state in nfa1.states] == list(range(len(nfa1.states)))
+    assert [state.id for state in nfa2.states] == list(range(len(nfa2.states)))
+    assert str(nfa2.states[0]) == "S0"
+    dfa = DFA(nfa1)
+    assert [str(state) for state in dfa.states] == ["S0", "S1", "S2"]
+
+
+def test_dfa_state_has_single_target():
+    dfa = DFA(Regex("(a|b)*abb").to_nfa())
+    for state in dfa.states:
+        for target in state.transitions.values():
+            assert target in dfa.states
+    with pytest.raises(AttributeError):
+        dfa.states[0].extra = 1  # type: ignore[attr-defined]
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_nfa_arrays_round_trip(pattern):
+    nfa = Regex(pattern).to_nfa()
+    arrays = nfa.to_arrays()
+    assert arrays.num_states == len(nfa.states)
+    rebuilt = NFA.from_arrays(arrays)
+    for string in STRINGS:
+        assert rebuilt.simulate(string) == nfa.simulate(string)
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_dfa_from_compiled_round_trip(pattern):
+    dfa = DFA(Regex(pattern).to_nfa()).minimize()
+    rebuilt = DFA.from_compiled(dfa.compile())
+    assert len(rebuilt.states) == len(dfa.states)
+    for string in STRINGS:
+        assert rebuilt.simulate(string) == dfa.simulate(string)
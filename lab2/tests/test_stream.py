@@ -0,0 +1,71 @@
+import pytest
+
+from lab2 import DFA, Regex, StreamMatcher
+from tests.test_compiled import PATTERNS, STRINGS
+
+TEXTS = STRINGS + ["xabbabcab", "bababaabbaa", "ccabbbcab"]
+
+
+def brute_force_ends(dfa: DFA, text: str, search: bool) -> list[int]:
+    starts = range(len(text) + 1) if search else [0]
+    return [
+        end
+        for end in range(len(text) + 1)
+        if any(dfa.simulate(text[begin:end]) for begin in starts if begin <= end)
+    ]
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+@pytest.mark.parametrize("search", [True, False])
+def test_feed_reports_end_offsets(pattern, search):
+    dfa = DFA(Regex(pattern).to_nfa()).minimize()
+    matcher = StreamMatcher(dfa.compile(), search=search)
+    for text in TEXTS:
+        expected = brute_force_ends(dfa, text, search)
+        # 任意切块方式得到的结果都相同
+        for size in (1, 2, 5, len(text) or 1):
+            ends = []
+            for begin in range(0, len(text), size):
+                ends.extend(matcher.feed(text[begin : begin + size]))
+            if not text:
+                ends.extend(matcher.feed(""))
+            assert ends == expected
+            assert matcher.offset == len(text)
+            assert matcher.finish() == (bool(expected) and expected[-1] == len(text))
+
+
+def test_bytes_split_inside_character():
+    matcher = StreamMatcher(DFA(Regex("é(a|b)*").to_nfa()).compile())
+    data = "xéab".encode()
+    ends = []
+    for i in range(len(data)):
+        ends.extend(matcher.feed(data[i : i + 1]))
+    assert ends == [2, 3, 4]
+    assert matcher.finish()
+    matcher.feed(b"\xc3")
+    with pytest.raises(UnicodeDecodeError):
+        matcher.finish()
+
+
+def test_anchored_stops_when_dead():
+    matcher = StreamMatcher(DFA(Regex("ab").to_nfa()).compile(), search=False)
+    assert matcher.feed("ac") == []
+    assert matcher.dead
+    assert matcher.feed("ab" * 10) == []
+    assert matcher.offset == 22
+    assert not matcher.finish()
+    assert not matcher.dead
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1 << 20])
+def test_scan_file(tmp_path, chunk_size):
+    text = "ééabb\n" * 50 + "abb"
+    path = tmp_path / "input.txt"
+    path.write_text(text, encoding="utf-8")
+    dfa = DFA(Regex("(a|b)*abb").to_nfa()).minimize()
+    matcher = StreamMatcher(dfa.compile())
+    expected = [i + 1 for i in range(len(text)) if text[: i + 1].endswith("abb")]
+    assert list(matcher.scan_file(path, chunk_size)) == expected
+    empty = tmp_path / "empty.txt"
+    empty.write_bytes(b"")
+    assert list(matcher.scan_file(empty)) == []
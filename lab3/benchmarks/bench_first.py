@@ -0,0 +1,102 @@
+"""FIRST 集求解的耗时: 强连通分量一次求解与逐遍迭代到不动点的对比
+
+在生成的文法上计算全部非终结符号的 FIRST 集, 非终结符号数取 1k 到 10k:
+chain:   N_i -> N_{i+1} t_{i mod 10} | ε, 长的可空链
+cycle:   N_i -> N_{i+1} a | b_{i mod 10}, 末尾回到 N_0, 整个文法是一个相互左递归的环
+random:  每个非终结符号 3 个随机产生式, 约四分之一为 ε
+iterate 为教科书式的 while changed 循环, 每遍扫描全部产生式, 列出所需遍数;
+遍数随链长增长, 总时间为平方级, 只对不超过 --iterate-limit 的规模运行
+用法 (在 lab3 目录下): python -m benchmarks.bench_first [--sizes N ...] [--iterate-limit N]
+"""
+
+import argparse
+import random
+import time
+
+from lab3 import CFG
+
+
+def generate(shape: str, size: int, seed: int = 21) -> CFG:
+    rng = random.Random(seed)
+    cfg = CFG(False)
+    cfg.set_start("N0")
+    for i in range(size):
+        nonterminalSym = f"N{i}"
+        following = f"N{(i + 1) % size}"
+        if shape == "chain":
+            productions = (
+                [[following, f"t{i % 10}"], ["ε"]] if i + 1 < size else [["u"]]
+            )
+        elif shape == "cycle":
+            productions = [[following, "a"], [f"b{i % 10}"]]
+        else:
+            productions = []
+            for _ in range(3):
+                if rng.random() < 0.25:
+                    productions.append(["ε"])
+                    continue
+                productions.append(
+                    [
+                        f"N{rng.randrange(size)}"
+                        if rng.random() < 0.6
+                        else f"t{rng.randrange(50)}"
+                        for _ in range(rng.randint(1, 4))
+                    ]
+                )
+        cfg.add_rule(nonterminalSym, productions)
+    return cfg
+
+
+def iterate_first(cfg: CFG) -> tuple[dict[str, set[str]], int]:
+    """逐遍扫描全部产生式直到 FIRST 集不再变化, 返回 FIRST 集与遍数"""
+    firstSets: dict[str, set[str]] = {sym: set() for sym in cfg.grammar}
+    passes = 0
+    changed = True
+    while changed:
+        changed = False
+        passes += 1
+        for nonterminalSym, productions in cfg.grammar.items():
+            target = firstSets[nonterminalSym]
+            before = len(target)
+            for prod in productions:
+                for sym in prod:
+                    first = firstSets.get(sym, {sym})
+                    target |= first - {"ε"}
+                    if "ε" not in first:
+                        break
+                else:
+                    target.add("ε")
+            changed |= len(target) != before
+    return firstSets, passes
+
+
+def timed(func, *args):
+    begin = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - begin, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 2000, 5000, 10000]
+    )
+    parser.add_argument(
+        "--iterate-limit", type=int, default=2000, help="运行 iterate 的最大规模"
+    )
+    args = parser.parse_args()
+
+    for shape in ("chain", "cycle", "random"):
+        for size in args.sizes:
+            cfg = generate(shape, size)
+            t_scc, firstSets = timed(cfg.compute_firstSets)
+            line = f"{shape:6} {size:>6} nonterminals  scc {t_scc * 1e3:8.2f}ms"
+            if size <= args.iterate_limit:
+                t_iter, (expected, passes) = timed(iterate_first, cfg)
+                assert firstSets == expected
+                line += f"  iterate {t_iter * 1e3:9.2f}ms ({passes} passes)"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""FOLLOW 集求解的迭代次数与耗时: 后缀 FIRST 集预计算 + 强连通分量求解与原 while changed 循环的对比
+
+chain:   N_i -> t N_{i-1} E | ε, E -> e | ε, 开始符号为最后一个, FOLLOW 沿链逆着字典顺序传播,
+         原循环每遍只前进一步
+random:  每个非终结符号 3 个随机产生式, 约四分之一为 ε
+loop 为原实现: 每遍对每个产生式的每个非终结符号位置求一次后缀 FIRST 集 (切片并重新计算),
+列出遍数与后缀 FIRST 集的求值次数; scc 对每个位置只扫描一次, 列出扫描的位置数
+loop 为平方级, 只对不超过 --loop-limit 的规模运行
+用法 (在 lab3 目录下): python -m benchmarks.bench_follow [--sizes N ...] [--loop-limit N]
+"""
+
+import argparse
+import random
+import time
+
+from lab3 import CFG
+
+
+def generate(shape: str, size: int, seed: int = 22) -> CFG:
+    rng = random.Random(seed)
+    cfg = CFG(False)
+    cfg.set_start(f"N{size - 1}" if shape == "chain" else "N0")
+    for i in range(size):
+        if shape == "chain":
+            productions = [["t", f"N{i - 1}", "E"], ["ε"]] if i else [["u"]]
+        else:
+            productions = []
+            for _ in range(3):
+                if rng.random() < 0.25:
+                    productions.append(["ε"])
+                    continue
+                productions.append(
+                    [
+                        f"N{rng.randrange(size)}"
+                        if rng.random() < 0.6
+                        else f"t{rng.randrange(50)}"
+                        for _ in range(rng.randint(1, 4))
+                    ]
+                )
+        cfg.add_rule(f"N{i}", productions)
+    if shape == "chain":
+        cfg.add_rule("E", [["e"], ["ε"]])
+    return cfg
+
+
+def loop_follow(cfg: CFG) -> tuple[dict[str, set[str]], int, int]:
+    """原实现的 while changed 循环, 返回 FOLLOW 集、遍数与后缀 FIRST 集的求值次数"""
+    assert cfg.startSym is not None
+    followSets: dict[str, set[str]] = {sym: set() for sym in cfg.grammar}
+    followSets[cfg.startSym].add("$")
+    passes = evaluations = 0
+    changed = True
+    while changed:
+        changed = False
+        passes += 1
+        for nonterminal, productions in cfg.grammar.items():
+            for production in productions:
+                for i, symbol in enumerate(production):
+                    if symbol not in cfg.terminalSyms:
+                        originalSize = len(followSets[symbol])
+                        if i + 1 < len(production):
+                            evaluations += 1
+                            firstSet = cfg.compute_first_of_production(
+                                production[i + 1 :]
+                            )
+                            followSets[symbol].update(firstSet - {"ε"})
+                            if "ε" in firstSet:
+                                followSets[symbol].update(followSets[nonterminal])
+                        else:
+                            followSets[symbol].update(followSets[nonterminal])
+                        changed |= originalSize != len(followSets[symbol])
+    return followSets, passes, evaluations
+
+
+def timed(func, *args):
+    begin = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - begin, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[500, 1000, 5000, 10000]
+    )
+    parser.add_argument(
+        "--loop-limit", type=int, default=1000, help="运行原循环的最大规模"
+    )
+    args = parser.parse_args()
+
+    for shape in ("chain", "random"):
+        for size in args.sizes:
+            cfg = generate(shape, size)
+            cfg.compute_firstSets()
+            positions = sum(
+                len(prod) for prods in cfg.grammar.values() for prod in prods
+            )
+            t_scc, followSets = timed(cfg.compute_followSets)
+            line = (
+                f"{shape:6} {size:>6} nonterminals  "
+                f"scc {t_scc * 1e3:8.2f}ms ({positions} positions)"
+            )
+            if size <= args.loop_limit:
+                t_loop, (expected, passes, evaluations) = timed(loop_follow, cfg)
+                assert followSets == expected
+                line += (
+                    f"  loop {t_loop * 1e3:9.2f}ms "
+                    f"({passes} passes, {evaluations} suffix FIRST)"
+                )
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
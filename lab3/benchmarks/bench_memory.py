@@ -0,0 +1,256 @@
+"""文法分析的内存占用: 在约 5 万个产生式的 LL(1) 文法上用 tracemalloc 测量峰值
+
+grammar:  字符串形式的文法 (dict[str, list[list[str]]]) 本身的大小
+compiled: CompiledGrammar 的大小 (符号表与 array('i') 存放的产生式)
+legacy:   原实现的判定路径: FIRST 与 FOLLOW 各自把字符串文法重新编码为列表,
+          同时生成字符串形式的 FIRST/FOLLOW 集, SELECT 集在字符串产生式上逐个求出
+is_ll1:   完整的 FIRST/FOLLOW/SELECT 分析与判定的峰值与保留的内存 (不含文法本身)
+views:    再生成供显示的字符串形式 FIRST/FOLLOW 集的额外内存
+tracemalloc 会显著拖慢分配密集的代码, 耗时在关闭跟踪后对新构造的文法另行测量
+文法中每个非终结符号有 4 个分别以不同的 t 终结符号开头的产生式和一个 ε 产生式,
+右部中的非终结符号后总跟着 u 终结符号, 因此文法是 LL(1) 的, 判定会求出全部 FIRST/FOLLOW/SELECT 集
+用法 (在 lab3 目录下): python -m benchmarks.bench_memory [--nonterminals N] [--terminals N]
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Any
+
+from lab3 import CFG
+from lab3.compiled import CompiledGrammar
+from lab3.fixpoint import solve_inclusions
+
+_EPSILON = 1  # ε 的位, 与 lab3.cfg 一致
+_END = 2  # $ 的位
+
+
+def generate(nonterminals: int, terminals: int, seed: int = 24) -> CFG:
+    rng = random.Random(seed)
+    cfg = CFG(False)
+    cfg.set_start("N0")
+    for i in range(nonterminals):
+        productions = []
+        for leader in rng.sample(range(terminals), 4):
+            production = [f"t{leader}"]
+            for _ in range(rng.randint(0, 3)):
+                if rng.random() < 0.6:
+                    production.append(f"N{rng.randrange(nonterminals)}")
+                production.append(f"u{rng.randrange(terminals)}")
+            productions.append(production)
+        productions.append(["ε"])
+        cfg.add_rule(f"N{i}", productions)
+    return cfg
+
+
+def legacy_encode(
+    cfg: CFG,
+) -> tuple[list[str], dict[str, int], list[int], list[list[int]]]:
+    """原实现的编码: 每次分析都把字符串文法重新编码为列表, 返回终结符号表、符号编号、左部与右部"""
+    numNonterminals = len(cfg.grammar)
+    symbolIds = {sym: i for i, sym in enumerate(cfg.grammar)}
+    terminalSyms = ["ε", "$"]
+    symbolIds.setdefault("$", numNonterminals + 1)
+    heads: list[int] = []
+    bodies: list[list[int]] = []
+    for head, productions in enumerate(cfg.grammar.values()):
+        for prod in productions:
+            body: list[int] = []
+            for sym in prod:
+                if sym == "ε":
+                    continue
+                symId = symbolIds.get(sym)
+                if symId is None:
+                    symId = symbolIds[sym] = numNonterminals + len(terminalSyms)
+                    terminalSyms.append(sym)
+                body.append(symId)
+            heads.append(head)
+            bodies.append(body)
+    return terminalSyms, symbolIds, heads, bodies
+
+
+def legacy_nullable(
+    numNonterminals: int, heads: list[int], bodies: list[list[int]]
+) -> list[bool]:
+    """原实现的计数法, 右部为列表"""
+    nullable = [False] * numNonterminals
+    occurrences: list[list[int]] = [[] for _ in range(numNonterminals)]
+    counts: list[int] = []
+    queue: list[int] = []
+    for index, body in enumerate(bodies):
+        if any(sym >= numNonterminals for sym in body):
+            counts.append(-1)
+            continue
+        counts.append(len(body))
+        for sym in body:
+            occurrences[sym].append(index)
+        if not body and not nullable[heads[index]]:
+            nullable[heads[index]] = True
+            queue.append(heads[index])
+    while queue:
+        sym = queue.pop()
+        for index in occurrences[sym]:
+            counts[index] -= 1
+            head = heads[index]
+            if counts[index] == 0 and not nullable[head]:
+                nullable[head] = True
+                queue.append(head)
+    return nullable
+
+
+def terminal_set(table: list[str], mask: int) -> set[str]:
+    terminals: set[str] = set()
+    while mask:
+        low = mask & -mask
+        terminals.add(table[low.bit_length() - 1])
+        mask ^= low
+    return terminals
+
+
+def legacy_is_ll1(cfg: CFG) -> tuple[bool, tuple]:
+    """原实现的判定路径: FIRST 与 FOLLOW 各自重新编码文法, 同时生成字符串形式的集合,
+    SELECT 集在字符串产生式上逐个求出; 返回判定结果与原先保存在 CFG 上的各个集合"""
+    numNonterminals = len(cfg.grammar)
+    terminalSyms, _, heads, bodies = legacy_encode(cfg)
+    terminalBits = {sym: 1 << i for i, sym in enumerate(terminalSyms)}
+    nullable = legacy_nullable(numNonterminals, heads, bodies)
+    base = [0] * numNonterminals
+    deps: list[list[int]] = [[] for _ in range(numNonterminals)]
+    for head, body in zip(heads, bodies):
+        for sym in body:
+            if sym >= numNonterminals:
+                base[head] |= 1 << (sym - numNonterminals)
+                break
+            deps[head].append(sym)
+            if not nullable[sym]:
+                break
+    firsts = solve_inclusions(base, deps)
+    firstMasks: dict[str, int] = {}
+    firstSets: dict[str, set[str]] = {}
+    for i, nonterminalSym in enumerate(cfg.grammar):
+        mask = firsts[i] | _EPSILON if nullable[i] else firsts[i]
+        firstMasks[nonterminalSym] = mask
+        firstSets[nonterminalSym] = terminal_set(terminalSyms, mask)
+
+    assert cfg.startSym is not None
+    _, symbolIds, heads, bodies = legacy_encode(cfg)
+    firsts = [mask & ~_EPSILON for mask in firstMasks.values()]
+    nullableMasks = [mask & _EPSILON for mask in firstMasks.values()]
+    base = [0] * numNonterminals
+    deps = [[] for _ in range(numNonterminals)]
+    base[symbolIds[cfg.startSym]] = _END
+    for head, body in zip(heads, bodies):
+        trailer = 0
+        trailerNullable = True
+        for sym in reversed(body):
+            if sym >= numNonterminals:
+                trailer = 1 << (sym - numNonterminals)
+                trailerNullable = False
+                continue
+            base[sym] |= trailer
+            if trailerNullable:
+                deps[sym].append(head)
+            if nullableMasks[sym]:
+                trailer |= firsts[sym]
+            else:
+                trailer = firsts[sym]
+                trailerNullable = False
+    follows = solve_inclusions(base, deps)
+    followMasks: dict[str, int] = {}
+    followSets: dict[str, set[str]] = {}
+    for i, nonterminalSym in enumerate(cfg.grammar):
+        followMasks[nonterminalSym] = follows[i]
+        followSets[nonterminalSym] = terminal_set(terminalSyms, follows[i])
+
+    state = (terminalSyms, firstMasks, firstSets, followMasks, followSets)
+    for nonterminalSym, productions in cfg.grammar.items():
+        seen = 0
+        for production in productions:
+            mask = 0
+            for symbol in production:
+                if symbol == "ε":
+                    continue
+                first = firstMasks.get(symbol)
+                if first is None:
+                    mask |= terminalBits[symbol]
+                    break
+                mask |= first & ~_EPSILON
+                if not first & _EPSILON:
+                    break
+            else:
+                mask |= followMasks[nonterminalSym]
+            if seen & mask:
+                return False, state
+            seen |= mask
+    return True, state
+
+
+def measure(func, cfg: CFG) -> tuple[int, int, Any]:
+    """func(cfg) 的峰值与保留的内存 (不含文法本身) 及其结果, 结果在测量时保持存活"""
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    result = func(cfg)
+    current, peak = tracemalloc.get_traced_memory()
+    return peak - before, current - before, result
+
+
+def timed(args, func) -> float:
+    """关闭跟踪, 对新构造的文法测量 func(cfg) 的耗时"""
+    cfg = generate(args.nonterminals, args.terminals)
+    begin = time.perf_counter()
+    func(cfg)
+    return time.perf_counter() - begin
+
+
+def mib(size: int) -> str:
+    return f"{size / 2**20:7.1f}MiB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nonterminals", type=int, default=10000)
+    parser.add_argument("--terminals", type=int, default=200)
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    cfg = generate(args.nonterminals, args.terminals)
+    grammarSize = tracemalloc.get_traced_memory()[0]
+    productions = sum(len(prods) for prods in cfg.grammar.values())
+    print(f"grammar  {mib(grammarSize)}  ({productions} productions)")
+
+    before = tracemalloc.get_traced_memory()[0]
+    compiled = CompiledGrammar(cfg.grammar)
+    print(f"compiled {mib(tracemalloc.get_traced_memory()[0] - before)}  {compiled}")
+    del compiled
+
+    *legacy, (isLL1, state) = measure(legacy_is_ll1, cfg)
+    assert isLL1
+    del state
+    *analysis, isLL1 = measure(CFG.is_ll1, cfg)
+    assert isLL1
+    *views, _ = measure(
+        lambda cfg: (cfg.compute_firstSets(), cfg.compute_followSets()), cfg
+    )
+    tracemalloc.stop()
+
+    del cfg
+    t_legacy = timed(args, legacy_is_ll1)
+    t_analysis = timed(args, CFG.is_ll1)
+    t_views = timed(
+        args,
+        lambda cfg: (cfg.is_ll1(), cfg.compute_firstSets(), cfg.compute_followSets()),
+    )
+    for name, (peak, retained), elapsed in (
+        ("legacy", legacy, t_legacy),
+        ("is_ll1", analysis, t_analysis),
+        ("views", views, t_views - t_analysis),
+    ):
+        print(
+            f"{name:8} peak {mib(peak)}  retained {mib(retained)}  "
+            f"{elapsed * 1e3:8.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""LL(1) 预测分析的耗时: 整数分析表 + 记号迭代器与原 CFG.parse 循环的对比
+
+文法为算术表达式 E -> T E', E' -> + T E' | ε, T -> F T', T' -> * F T' | ε, F -> ( E ) | id,
+输入为随机生成的合法表达式记号序列。
+table 为 LL1Parser.parse; legacy 为原实现去掉打印后的循环 (每次匹配切片剩余输入,
+每步重新求终结符号集合), 为平方级, 只对不超过 --legacy-limit 的规模运行
+用法 (在 lab3 目录下): python -m benchmarks.bench_parse [--sizes N ...] [--legacy-limit N]
+"""
+
+import argparse
+import random
+import time
+
+from lab3 import CFG, LL1Parser
+
+
+def grammar() -> CFG:
+    cfg = CFG(False)
+    cfg.set_start("E")
+    cfg.add_rule("E", [["T", "E'"]])
+    cfg.add_rule("E'", [["+", "T", "E'"], ["ε"]])
+    cfg.add_rule("T", [["F", "T'"]])
+    cfg.add_rule("T'", [["*", "F", "T'"], ["ε"]])
+    cfg.add_rule("F", [["(", "E", ")"], ["id"]])
+    return cfg
+
+
+def generate(size: int, seed: int = 25) -> list[str]:
+    """约 size 个记号的合法表达式"""
+    rng = random.Random(seed)
+    tokens = ["id"]
+    while len(tokens) < size:
+        tokens.append(rng.choice("+*"))
+        if rng.random() < 0.3:
+            tokens += ["(", "id", rng.choice("+*"), "id", ")"]
+        else:
+            tokens.append("id")
+    return tokens
+
+
+def legacy_parse(cfg: CFG, inputStr: list[str]) -> bool:
+    """原 CFG.parse 的循环, 去掉了打印"""
+    assert cfg.startSym is not None
+    stack: list[str] = ["$", cfg.startSym]
+    inputStr = inputStr + ["$"]
+    while stack:
+        top = stack.pop()
+        curSym = inputStr[0]
+        if top in cfg.terminalSyms | {"$"}:
+            if top == curSym:
+                inputStr = inputStr[1:]
+            else:
+                return False
+        else:
+            productions = cfg.predictiveTable[top][curSym]
+            if productions:
+                for sym in reversed(productions[0]):
+                    if sym != "ε":
+                        stack.append(sym)
+            else:
+                return False
+    return True
+
+
+def timed(func, *args):
+    begin = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - begin, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10000, 100000, 1000000]
+    )
+    parser.add_argument(
+        "--legacy-limit", type=int, default=100000, help="运行原循环的最大规模"
+    )
+    args = parser.parse_args()
+
+    cfg = grammar()
+    t_build, ll1Parser = timed(LL1Parser, cfg)
+    cfg.construct_predictive_table()
+    print(f"build {t_build * 1e3:8.2f}ms")
+    for size in args.sizes:
+        tokens = generate(size)
+        t_table, _ = timed(ll1Parser.parse, tokens)
+        line = (
+            f"{len(tokens):>8} tokens  table {t_table * 1e3:9.2f}ms "
+            f"({len(tokens) / t_table / 1e6:.2f}M tokens/s)"
+        )
+        if size <= args.legacy_limit:
+            t_legacy, accepted = timed(legacy_parse, cfg, tokens)
+            assert accepted
+            line += f"  legacy {t_legacy * 1e3:10.2f}ms"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,29 @@
+from .compiled import CompiledGrammar
+from .fixpoint import compute_nullable, solve_inclusions
+from .parser import LL1Parser, ParseError
 from .trie import Trie
 
+_EPSILON = 1  # ε 的位
+_END = 2  # $ 的位
+
 
 class CFG:
     def __init__(self, read=False):
         self.terminalSyms: set[str] = set()  # 终结符号集
         self.startSym: str | None = None  # 开始符号
         self.grammar: dict[str, list[list[str]]] = {}  # 产生式
+        # 供显示的字符串形式, 只由 compute_firstSets/compute_followSets 生成
         self.firstSets: dict[str, set[str]] = {}  # FIRST 集
         self.followSets: dict[str, set[str]] = {}  # FOLLOW 集
+        # 终结符号 (含 ε 与 $) 的位集编码: 终结符号表中下标为 i 的符号对应第 i 位
+        self.terminalTable: list[str] = []
+        self.terminalBits: dict[str, int] = {}
+        self.firstMasks: dict[str, int] = {}  # FIRST 集的位集
+        self.followMasks: dict[str, int] = {}  # FOLLOW 集的位集
+        self.selectMasks: list[int] = []  # 按产生式编号的 SELECT 集位集
+        self.compiled: CompiledGrammar | None = None  # 紧凑整数表示
         self.predictiveTable: dict[str, dict[str, list[list[str]]]] = {}  # 预测分析表
+        self.parser: LL1Parser | None = None  # 表驱动的预测分析器
 
         if read:
             self.read_grammar()
@@ -156,186 +171,267 @@ class CFG:
 
         self.grammar = newGrammar
 
-    def compute_first(self, symbol: str) -> set[str]:
-        if not self.firstSets:
-            self.compute_firstSets()
+    def compile(self) -> CompiledGrammar:
+        """构造文法的紧凑整数表示, FIRST/FOLLOW/SELECT 等分析都在其上进行"""
+        self.compiled = CompiledGrammar(self.grammar)
+        self.terminalTable = self.compiled.terminalSyms
+        self.terminalBits = {sym: 1 << i for i, sym in enumerate(self.terminalTable)}
+        return self.compiled
+
+    def _compiled(self) -> CompiledGrammar:
+        """文法的紧凑整数表示, 尚未构造时先构造"""
+        if self.compiled is None:
+            return self.compile()
+        return self.compiled
+
+    def _terminal_bit(self, symbol: str) -> int:
+        """终结符号在位集中的位, 未登记的符号分配新位"""
+        bit = self.terminalBits.get(symbol)
+        if bit is None:
+            bit = self.terminalBits[symbol] = 1 << len(self.terminalTable)
+            self.terminalTable.append(symbol)
+        return bit
+
+    def _terminal_set(self, mask: int) -> set[str]:
+        """位集对应的终结符号集合"""
+        table = self.terminalTable
+        terminals: set[str] = set()
+        while mask:
+            low = mask & -mask
+            terminals.add(table[low.bit_length() - 1])
+            mask ^= low
+        return terminals
 
-        if symbol not in self.firstSets:
+    def compute_first(self, symbol: str) -> set[str]:
+        firstSets = self.compute_firstSets()
+        if symbol not in firstSets:
             return {symbol}
-        if self.firstSets[symbol]:
-            return self.firstSets[symbol]
-        for prod in self.grammar[symbol]:
-            count = 0
-            for prodSym in prod:
-                symFirst = self.compute_first(prodSym)
-                if "ε" not in symFirst:
-                    self.firstSets[symbol].update(symFirst)
-                    break
-                count += 1
-                self.firstSets[symbol].update(symFirst - {"ε"})
-            if count == len(prod):
-                self.firstSets[symbol].add("ε")
-
-        return self.firstSets[symbol]
+        return firstSets[symbol]
 
     def compute_firstSets(self) -> dict[str, set[str]]:
-        """计算 FIRST 集"""
-        if self.firstSets:
-            return self.firstSets
-
-        # 初始化所有非终结符的 FIRST 集
-        for nonterminalSym in self.grammar.keys():
-            self.firstSets[nonterminalSym] = set()
+        """计算 FIRST 集, 返回供显示的字符串形式"""
+        if not self.firstSets:
+            self._solve_first()
+            for nonterminalSym, mask in self.firstMasks.items():
+                self.firstSets[nonterminalSym] = self._terminal_set(mask)
+        return self.firstSets
 
-        for nonterminalSym in self.firstSets.keys():
-            self.compute_first(nonterminalSym)
+    def _solve_first(self) -> None:
+        """在整数文法上求 FIRST 集的位集
+
+        用计数法求可空的非终结符号; 产生式 A -> X1 X2 ... 中 X1 及其后紧跟在可空符号之后的符号,
+        终结符号直接加入 FIRST(A), 非终结符号 B 给出约束 FIRST(A) ⊇ FIRST(B)。
+        约束按依赖图的强连通分量一次求解, 左递归、相互递归与大量 ε 产生式都不会导致重复计算或无界递归。
+        结果为 firstMasks 中的位集 (终结符号表中下标为 i 的符号对应第 i 位, ε 为第 0 位)。
+        """
+        if self.firstMasks:
+            return
+
+        compiled = self.compile()
+        numNonterminals = compiled.numNonterminals
+        heads = compiled.heads
+        offsets = compiled.offsets
+        body = compiled.body
+        nullable = compute_nullable(numNonterminals, heads, offsets, body)
+        base = [0] * numNonterminals
+        deps: list[list[int]] = [[] for _ in range(numNonterminals)]
+        for p, head in enumerate(heads):
+            for sym in body[offsets[p] : offsets[p + 1]]:
+                if sym >= numNonterminals:
+                    base[head] |= 1 << (sym - numNonterminals)
+                    break
+                deps[head].append(sym)
+                if not nullable[sym]:
+                    break
 
-        return self.firstSets
+        firsts = solve_inclusions(base, deps)
+        for i in range(numNonterminals):
+            if nullable[i]:
+                firsts[i] |= _EPSILON
+        self.firstMasks = dict(zip(compiled.symbols, firsts))
 
     def compute_follow(self, symbol: str) -> set[str]:
-        if not self.followSets:
-            self.compute_followSets()
-        return self.followSets[symbol]
+        return self.compute_followSets()[symbol]
 
     def compute_followSets(self) -> dict[str, set[str]]:
-        """计算 FOLLOW 集"""
-        if self.followSets:
-            return self.followSets
+        """计算 FOLLOW 集, 返回供显示的字符串形式 (同时生成 firstSets)"""
+        if not self.followSets:
+            self.compute_firstSets()
+            self._solve_follow()
+            for nonterminalSym, mask in self.followMasks.items():
+                self.followSets[nonterminalSym] = self._terminal_set(mask)
+        return self.followSets
 
-        # 初始化所有非终结符的 FOLLOW 集
-        for nonterminal in self.grammar.keys():
-            self.followSets[nonterminal] = set()
-        assert self.startSym is not None
-        self.followSets[self.startSym].add("$")  # $ 为输入的结束符
-
-        # 迭代直到所有 FOLLOW 集不再变化
-        changed = True
-        while changed:
-            changed = False
-            for nonterminal, productions in self.grammar.items():
-                for production in productions:
-                    for i, symbol in enumerate(production):
-                        if symbol not in self.terminalSyms:  # 当前符号是非终结符
-                            originalSize = len(self.followSets[symbol])
-
-                            if i + 1 < len(production):  # 右侧还有符号
-                                firstSet = self.compute_first_of_production(
-                                    production[i + 1 :]
-                                )
-                                self.followSets[symbol].update(firstSet - {"ε"})
-                                if "ε" in firstSet:
-                                    self.followSets[symbol].update(
-                                        self.followSets[nonterminal]
-                                    )
-                            else:  # 如果是最后一个符号，添加非终结符的 FOLLOW 集
-                                self.followSets[symbol].update(
-                                    self.followSets[nonterminal]
-                                )
-
-                            changed |= originalSize != len(self.followSets[symbol])
+    def _solve_follow(self) -> None:
+        """在整数文法上求 FOLLOW 集的位集
 
-        return self.followSets
+        每个产生式从右向左扫描一遍, 随扫描维护当前后缀的 FIRST 集与是否可空 (每个后缀只求一次):
+        右部中的非终结符号 B 得到其后缀的 FIRST 集, 后缀可空时还有 FOLLOW(B) ⊇ FOLLOW(A)。
+        包含关系构成的图与 FIRST 集一样按强连通分量一次求解, 每条边只合并一次。
+        """
+        if self.followMasks:
+            return
 
-    def compute_first_of_production(self, production: list[str]) -> set[str]:
-        """计算某个产生式的 FIRST 集"""
-        firstSet: set[str] = set()
-        for symbol in production:
-            first = self.compute_first(symbol)
-            if "ε" not in first:
-                firstSet.update(first)
-                break
-            elif symbol == production[-1]:
-                firstSet.update(first)
+        assert self.startSym is not None
+        self._solve_first()
+        compiled = self._compiled()
+        numNonterminals = compiled.numNonterminals
+        heads = compiled.heads
+        offsets = compiled.offsets
+        body = compiled.body
+        masks = list(self.firstMasks.values())
+        # 不含 ε 的 FIRST 集与可空标记
+        firsts = [mask & ~_EPSILON for mask in masks]
+        nullable = [mask & _EPSILON for mask in masks]
+
+        base = [0] * numNonterminals
+        deps: list[list[int]] = [[] for _ in range(numNonterminals)]
+        base[compiled.symbolIds[self.startSym]] = _END  # $ 为输入的结束符
+        for p, head in enumerate(heads):
+            trailer = 0  # 当前后缀的 FIRST 集
+            trailerNullable = True
+            for sym in reversed(body[offsets[p] : offsets[p + 1]]):
+                if sym >= numNonterminals:
+                    trailer = 1 << (sym - numNonterminals)
+                    trailerNullable = False
+                    continue
+                base[sym] |= trailer
+                if trailerNullable:
+                    deps[sym].append(head)
+                if nullable[sym]:
+                    trailer |= firsts[sym]
+                else:
+                    trailer = firsts[sym]
+                    trailerNullable = False
+
+        follows = solve_inclusions(base, deps)
+        self.followMasks = dict(zip(compiled.symbols, follows))
+
+    def _solve_select(self) -> list[int]:
+        """按产生式编号求各产生式 SELECT 集的位集, 只有存在可空右部时才需要 FOLLOW 集"""
+        if self.selectMasks:
+            return self.selectMasks
+
+        self._solve_first()
+        compiled = self._compiled()
+        numNonterminals = compiled.numNonterminals
+        heads = compiled.heads
+        offsets = compiled.offsets
+        body = compiled.body
+        firsts = list(self.firstMasks.values())
+        selectMasks: list[int] = []
+        nullableProductions: list[int] = []
+        for p in range(len(heads)):
+            mask = 0
+            for sym in body[offsets[p] : offsets[p + 1]]:
+                if sym >= numNonterminals:
+                    mask |= 1 << (sym - numNonterminals)
+                    break
+                mask |= firsts[sym] & ~_EPSILON
+                if not firsts[sym] & _EPSILON:
+                    break
             else:
-                firstSet.update(first - {"ε"})
+                nullableProductions.append(p)
+            selectMasks.append(mask)
+        if nullableProductions:
+            self._solve_follow()
+            follows = list(self.followMasks.values())
+            for p in nullableProductions:
+                selectMasks[p] |= follows[heads[p]]
+        self.selectMasks = selectMasks
+        return selectMasks
+
+    def _first_mask_of_production(self, production: list[str]) -> int:
+        """产生式右部的 FIRST 集位集, 右部可空时含 ε 位"""
+        self._solve_first()
+        firstMasks = self.firstMasks
+        mask = 0
+        for symbol in production:
+            if symbol == "ε":
+                continue
+            first = firstMasks.get(symbol)
+            if first is None:  # 终结符号
+                return mask | self._terminal_bit(symbol)
+            mask |= first & ~_EPSILON
+            if not first & _EPSILON:
+                return mask
+        # 右部全部可空 (含空产生式)
+        return mask | _EPSILON
 
-        return firstSet
+    def compute_first_of_production(self, production: list[str]) -> set[str]:
+        """计算某个产生式的 FIRST 集"""
+        return self._terminal_set(self._first_mask_of_production(production))
 
     def compute_select_of_production(
         self, nonterminalSym: str, production: list[str]
     ) -> set[str]:
         """计算某个产生式的 SELECT 集"""
-        selectSet: set[str] = set()
-        firstSet = self.compute_first_of_production(production)
-        selectSet.update(firstSet - {"ε"})
-        if "ε" in firstSet:
-            selectSet.update(self.compute_follow(nonterminalSym))
-
-        return selectSet
+        mask = self._first_mask_of_production(production)
+        if mask & _EPSILON:
+            self._solve_follow()
+            mask = mask & ~_EPSILON | self.followMasks[nonterminalSym]
+        return self._terminal_set(mask)
 
     def is_ll1(self) -> bool:
-        """判断 LL1 文法"""
-        for nonterminalSym, productions in self.grammar.items():
-            # 跳过只有一个产生式的非终结符号
-            if len(productions) == 1:
-                continue
-
-            selectSet: set[str] | None = None
-            for index, production in enumerate(productions):
-                newSelectSet = self.compute_select_of_production(
-                    nonterminalSym, production
-                )
-                if index == 0:
-                    selectSet = newSelectSet
-                assert selectSet is not None
-                selectSet.intersection_update(newSelectSet)
-            if selectSet:
-                return False
+        """判断 LL1 文法: 同一非终结符号的各产生式的 SELECT 集两两不相交
+
+        只求出位集 firstMasks/followMasks/selectMasks, 不生成字符串形式的 firstSets/followSets。
+        """
+        selectMasks = self._solve_select()
+        compiled = self._compiled()
+        productions = compiled.productions
+        for head in range(compiled.numNonterminals):
+            seen = 0
+            for p in range(productions[head], productions[head + 1]):
+                if seen & selectMasks[p]:
+                    return False
+                seen |= selectMasks[p]
         return True
 
     def construct_predictive_table(self) -> dict[str, dict[str, list[list[str]]]]:
-        """构造 LL(1) 预测分析表"""
+        """构造 LL(1) 预测分析表, 与 is_ll1 一样不生成字符串形式的 FIRST/FOLLOW 集"""
+        selectMasks = self._solve_select()
+        columns = self.terminalSyms - {"ε"} | {"$"}
         self.predictiveTable = {
-            nonterminal: {
-                terminal: [] for terminal in self.terminalSyms - {"ε"} | {"$"}
-            }
+            nonterminal: {terminal: [] for terminal in columns}
             for nonterminal in self.grammar.keys()
         }
 
+        table = self.terminalTable
+        p = 0
         for nonterminal, productions in self.grammar.items():
+            row = self.predictiveTable[nonterminal]
             for prod in productions:
-                selectSet = self.compute_select_of_production(nonterminal, prod)
-                for terminal in selectSet:
-                    self.predictiveTable[nonterminal][terminal].append(prod)
-                if ["ε"] == prod and prod not in self.predictiveTable[nonterminal]["$"]:
-                    self.predictiveTable[nonterminal]["$"].append(prod)
+                selectMask = selectMasks[p]
+                p += 1
+                while selectMask:
+                    low = selectMask & -selectMask
+                    row[table[low.bit_length() - 1]].append(prod)
+                    selectMask ^= low
+                if ["ε"] == prod and prod not in row["$"]:
+                    row["$"].append(prod)
 
         return self.predictiveTable
 
     def parse(self, inputStr: list[str]) -> bool:
-        if not self.predictiveTable:
-            self.construct_predictive_table()
-        if not self.is_ll1():
-            print("该文法不是LL(1)文法")
-            return False
-
-        assert self.startSym is not None
-        stack: list[str] = ["$", self.startSym]
-        print("初始分析栈:", stack)
-        inputStr.append("$")
-        while stack:
-            top = stack.pop()
-            curSym = inputStr[0]
-            action: str | None = None
-            if top in self.terminalSyms | {"$"}:
-                if top == curSym:
-                    action = f"match: '{curSym}'"
-                    inputStr = inputStr[1:]
-                else:
-                    return False
-            else:
-                productions = self.predictiveTable[top][curSym]
-                if productions:
-                    production = productions[0]
-                    for sym in reversed(production):
-                        if sym != "ε":
-                            stack.append(sym)
-                    action = f"{top} -> {' '.join(production)}"
-                else:
-                    return False
+        """用预测分析器分析输入串, 并打印每一步的分析栈、剩余输入与动作"""
+        if self.parser is None:
+            try:
+                self.parser = LL1Parser(self)
+            except ValueError:
+                print("该文法不是LL(1)文法")
+                return False
 
-            print(f"分析栈: {stack}, 输入串: '{' '.join(inputStr)}', 动作: {action}")
+        def trace(stack: list[str], position: int, action: str) -> None:
+            print(
+                f"分析栈: {stack}, 输入串: '{' '.join(inputStr[position:] + ['$'])}', 动作: {action}"
+            )
 
+        print("初始分析栈:", ["$", self.startSym])
+        try:
+            self.parser.parse(inputStr, trace=trace)
+        except ParseError:
+            return False
         return True
 
     def display(self):
@@ -349,14 +445,16 @@ class CFG:
             )
             print(f"{nonterminalSym} -> {productions}")
 
-        if self.firstSets:
+        if self.firstMasks:
+            self.compute_firstSets()
             print("FIRST 集:")
             for nonterminal in self.firstSets:
                 print(
                     f"FIRST({nonterminal}) = {{{', '.join(self.firstSets[nonterminal])}}}"
                 )
 
-        if self.followSets:
+        if self.followMasks:
+            self.compute_followSets()
             print("FOLLOW 集:")
             for nonterminal in self.followSets:
                 print(
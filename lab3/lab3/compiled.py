@@ -0,0 +1,87 @@
+from array import array
+from itertools import accumulate
+
+
+class CompiledGrammar:
+    """文法的紧凑整数表示
+
+    符号表 symbols 把编号映射回名字: 非终结符号为 0..numNonterminals-1, 其后为终结符号,
+    终结符号以 ε、$ 开头, 编号减去 numNonterminals 即其在位集中的位置; isTerminal 为按编号的标记。
+    全部产生式右部 (略去 ε) 依次存放在 array('i') 的 body 中, 第 p 个产生式为
+    body[offsets[p]:offsets[p + 1]], 左部为 heads[p]; 同一非终结符号的产生式连续存放,
+    非终结符号 A 的产生式编号为 range(productions[A], productions[A + 1])。
+    """
+
+    def __init__(self, grammar: dict[str, list[list[str]]]):
+        self.numNonterminals: int = len(grammar)
+        self.symbols: list[str] = list(grammar.keys())
+        self.symbolIds: dict[str, int] = {sym: i for i, sym in enumerate(self.symbols)}
+        for sym in ("ε", "$"):
+            self.symbolIds.setdefault(sym, len(self.symbols))
+            self.symbols.append(sym)
+        symbols = self.symbols
+        symbolIds = self.symbolIds
+        prods = [prod for productions in grammar.values() for prod in productions]
+        for prod in prods:
+            for sym in prod:
+                if sym not in symbolIds:  # 首次出现的终结符号
+                    symbolIds[sym] = len(symbols)
+                    symbols.append(sym)
+        self.heads = array(
+            "i",
+            [
+                head
+                for head, productions in enumerate(grammar.values())
+                for _ in productions
+            ],
+        )
+        self.offsets = array(
+            "i", accumulate((len(prod) - prod.count("ε") for prod in prods), initial=0)
+        )
+        self.body = array(
+            "i", [symbolIds[sym] for prod in prods for sym in prod if sym != "ε"]
+        )
+        self.productions = array(
+            "i",
+            accumulate(
+                (len(productions) for productions in grammar.values()), initial=0
+            ),
+        )
+        self.isTerminal = bytearray(self.numNonterminals) + b"\x01" * (
+            len(symbols) - self.numNonterminals
+        )
+
+    @property
+    def numProductions(self) -> int:
+        return len(self.heads)
+
+    @property
+    def terminalSyms(self) -> list[str]:
+        """终结符号表, 下标即位集中的位置"""
+        return self.symbols[self.numNonterminals :]
+
+    def production(self, index: int) -> list[str]:
+        """第 index 个产生式右部的字符串形式, 空右部为 ['ε']"""
+        symbols = self.symbols
+        prod = [
+            symbols[sym]
+            for sym in self.body[self.offsets[index] : self.offsets[index + 1]]
+        ]
+        return prod or ["ε"]
+
+    def to_grammar(self) -> dict[str, list[list[str]]]:
+        """转换回字符串形式的文法"""
+        return {
+            self.symbols[head]: [
+                self.production(p)
+                for p in range(self.productions[head], self.productions[head + 1])
+            ]
+            for head in range(self.numNonterminals)
+        }
+
+    def __repr__(self):
+        return (
+            f"CompiledGrammar(nonterminals={self.numNonterminals}, "
+            f"terminals={len(self.symbols) - self.numNonterminals}, "
+            f"productions={self.numProductions})"
+        )
@@ -0,0 +1,110 @@
+from array import array
+
+
+def compute_nullable(
+    numNonterminals: int, heads: array, offsets: array, body: array
+) -> list[bool]:
+    """求可空的非终结符号
+
+    文法为 CompiledGrammar 的整数形式: 小于 numNonterminals 的为非终结符号, 其余为终结符号,
+    第 p 个产生式左部为 heads[p], 右部 (不含 ε) 为 body[offsets[p]:offsets[p + 1]]。
+    每个产生式记录右部中尚未确定可空的符号个数, 某个非终结符号变为可空时只减少含有它的产生式的计数,
+    计数归零则左部可空并入队, 总时间与文法大小成线性。
+    """
+    nullable = [False] * numNonterminals
+    # 非终结符号 -> 含有它的产生式 (出现几次记几次)
+    occurrences: list[list[int]] = [[] for _ in range(numNonterminals)]
+    counts: list[int] = []
+    queue: list[int] = []
+    for index, head in enumerate(heads):
+        symbols = body[offsets[index] : offsets[index + 1]]
+        if symbols and max(symbols) >= numNonterminals:
+            counts.append(-1)  # 含终结符号, 永不可空
+            continue
+        counts.append(len(symbols))
+        for sym in symbols:
+            occurrences[sym].append(index)
+        if not symbols and not nullable[head]:
+            nullable[head] = True
+            queue.append(head)
+
+    while queue:
+        sym = queue.pop()
+        for index in occurrences[sym]:
+            counts[index] -= 1
+            head = heads[index]
+            if counts[index] == 0 and not nullable[head]:
+                nullable[head] = True
+                queue.append(head)
+    return nullable
+
+
+def strongly_connected_components(deps: list[list[int]]) -> list[list[int]]:
+    """Tarjan 算法 (迭代实现, 不受递归深度限制) 求依赖图的强连通分量
+
+    deps[a] 为 a 依赖的结点; 分量按依赖在前的顺序产出, 即某分量依赖的其他分量都在它之前。
+    """
+    n = len(deps)
+    index = [-1] * n
+    low = [0] * n
+    onStack = [False] * n
+    stack: list[int] = []
+    components: list[list[int]] = []
+    counter = 0
+    for root in range(n):
+        if index[root] >= 0:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        onStack[root] = True
+        work = [(root, 0)]
+        while work:
+            node, i = work[-1]
+            edges = deps[node]
+            if i < len(edges):
+                work[-1] = (node, i + 1)
+                succ = edges[i]
+                if index[succ] < 0:
+                    index[succ] = low[succ] = counter
+                    counter += 1
+                    stack.append(succ)
+                    onStack[succ] = True
+                    work.append((succ, 0))
+                elif onStack[succ] and index[succ] < low[node]:
+                    low[node] = index[succ]
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                component: list[int] = []
+                while True:
+                    member = stack.pop()
+                    onStack[member] = False
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
+
+
+def solve_inclusions(base: list[int], deps: list[list[int]]) -> list[int]:
+    """求包含约束 X[a] ⊇ base[a] 与 X[a] ⊇ X[b] (b ∈ deps[a]) 的最小解, 集合为整数位集
+
+    同一强连通分量内的解相同, 为分量内各 base 与分量所依赖的 (已求出的) 解的并;
+    按依赖在前的顺序逐个分量求解, 每条依赖边只合并一次, 左递归与相互递归不需要反复迭代。
+    """
+    solution: list[int | None] = [None] * len(base)
+    for component in strongly_connected_components(deps):
+        value = 0
+        for node in component:
+            value |= base[node]
+            for dep in deps[node]:
+                solved = solution[dep]
+                if solved is not None:  # 分量内的依赖尚未求出, 跳过
+                    value |= solved
+        for node in component:
+            solution[node] = value
+    return solution  # type: ignore[return-value]
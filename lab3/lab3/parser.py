@@ -0,0 +1,145 @@
+from array import array
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .cfg import CFG
+
+_END = 1  # $ 在终结符号表中的下标
+
+
+class ParseError(ValueError):
+    """输入串不符合文法
+
+    token 为出错的记号 (输入结束时为 '$'), position 为其下标, expected 为该处可接受的终结符号。
+    """
+
+    def __init__(self, token: str, position: int, expected: list[str]):
+        super().__init__(
+            f"位置 {position} 处的记号 {token!r} 无法匹配, 期望: {', '.join(expected)}"
+        )
+        self.token = token
+        self.position = position
+        self.expected = expected
+
+
+class LL1Parser:
+    """表驱动的 LL(1) 预测分析器
+
+    构造时判定一次 LL(1) 并建立整数分析表: table[A * numColumns + t] 为非终结符号 A 遇到
+    终结符号表中下标为 t 的记号时使用的产生式编号, 没有可用产生式时为 -1。
+    分析栈中存放符号编号, 产生式右部预先逆序存放, 展开时整段压栈;
+    输入只从记号迭代器向前读取, 不复制也不修改调用者的序列。
+    """
+
+    def __init__(self, cfg: "CFG"):
+        if not cfg.is_ll1():
+            raise ValueError("该文法不是 LL(1) 文法")
+        assert cfg.startSym is not None and cfg.compiled is not None
+        compiled = self.compiled = cfg.compiled
+        self.numNonterminals = numNonterminals = compiled.numNonterminals
+        self.numColumns = numColumns = len(compiled.symbols) - numNonterminals
+        self.start: int = compiled.symbolIds[cfg.startSym]
+        # 记号 -> 终结符号表中的下标; ε 与 $ 不能作为记号出现, None 表示输入结束
+        self.columns: dict[str | None, int] = {
+            sym: i for i, sym in enumerate(compiled.terminalSyms) if i > _END
+        }
+        self.columns[None] = _END
+        # 逆序的产生式右部, 展开时整段压栈
+        body = compiled.body
+        offsets = compiled.offsets
+        self.rhs: list[tuple[int, ...]] = [
+            tuple(reversed(body[offsets[p] : offsets[p + 1]]))
+            for p in range(compiled.numProductions)
+        ]
+        self.table = array("i", [-1]) * (numNonterminals * numColumns)
+        for p, mask in enumerate(cfg.selectMasks):
+            row = compiled.heads[p] * numColumns
+            while mask:
+                low = mask & -mask
+                self.table[row + low.bit_length() - 1] = p
+                mask ^= low
+
+    def parse(
+        self,
+        tokens: Iterable[Any],
+        key: Callable[[Any], str] | None = None,
+        trace: Callable[[list[str], int, str], None] | None = None,
+    ) -> None:
+        """分析记号序列, 不符合文法时抛出 ParseError
+
+        key 从记号中取出其种类 (即终结符号), 默认记号本身就是种类;
+        例如 lab2 词法分析器产生的 Token 可以用 key=operator.attrgetter("kind")。
+        trace 为每一步之后的回调, 参数为分析栈 (栈底在前)、下一个待读记号的下标与所做的动作。
+        """
+        columns = self.columns
+        table = self.table
+        rhs = self.rhs
+        numNonterminals = self.numNonterminals
+        numColumns = self.numColumns
+        kinds = iter(tokens) if key is None else map(key, tokens)
+
+        stack = [numNonterminals + _END, self.start]
+        position = 0
+        kind = next(kinds, None)
+        column = columns.get(kind, -1)
+        if column < 0:
+            raise self._error(kind, position, stack[-1])
+        while True:
+            top = stack.pop()
+            if top < numNonterminals:
+                p = table[top * numColumns + column]
+                if p < 0:
+                    raise self._error(kind, position, top)
+                stack.extend(rhs[p])
+                if trace is not None:
+                    trace(self._names(stack), position, self._action(p))
+                continue
+
+            if top - numNonterminals != column:
+                raise self._error(kind, position, top)
+            if column == _END:
+                if trace is not None:
+                    trace([], position, "match: '$'")
+                return
+            position += 1
+            if trace is not None:
+                trace(self._names(stack), position, f"match: '{kind}'")
+            kind = next(kinds, None)
+            column = columns.get(kind, -1)
+            if column < 0:
+                raise self._error(kind, position, stack[-1])
+
+    def accepts(
+        self, tokens: Iterable[Any], key: Callable[[Any], str] | None = None
+    ) -> bool:
+        """记号序列是否符合文法"""
+        try:
+            self.parse(tokens, key)
+        except ParseError:
+            return False
+        return True
+
+    def _names(self, stack: list[int]) -> list[str]:
+        symbols = self.compiled.symbols
+        return [symbols[sym] for sym in stack]
+
+    def _action(self, p: int) -> str:
+        compiled = self.compiled
+        head = compiled.symbols[compiled.heads[p]]
+        return f"{head} -> {' '.join(compiled.production(p))}"
+
+    def _error(self, kind: str | None, position: int, top: int) -> ParseError:
+        """构造 ParseError, 期望的终结符号由栈顶符号决定"""
+        symbols = self.compiled.symbols
+        numNonterminals = self.numNonterminals
+        if top >= numNonterminals:
+            expected = [symbols[top]]
+        else:
+            row = top * self.numColumns
+            expected = [
+                symbols[numNonterminals + t]
+                for t in range(self.numColumns)
+                if self.table[row + t] >= 0
+            ]
+        return ParseError("$" if kind is None else kind, position, expected)
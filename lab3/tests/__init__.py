@@ -1,2 +1,5 @@
 from tests.test_cfg import *
+from tests.test_compiled import *
+from tests.test_fixpoint import *
+from tests.test_parser import *
 from tests.test_trie import *
@@ -333,3 +333,71 @@ def test_construct_predictive_table2():
     print(predictiveTable)
 
     assert cfg.is_ll1() is False
+
+
+def test_is_ll1_pairwise_conflict():
+    cfg = CFG(False)
+
+    # 三个产生式的 SELECT 集没有公共元素, 但前两个都含 a
+    cfg.set_start("S")
+    cfg.add_rule("S", [["a", "b"], ["c"], ["a", "d"]])
+
+    assert cfg.is_ll1() is False
+
+
+def test_analysis_masks_match_sets():
+    cfg = CFG(False)
+
+    cfg.set_start("E")
+    cfg.add_rule("E", [["T", "E'"]])
+    cfg.add_rule("E'", [["+", "T", "E'"], ["ε"]])
+    cfg.add_rule("T", [["F", "T'"]])
+    cfg.add_rule("T'", [["*", "F", "T'"], ["ε"]])
+    cfg.add_rule("F", [["(", "E", ")"], ["id"]])
+
+    firstSets = cfg.compute_firstSets()
+    followSets = cfg.compute_followSets()
+    for nonterminalSym in cfg.grammar:
+        for masks, sets in (
+            (cfg.firstMasks, firstSets),
+            (cfg.followMasks, followSets),
+        ):
+            mask = masks[nonterminalSym]
+            assert {sym for sym, bit in cfg.terminalBits.items() if mask & bit} == sets[
+                nonterminalSym
+            ]
+    assert cfg.compute_select_of_production("E'", ["ε"]) == {"$", ")"}
+    assert cfg.compute_select_of_production("F", ["(", "E", ")"]) == {"("}
+
+    table = cfg.construct_predictive_table()
+    assert table["T'"]["+"] == [["ε"]]
+    assert table["T'"]["*"] == [["*", "F", "T'"]]
+    assert table["F"]["id"] == [["id"]]
+
+
+def test_construct_predictive_table_without_analysis():
+    cfg = CFG(False)
+
+    # 之前没有调用任何 FIRST/FOLLOW/SELECT 计算
+    cfg.set_start("S")
+    cfg.add_rule("S", [["a", "S"], ["ε"]])
+
+    table = cfg.construct_predictive_table()
+    assert table["S"]["a"] == [["a", "S"]]
+    assert table["S"]["$"] == [["ε"]]
+
+
+def test_string_views_are_lazy():
+    cfg = CFG(False)
+
+    cfg.set_start("S")
+    cfg.add_rule("S", [["a", "S"], ["ε"]])
+
+    # 判定与构造预测分析表只求位集
+    assert cfg.is_ll1() is True
+    cfg.construct_predictive_table()
+    assert cfg.firstSets == {} and cfg.followSets == {}
+
+    # compute_followSets 同时生成 FIRST 集
+    assert cfg.compute_followSets() == {"S": {"$"}}
+    assert cfg.firstSets == {"S": {"a", "ε"}}
@@ -0,0 +1,36 @@
+from lab3 import CFG
+from lab3.compiled import CompiledGrammar
+
+
+def test_compiled_layout():
+    compiled = CompiledGrammar(
+        {"S": [["a", "A", "S"], ["b"]], "A": [["b", "A"], ["ε"]]}
+    )
+
+    assert compiled.numNonterminals == 2 and compiled.numProductions == 4
+    assert compiled.symbols == ["S", "A", "ε", "$", "a", "b"]
+    assert compiled.terminalSyms == ["ε", "$", "a", "b"]
+    assert list(compiled.isTerminal) == [0, 0, 1, 1, 1, 1]
+    assert list(compiled.heads) == [0, 0, 1, 1]
+    assert list(compiled.productions) == [0, 2, 4]
+    # ε 不存入右部, 空产生式的区间为空
+    assert list(compiled.body) == [4, 1, 0, 5, 5, 1]
+    assert list(compiled.offsets) == [0, 3, 4, 6, 6]
+
+
+def test_compiled_round_trip():
+    cfg = CFG(False)
+
+    cfg.set_start("E")
+    cfg.add_rule("E", [["T", "E'"]])
+    cfg.add_rule("E'", [["+", "T", "E'"], ["ε"]])
+    cfg.add_rule("T", [["F", "T'"]])
+    cfg.add_rule("T'", [["*", "F", "T'"], ["ε"]])
+    cfg.add_rule("F", [["(", "E", ")"], ["id"]])
+
+    compiled = cfg.compile()
+    assert compiled.to_grammar() == cfg.grammar
+    assert compiled.production(2) == ["ε"]
+    assert repr(compiled) == (
+        "CompiledGrammar(nonterminals=5, terminals=7, productions=8)"
+    )
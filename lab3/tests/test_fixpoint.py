@@ -0,0 +1,141 @@
+import random
+
+from lab3 import CFG
+from lab3.compiled import CompiledGrammar
+from lab3.fixpoint import (
+    compute_nullable,
+    solve_inclusions,
+    strongly_connected_components,
+)
+
+
+def test_strongly_connected_components_order():
+    # 0 依赖 1, 1 与 2 相互依赖, 2 依赖 3
+    deps = [[1], [2], [1, 3], []]
+    components = strongly_connected_components(deps)
+    assert [sorted(component) for component in components] == [[3], [1, 2], [0]]
+
+
+def test_solve_inclusions_on_cycle():
+    base = [0b0001, 0b0010, 0b0100, 0b1000]
+    deps = [[1], [2], [1, 3], []]
+    assert solve_inclusions(base, deps) == [0b1111, 0b1110, 0b1110, 0b1000]
+
+
+def test_compute_nullable():
+    # 0 -> 1 2 | 3(终结符号);  1 -> ε;  2 -> 1 1
+    compiled = CompiledGrammar(
+        {"0": [["1", "2"], ["3"]], "1": [["ε"]], "2": [["1", "1"]]}
+    )
+    assert compute_nullable(3, compiled.heads, compiled.offsets, compiled.body) == [
+        True,
+        True,
+        True,
+    ]
+    compiled = CompiledGrammar({"0": [["1"]], "1": [["2"]], "2": [["0"]]})
+    assert compute_nullable(3, compiled.heads, compiled.offsets, compiled.body) == [
+        False,
+        False,
+        False,
+    ]
+
+
+def test_compute_first_mutual_left_recursion():
+    cfg = CFG(False)
+
+    cfg.set_start("A")
+    cfg.add_rule("A", [["B", "x"], ["y"]])
+    cfg.add_rule("B", [["A", "z"], ["C", "B"], ["ε"]])
+    cfg.add_rule("C", [["C", "w"], ["ε"]])
+
+    firstSets = cfg.compute_firstSets()
+    assert firstSets == {
+        "A": {"x", "y", "w"},
+        "B": {"x", "y", "w", "ε"},
+        "C": {"w", "ε"},
+    }
+
+
+def test_compute_first_long_chain():
+    cfg = CFG(False)
+
+    size = 5000
+    cfg.set_start("N0")
+    for i in range(size - 1):
+        cfg.add_rule(f"N{i}", [[f"N{i + 1}", "t"], ["ε"]])
+    cfg.add_rule(f"N{size - 1}", [["u"], ["N0", "v"]])
+
+    firstSets = cfg.compute_firstSets()
+    assert firstSets["N0"] == {"t", "u", "v", "ε"}
+    assert firstSets[f"N{size - 1}"] == {"t", "u", "v"}
+
+
+def test_first_of_production_with_repeated_nullable_symbol():
+    cfg = CFG(False)
+
+    cfg.set_start("S")
+    cfg.add_rule("S", [["A", "B", "A"]])
+    cfg.add_rule("A", [["a"], ["ε"]])
+    cfg.add_rule("B", [["b"]])
+
+    assert cfg.compute_first_of_production(["A", "B", "A"]) == {"a", "b"}
+    assert cfg.compute_first_of_production(["A", "A"]) == {"a", "ε"}
+    assert cfg.compute_first_of_production(["ε"]) == {"ε"}
+
+
+def iterate_follow(cfg: CFG) -> dict[str, set[str]]:
+    """逐遍扫描全部产生式直到 FOLLOW 集不再变化, 作为对照"""
+    assert cfg.startSym is not None
+    followSets: dict[str, set[str]] = {sym: set() for sym in cfg.grammar}
+    followSets[cfg.startSym].add("$")
+    changed = True
+    while changed:
+        changed = False
+        for nonterminalSym, productions in cfg.grammar.items():
+            for prod in productions:
+                for i, sym in enumerate(prod):
+                    if sym not in cfg.grammar:
+                        continue
+                    before = len(followSets[sym])
+                    firstSet = cfg.compute_first_of_production(prod[i + 1 :])
+                    followSets[sym] |= firstSet - {"ε"}
+                    if "ε" in firstSet:
+                        followSets[sym] |= followSets[nonterminalSym]
+                    changed |= len(followSets[sym]) != before
+    return followSets
+
+
+def test_compute_follow_left_recursion():
+    cfg = CFG(False)
+
+    cfg.set_start("E")
+    cfg.add_rule("E", [["E", "+", "T"], ["T"]])
+    cfg.add_rule("T", [["T", "*", "F"], ["F"]])
+    cfg.add_rule("F", [["(", "E", ")"], ["id"]])
+
+    assert cfg.compute_followSets() == {
+        "E": {"$", "+", ")"},
+        "T": {"$", "+", ")", "*"},
+        "F": {"$", "+", ")", "*"},
+    }
+
+
+def test_compute_follow_matches_iteration():
+    rng = random.Random(22)
+    for _ in range(50):
+        cfg = CFG(False)
+        size = rng.randint(1, 8)
+        cfg.set_start("N0")
+        for i in range(size):
+            productions = [
+                [
+                    f"N{rng.randrange(size)}"
+                    if rng.random() < 0.5
+                    else rng.choice("ab")
+                    for _ in range(rng.randint(0, 4))
+                ]
+                or ["ε"]
+                for _ in range(rng.randint(1, 3))
+            ]
+            cfg.add_rule(f"N{i}", productions)
+        assert cfg.compute_followSets() == iterate_follow(cfg)
@@ -0,0 +1,82 @@
+from collections import namedtuple
+from operator import attrgetter
+
+import pytest
+
+from lab3 import CFG, LL1Parser, ParseError
+
+
+def expression_grammar() -> CFG:
+    cfg = CFG(False)
+
+    cfg.set_start("E")
+    cfg.add_rule("E", [["T", "E'"]])
+    cfg.add_rule("E'", [["+", "T", "E'"], ["ε"]])
+    cfg.add_rule("T", [["F", "T'"]])
+    cfg.add_rule("T'", [["*", "F", "T'"], ["ε"]])
+    cfg.add_rule("F", [["(", "E", ")"], ["id"]])
+    return cfg
+
+
+def test_parser_accepts():
+    parser = LL1Parser(expression_grammar())
+
+    assert parser.accepts(["id", "+", "id", "*", "(", "id", "+", "id", ")"])
+    # 任意迭代器, 只读取一次
+    assert parser.accepts(iter(["(", "id", ")", "*", "id"]))
+    assert parser.accepts(["("] * 10000 + ["id"] + [")"] * 10000)
+    assert not parser.accepts(["id", "+"])
+    assert not parser.accepts(["id", "id"])
+    assert not parser.accepts([])
+
+
+def test_parser_errors():
+    parser = LL1Parser(expression_grammar())
+
+    with pytest.raises(ParseError) as info:
+        parser.parse(["id", "*", "(", "id"])
+    assert info.value.token == "$" and info.value.position == 4
+    assert info.value.expected == [")"]
+
+    with pytest.raises(ParseError) as info:
+        parser.parse(["id", "+", "x"])
+    assert info.value.token == "x" and info.value.position == 2
+    assert sorted(info.value.expected) == ["(", "id"]
+
+    # ε 与 $ 不是记号
+    assert not parser.accepts(["id", "$"])
+    assert not parser.accepts(["id", "ε"])
+
+
+def test_parser_key_and_trace():
+    parser = LL1Parser(expression_grammar())
+    Token = namedtuple("Token", ["kind", "lexeme", "offset"])
+    tokens = [Token("id", "x", 0), Token("+", "+", 2), Token("id", "y", 4)]
+
+    steps: list[tuple[list[str], int, str]] = []
+    parser.parse(tokens, key=attrgetter("kind"), trace=lambda *step: steps.append(step))
+
+    assert steps[0] == (["$", "E'", "T"], 0, "E -> T E'")
+    assert (["$", "E'", "T'"], 1, "match: 'id'") in steps
+    assert (["$", "E'"], 1, "T' -> ε") in steps
+    assert steps[-1] == ([], 3, "match: '$'")
+
+
+def test_parser_rejects_non_ll1():
+    cfg = CFG(False)
+
+    cfg.set_start("S")
+    cfg.add_rule("S", [["a", "b"], ["a", "c"]])
+
+    with pytest.raises(ValueError):
+        LL1Parser(cfg)
+
+
+def test_cfg_parse_keeps_input(capsys):
+    cfg = expression_grammar()
+    inputStr = ["id", "*", "id"]
+
+    assert cfg.parse(inputStr) is True
+    assert cfg.parse(["id", "*"]) is False
+    assert inputStr == ["id", "*", "id"]
+    assert "动作: match: '$'" in capsys.readouterr().out